@@ -0,0 +1,102 @@
+"""
+	Cold-start time of `import omdbapi`, measured in fresh interpreters.
+	Reports the best wall time of the import, the modules that took longest to import (`python -X importtime`)
+	and which of the optional heavy dependencies were loaded. Results can be saved and compared like `suite.py`.
+
+	Usage:
+		python benchmarks/import_time.py [--module omdbapi] [--repeat 10] [--top 15]
+		python benchmarks/import_time.py --save import.json
+		python benchmarks/import_time.py --compare import.json [--tolerance 0.25]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from suite import compare
+
+# Dependencies that should only be loaded when the feature using them is.
+HEAVY_MODULES = ('pandas', 'matplotlib', 'bokeh', 'aiohttp', 'github_data')
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed, ",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def _run(arguments: List[str]) -> subprocess.CompletedProcess:
+	environment = dict(os.environ)
+	environment['PYTHONPATH'] = os.pathsep.join(filter(None, [str(ROOT), environment.get('PYTHONPATH')]))
+	return subprocess.run([sys.executable] + arguments, capture_output = True, text = True, env = environment, check = True)
+
+
+def importTime(module: str) -> Tuple[float, List[str]]:
+	""" Imports `module` in a new interpreter. Returns the time taken and the heavy modules it loaded."""
+	last_line = _run(['-c', _PROBE.format(module = module, heavy = HEAVY_MODULES)]).stdout.splitlines()[-1]
+	seconds, _, loaded = last_line.partition(' ')
+	return float(seconds), loaded.split(',') if loaded else []
+
+
+def slowestImports(module: str, top: int) -> List[Tuple[int, str]]:
+	""" The `top` modules with the largest cumulative import time (in microseconds), from `python -X importtime`."""
+	stderr = _run(['-X', 'importtime', '-c', 'import {}'.format(module)]).stderr
+	rows = list()
+	for line in stderr.splitlines():
+		if not line.startswith('import time:') or 'cumulative' in line:
+			continue
+		_, cumulative, name = line.split('|')
+		rows.append((int(cumulative), name.rstrip()))
+	return sorted(rows, reverse = True)[:top]
+
+
+def main():
+	arguments = argparse.ArgumentParser(description = "Cold-start time of the package import.")
+	arguments.add_argument('--module', default = 'omdbapi')
+	arguments.add_argument('--repeat', type = int, default = 10)
+	arguments.add_argument('--top', type = int, default = 15)
+	arguments.add_argument('--save', type = Path)
+	arguments.add_argument('--compare', type = Path)
+	arguments.add_argument('--tolerance', type = float, default = 0.25)
+	options = arguments.parse_args()
+
+	runs = [importTime(options.module) for _ in range(options.repeat)]
+	best = min(seconds for seconds, _ in runs)
+	loaded = runs[0][1]
+	print("import {}: {:.1f} ms (best of {})".format(options.module, best * 1e3, options.repeat))
+	print("heavy modules loaded: {}".format(", ".join(loaded) or "none"))
+	print("\nslowest imports (cumulative):")
+	for cumulative, name in slowestImports(options.module, options.top):
+		print("{:>10.1f} ms  {}".format(cumulative / 1e3, name))
+
+	results: Dict[str, Dict[str, float]] = {
+		'import[{}]'.format(options.module): {'seconds': best, 'peak_bytes': 0, 'heavy_modules': len(loaded)}
+	}
+	if options.save:
+		document = {'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': sys.version.split()[0], 'results': results}
+		options.save.write_text(json.dumps(document, indent = 2))
+		print("\nsaved to {}".format(options.save))
+	if options.compare:
+		baseline = json.loads(options.compare.read_text())['results']
+		regressions = compare(results, baseline, options.tolerance)
+		for key, result in results.items():
+			if key in baseline and result['heavy_modules'] > baseline[key].get('heavy_modules', 0):
+				regressions.append("{} loads more heavy modules than the baseline: {}".format(key, ", ".join(loaded)))
+		for regression in regressions:
+			print("REGRESSION", regression)
+		if regressions:
+			sys.exit(1)
+		print("no regressions against {}".format(options.compare))
+
+
+if __name__ == "__main__":
+	main()
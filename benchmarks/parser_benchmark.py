@@ -0,0 +1,143 @@
+"""
+	Micro-benchmark of `omdbapi.api.parser` against the previous per-field conversion of season responses.
+	Usage: python benchmarks/parser_benchmark.py [--seasons 10] [--episodes 22] [--repeat 5] [--catalog 1000]
+	The catalog benchmark converts `--catalog` series to an episode table, as when replaying cached responses.
+"""
+import argparse
+import math
+import timeit
+from functools import partial
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pytools import numbertools, timetools
+
+from omdbapi.api import parser
+from omdbapi.api.resources import EpisodeResource, MediaResource, SeasonResource, catalog_table
+
+
+def _syntheticSeasons(seasons: int, episodes: int):
+	""" Season responses shaped like the api's, with repeating air dates and some missing values."""
+	months = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+	responses = list()
+	for season in range(1, seasons + 1):
+		responses.append({
+			'Title':        'Synthetic Series',
+			'Season':       str(season),
+			'totalSeasons': str(seasons),
+			'Response':     'True',
+			'Episodes':     [
+				{
+					'Title':      'Episode {}'.format(episode),
+					'Released':   'N/A' if episode % 11 == 0 else '{:02} {} {}'.format(
+						episode % 28 + 1, months[(season + episode // 4) % 12], 2000 + season
+					),
+					'Episode':    str(episode),
+					'imdbRating': 'N/A' if episode % 7 == 0 else '{:.1f}'.format(6 + (episode % 40) / 10),
+					'imdbID':     'tt9{:03}{:04}'.format(season, episode)
+				}
+				for episode in range(1, episodes + 1)
+			]
+		})
+	return responses
+
+
+def _legacyParseSeason(response, previous: int) -> SeasonResource:
+	""" The conversion used by `OmdbApi._parseSeason` before the parser module existed."""
+	to_number = numbertools.to_number
+	to_timestamp = lambda value: timetools.Timestamp(value) if value != "N/A" else math.nan
+	season = response['Season']
+	episodes = list()
+	for episode in response['Episodes']:
+		imdb_rating = to_number(episode.get('imdbRating', ' N/A'))
+		episode_data = dict(
+			title = episode['Title'],
+			imdbId = episode['imdbID'],
+			imdbRating = float(imdb_rating),
+			releaseDate = to_timestamp(episode['Released']),
+			episodeId = "S{:>02}E{:>02}".format(season, episode['Episode']),
+			indexInSeries = previous + int(episode['Episode']),
+			indexInSeason = to_number(episode['Episode'])
+		)
+		episodes.append(EpisodeResource(**episode_data))
+	return SeasonResource(episodes = episodes, seasonIndex = to_number(season), length = len(episodes), seriesTitle = response['Title'])
+
+
+def _parseAll(parse_season, responses):
+	previous = 0
+	for response in responses:
+		season = parse_season(response, previous)
+		previous += season.length
+
+
+def _series(series_id: str, seasons) -> MediaResource:
+	return MediaResource(
+		actors = 'N/A', awards = 'N/A', country = 'N/A', director = 'N/A', duration = math.nan, genre = 'N/A',
+		imdbId = series_id, imdbRating = math.nan, imdbVotes = math.nan, language = 'N/A', metascore = math.nan,
+		plot = 'N/A', rating = 'N/A', ratings = [], releaseDate = math.nan, responseStatus = True, title = series_id,
+		type = 'series', writer = 'N/A', year = 'N/A', totalSeasons = len(seasons), seasons = seasons
+	)
+
+
+def _legacyCatalog(catalog):
+	resources = list()
+	for series_id, responses in catalog.items():
+		seasons = list()
+		previous = 0
+		for response in responses:
+			seasons.append(_legacyParseSeason(response, previous))
+			previous += seasons[-1].length
+		resources.append(_series(series_id, seasons))
+	return catalog_table(resources)
+
+
+def _vectorizedCatalog(catalog):
+	seasons = parser.parseCatalog(catalog)
+	return catalog_table(_series(series_id, seasons[series_id]) for series_id in catalog)
+
+
+def _timeCatalog(options):
+	responses = _syntheticSeasons(options.seasons, options.episodes)
+	catalog = {'tt{:07}'.format(index): responses for index in range(options.catalog)}
+	episodes = options.catalog * options.seasons * options.episodes
+	print("\ncatalog of {} series ({} episodes) to a table, best of 3 runs".format(options.catalog, episodes))
+	baseline = None
+	for name, build in (('legacy', _legacyCatalog), ('parser.parseCatalog', _vectorizedCatalog)):
+		best = min(timeit.Timer(lambda: build(catalog)).repeat(repeat = 3, number = 1))
+		baseline = best if baseline is None else baseline
+		print("{:<22} {:>9.3f} s {:>8.2f} us/episode {:>6.2f}x".format(name, best, best * 1e6 / episodes, baseline / best))
+
+
+def main():
+	arguments = argparse.ArgumentParser(description = __doc__)
+	arguments.add_argument('--seasons', type = int, default = 10)
+	arguments.add_argument('--episodes', type = int, default = 22)
+	arguments.add_argument('--repeat', type = int, default = 5)
+	arguments.add_argument('--number', type = int, default = 20)
+	arguments.add_argument('--catalog', type = int, default = 1000)
+	options = arguments.parse_args()
+
+	responses = _syntheticSeasons(options.seasons, options.episodes)
+	candidates = {
+		'legacy':                partial(_parseAll, _legacyParseSeason),
+		'parser.parseSeason':    partial(_parseAll, parser.parseSeason),
+		'parser.parseCompact':   parser.parseCompactSeasons,
+	}
+	episodes = options.seasons * options.episodes
+	baseline = None
+	print("{} seasons x {} episodes, best of {} x {} runs".format(options.seasons, options.episodes, options.repeat, options.number))
+	for name, parse_series in candidates.items():
+		timer = timeit.Timer(lambda: parse_series(responses))
+		best = min(timer.repeat(repeat = options.repeat, number = options.number)) / options.number
+		baseline = best if baseline is None else baseline
+		print("{:<22} {:>9.3f} ms/series {:>8.2f} us/episode {:>6.2f}x".format(
+			name, best * 1e3, best * 1e6 / episodes, baseline / best
+		))
+	if options.catalog:
+		_timeCatalog(options)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,226 @@
+"""
+	Benchmarks of the fetch, parse, tabulate and plot hot paths, run against synthetic fixtures
+	(`omdbapi.offline`) rather than the network.
+	Every case is run on series of 1, 10 and 50 seasons, and reports its time per call, throughput and
+	peak memory (tracemalloc). Results can be saved as a baseline and later runs compared against it.
+
+	Usage:
+		python benchmarks/suite.py                          # run and print
+		python benchmarks/suite.py --save baseline.json     # also save the results
+		python benchmarks/suite.py --compare baseline.json  # exit with status 1 on regressions
+		python benchmarks/suite.py --cases to_table get_episode --seasons 50
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from omdbapi.api import OmdbApi
+from omdbapi.offline import Fixtures, FixtureTransport
+
+SEASONS = (1, 10, 50)
+EPISODES_PER_SEASON = 10
+SERIES_ID = 'tt9000000'
+
+
+class Case:
+	"""
+		A benchmark case.
+	Parameters
+	----------
+	name: str
+	setup: Callable[[OmdbApi, Fixtures], Callable[[], int]]
+		Prepares the case for a series, and returns the function to time. That function returns the
+		number of items it processed, which is used to report throughput.
+	unit: str
+		What the items are, i.e. 'episodes'.
+	requires: str; default None
+		An optional package the case depends on. The case is skipped if it is not installed.
+	"""
+
+	def __init__(self, name: str, setup: Callable, unit: str, requires: Optional[str] = None):
+		self.name = name
+		self.setup = setup
+		self.unit = unit
+		self.requires = requires
+
+	def available(self) -> bool:
+		if self.requires is None:
+			return True
+		try:
+			__import__(self.requires)
+		except ModuleNotFoundError:
+			return False
+		return True
+
+
+def _client(fixtures: Fixtures, **kwargs) -> OmdbApi:
+	return OmdbApi(api_key = 'benchmark', transport = FixtureTransport(fixtures), **kwargs)
+
+
+def _parseMedia(api: OmdbApi, fixtures: Fixtures):
+	response = fixtures.titles[SERIES_ID]
+	return lambda: api._parseMediaResponse(response, None, seasons = []) and 1
+
+
+def _getSeasons(api: OmdbApi, fixtures: Fixtures):
+	total = int(fixtures.titles[SERIES_ID]['totalSeasons'])
+	return lambda: sum(season.length for season in api.getSeasons(SERIES_ID, 'short', total_seasons = total))
+
+
+def _getSeasonsCompact(api: OmdbApi, fixtures: Fixtures):
+	compact = _client(fixtures, compact = True)
+	return _getSeasons(compact, fixtures)
+
+
+def _toTable(api: OmdbApi, fixtures: Fixtures):
+	series = api.get(SERIES_ID, 'short')
+	return lambda: len(series.toTable())
+
+
+def _getEpisode(api: OmdbApi, fixtures: Fixtures):
+	series = api.get(SERIES_ID, 'short')
+	keys = [(season, episode.indexInSeason) for season in series.seasons for episode in season.episodes]
+
+	def run():
+		for season, index in keys:
+			season.get_episode(index)
+		return len(keys)
+	return run
+
+
+def _seriesGetEpisode(api: OmdbApi, fixtures: Fixtures):
+	series = api.get(SERIES_ID, 'short')
+	keys = [episode.episodeId for season in series.seasons for episode in season.episodes]
+
+	def run():
+		for key in keys:
+			series.get_episode(key)
+		return len(keys)
+	return run
+
+
+def _seriesPlot(api: OmdbApi, fixtures: Fixtures):
+	import matplotlib
+	matplotlib.use('Agg')
+	import matplotlib.pyplot as plt
+	from omdbapi.graphics.graph import SeriesPlot
+	series = api.get(SERIES_ID, 'short')
+
+	def run():
+		plot = SeriesPlot(series)
+		plt.close(plot.fig)
+		return sum(season.length for season in series.seasons)
+	return run
+
+
+def _bokehPlot(api: OmdbApi, fixtures: Fixtures):
+	from omdbapi.graphics import bokehplot
+	series = api.get(SERIES_ID, 'short')
+	return lambda: bokehplot.table_figure(series.toTable(), series.title) and sum(s.length for s in series.seasons)
+
+
+CASES: Dict[str, Case] = {case.name: case for case in (
+	Case('parse_media', _parseMedia, 'responses'),
+	Case('get_seasons', _getSeasons, 'episodes'),
+	Case('get_seasons_compact', _getSeasonsCompact, 'episodes'),
+	Case('to_table', _toTable, 'rows'),
+	Case('get_episode', _getEpisode, 'lookups'),
+	Case('series_get_episode', _seriesGetEpisode, 'lookups'),
+	Case('series_plot', _seriesPlot, 'episodes', requires = 'matplotlib'),
+	Case('bokeh_plot', _bokehPlot, 'episodes', requires = 'bokeh'),
+)}
+
+
+def measure(function: Callable[[], int], repeat: int = 5, min_time: float = 0.2) -> Dict[str, float]:
+	""" Times `function` (best of `repeat` runs of an automatically sized loop), then records its peak memory."""
+	timer = timeit.Timer(function)
+	number, _ = timer.autorange()
+	number = max(1, int(number * min_time / 0.2))
+	seconds = min(timer.repeat(repeat = repeat, number = number)) / number
+
+	gc.collect()
+	tracemalloc.start()
+	items = function()
+	_, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	return {'seconds': seconds, 'items': items, 'throughput': items / seconds if seconds else 0.0, 'peak_bytes': peak}
+
+
+def run(cases: List[str], seasons: List[int], repeat: int) -> Dict[str, Dict[str, float]]:
+	results = dict()
+	for season_count in seasons:
+		fixtures = Fixtures.synthetic(series = 1, seasons = season_count, episodes = EPISODES_PER_SEASON)
+		api = _client(fixtures)
+		for name in cases:
+			case = CASES[name]
+			key = "{}[{}]".format(name, season_count)
+			if not case.available():
+				print("{:<28} skipped ({} is not installed)".format(key, case.requires))
+				continue
+			result = measure(case.setup(api, fixtures), repeat = repeat)
+			results[key] = result
+			print("{:<28} {:>10.3f} ms {:>12.0f} {}/s {:>10.1f} KiB peak".format(
+				key, result['seconds'] * 1e3, result['throughput'], case.unit, result['peak_bytes'] / 1024
+			))
+	return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+	""" Returns a description of every case that is slower, or uses more memory, than the baseline allows."""
+	regressions = list()
+	for key, result in results.items():
+		reference = baseline.get(key)
+		if reference is None:
+			continue
+		for metric in ('seconds', 'peak_bytes'):
+			if reference[metric] and result[metric] > reference[metric] * (1 + tolerance):
+				regressions.append("{} {}: {:.4g} -> {:.4g} (+{:.0%})".format(
+					key, metric, reference[metric], result[metric], result[metric] / reference[metric] - 1
+				))
+	return regressions
+
+
+def main():
+	arguments = argparse.ArgumentParser(description = "Benchmarks of the omdbapi hot paths.")
+	arguments.add_argument('--cases', nargs = '+', choices = list(CASES), default = list(CASES))
+	arguments.add_argument('--seasons', nargs = '+', type = int, default = list(SEASONS))
+	arguments.add_argument('--repeat', type = int, default = 5)
+	arguments.add_argument('--save', type = Path, help = "Write the results to this json file.")
+	arguments.add_argument('--compare', type = Path, help = "Compare the results with a json file written by --save.")
+	arguments.add_argument('--tolerance', type = float, default = 0.25,
+		help = "The relative slowdown or memory increase reported as a regression.")
+	options = arguments.parse_args()
+
+	results = run(options.cases, options.seasons, options.repeat)
+
+	if options.save:
+		document = {
+			'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+			'python':  platform.python_version(),
+			'machine': platform.platform(),
+			'results': results
+		}
+		options.save.write_text(json.dumps(document, indent = 2))
+		print("saved {} results to {}".format(len(results), options.save))
+
+	if options.compare:
+		baseline = json.loads(options.compare.read_text())['results']
+		regressions = compare(results, baseline, options.tolerance)
+		for regression in regressions:
+			print("REGRESSION", regression)
+		if regressions:
+			sys.exit(1)
+		print("no regressions against {}".format(options.compare))
+
+
+if __name__ == "__main__":
+	main()
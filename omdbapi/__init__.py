@@ -1,2 +1,14 @@
+import importlib
+
 from .api import OmdbApi, MediaResource, SeasonResource, EpisodeResource
-from . import graphics
\ No newline at end of file
+
+
+def __getattr__(name: str):
+	# `graphics` (matplotlib) and `AsyncOmdbApi` (aiohttp) are only imported when they are first used.
+	if name == 'graphics':
+		return importlib.import_module('.graphics', __name__)
+	if name == 'AsyncOmdbApi':
+		from .api import AsyncOmdbApi
+		return AsyncOmdbApi
+	message = "module {!r} has no attribute {!r}".format(__name__, name)
+	raise AttributeError(message)
@@ -1 +1,127 @@
- 
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from omdbapi.api import OmdbApi, ResponseCache, TokenBucket
+from omdbapi.batch import FORMATS, completed_queries, read_queries, run_batch
+
+
+def _generate_parser() -> argparse.ArgumentParser:
+	parser = argparse.ArgumentParser(prog = 'omdbapi')
+
+	parser.add_argument(
+		"-i", "--id",
+		help = "The imdb id of a show or tv show.",
+		action = 'store',
+		dest = 'id'
+	)
+
+	parser.add_argument(
+		"-s", "--search",
+		help = "Searches for a show or movie matching the requested term.",
+		action = 'store',
+		dest = 'term'
+	)
+
+	parser.add_argument(
+		"-o", "--output",
+		help = "Filename of the output graph."
+	)
+
+	commands = parser.add_subparsers(dest = 'command')
+	batch = commands.add_parser(
+		'batch',
+		help = "Resolves many imdb ids or titles, and streams the results to a JSONL or CSV file.",
+		description = "Resolves many imdb ids or titles concurrently. Results are written as they complete."
+	)
+	batch.add_argument(
+		"input", nargs = '?', default = '-',
+		help = "File with one imdb id or title per line. Reads stdin if omitted or '-'."
+	)
+	batch.add_argument("-o", "--output", default = '-', help = "The output file. Writes to stdout if omitted or '-'.")
+	batch.add_argument(
+		"-f", "--format", choices = FORMATS, dest = 'output_format',
+		help = "Defaults to csv if the output file ends in '.csv', jsonl otherwise."
+	)
+	batch.add_argument("-j", "--jobs", type = int, default = 8, help = "The number of items resolved at once.")
+	batch.add_argument(
+		"--resume", action = 'store_true',
+		help = "Skip items already written to the output file without an error, and append to it."
+	)
+	batch.add_argument(
+		"--episodes", choices = ('none', 'short', 'long'), default = 'none',
+		help = "Also retrieve the episodes of series."
+	)
+	batch.add_argument(
+		"--per", choices = ('title', 'episode'), default = 'title',
+		help = "Write one csv row per title or per episode."
+	)
+	batch.add_argument("--kind", choices = ('series', 'movie', 'any'), default = 'series', help = "The kind of media titles refer to.")
+	batch.add_argument("--api-key", help = "Defaults to the OMDBAPI_KEY environment variable.")
+	batch.add_argument("--cache", help = "Path of a response cache database. See `ResponseCache`.")
+	batch.add_argument("--rate", type = float, help = "The maximum number of requests per second.")
+
+	return parser
+
+
+def _batch(parser: argparse.ArgumentParser, options: argparse.Namespace) -> int:
+	to_stdout = options.output == '-'
+	output_format = options.output_format or ('csv' if options.output.endswith('.csv') else 'jsonl')
+	if options.resume and to_stdout:
+		parser.error("--resume requires an --output file")
+	if options.jobs < 1:
+		parser.error("--jobs must be at least 1")
+
+	skip = set()
+	existing = False
+	if options.resume:
+		skip = completed_queries(options.output, output_format)
+		existing = Path(options.output).exists() and Path(options.output).stat().st_size > 0
+
+	if options.input == '-':
+		queries = read_queries(sys.stdin)
+	else:
+		with open(options.input, encoding = 'utf-8') as file:
+			queries = read_queries(file)
+
+	api = OmdbApi(
+		api_key = options.api_key,
+		# Each item may request its seasons concurrently as well.
+		pool_size = max(10, 2 * options.jobs),
+		cache = ResponseCache(options.cache) if options.cache else None,
+		rate_limiter = TokenBucket(options.rate) if options.rate else None
+	)
+	output = sys.stdout if to_stdout else open(options.output, 'a' if options.resume else 'w', encoding = 'utf-8', newline = '')
+	try:
+		with api:
+			summary = run_batch(
+				api, queries, output, output_format, per = options.per,
+				episode_format = None if options.episodes == 'none' else options.episodes, kind = options.kind,
+				jobs = options.jobs, skip = skip, write_header = not existing
+			)
+	finally:
+		if not to_stdout:
+			output.close()
+	print(summary, file = sys.stderr)
+	return 1 if summary.failed else 0
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+	parser = _generate_parser()
+	cmd = parser.parse_args(arguments)
+	if cmd.command == 'batch':
+		return _batch(parser, cmd)
+
+	omdb_api = OmdbApi()
+
+	if cmd.id:
+		response = omdb_api.get(cmd.id)
+		print(response.summary())
+	elif cmd.term:
+		response = omdb_api.find(cmd.term)
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
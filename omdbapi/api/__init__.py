@@ -1,5 +1,31 @@
 
 try:
-	from ._base_api import OmdbApi, EpisodeResource, SeasonResource, MediaResource
+	from ._base_api import OmdbApi, BatchResult, EpisodeResource, SeasonResource, MediaResource
+	from .resources import CompactSeasonResource, EpisodeView, LazySeasons, catalog_table
+	from . import parser, serialization
+	from .transport import HttpTransport
+	from .cache import ResourceCache, ResponseCache
+	from .metrics import Metrics, RequestRecord
+	from .ratelimit import DailyQuota, RequestLimitError, RetryPolicy, TokenBucket
+	from .title_index import TitleIndex
 except ModuleNotFoundError:
-	from _base_api import OmdbApi, EpisodeResource, SeasonResource, MediaResource
\ No newline at end of file
+	from _base_api import OmdbApi, BatchResult, EpisodeResource, SeasonResource, MediaResource
+	from resources import CompactSeasonResource, EpisodeView, LazySeasons, catalog_table
+	import parser, serialization
+	from transport import HttpTransport
+	from cache import ResourceCache, ResponseCache
+	from metrics import Metrics, RequestRecord
+	from ratelimit import DailyQuota, RequestLimitError, RetryPolicy, TokenBucket
+	from title_index import TitleIndex
+
+
+def __getattr__(name: str):
+	# aiohttp is only imported when the async client is first used.
+	if name == 'AsyncOmdbApi':
+		try:
+			from ._async_api import AsyncOmdbApi
+		except ModuleNotFoundError:
+			from _async_api import AsyncOmdbApi
+		return AsyncOmdbApi
+	message = "module {!r} has no attribute {!r}".format(__name__, name)
+	raise AttributeError(message)
@@ -0,0 +1,299 @@
+import asyncio
+import json
+import math
+import os
+import time
+from collections import deque
+from typing import AsyncIterator, Dict, List, Optional
+
+try:
+	import aiohttp
+except ModuleNotFoundError:
+	aiohttp = None
+
+from omdbapi.api._base_api import DEFAULT_URL, checkValue, _apiKey, _newResults, _ResponseParsing, _searchPages, _toNumber
+from omdbapi.api.resources import MediaResource, SeasonResource
+from omdbapi.api.cache import ResponseCache
+from omdbapi.api.metrics import Metrics, currentRequest
+from omdbapi.api.ratelimit import DailyQuota, RetryPolicy, TokenBucket
+from omdbapi.api.title_index import TitleIndex
+
+
+class AsyncOmdbApi(_ResponseParsing):
+	"""
+		asyncio client for the omdbapi.com api. Mirrors `OmdbApi.get`, `find`, `search`, `search_iter` and
+		`getSeasons` as coroutines, and shares the response parsing of `OmdbApi`.
+		The other methods of `OmdbApi` (i.e. `get_many`, `refresh`, lazy seasons) are not available.
+		Requires `aiohttp`.
+	Parameters
+	----------
+	api_key: str; default None
+	session: aiohttp.ClientSession; default None
+		The session used to send requests. If not provided, one is created on first use and
+		closed by `close()`.
+	max_concurrency: int; default 10
+		The maximum number of requests in flight at once, shared by every coroutine using this client.
+	timeout: float; default 30
+		Total timeout of a single request, in seconds.
+	url: str; default 'http://www.omdbapi.com/'
+	cache: ResponseCache; default None
+	rate_limiter: TokenBucket; default None
+		May be shared with threaded OmdbApi clients using the same api key.
+	quota: DailyQuota; default None
+	retry: RetryPolicy; default RetryPolicy()
+	compact: bool; default False
+	titles: TitleIndex; default None
+	metrics: Metrics; default None
+	"""
+
+	def __init__(self, api_key: Optional[str] = None, session: Optional['aiohttp.ClientSession'] = None,
+			max_concurrency: int = 10, timeout: float = 30, url: Optional[str] = None,
+			cache: Optional[ResponseCache] = None, rate_limiter: Optional[TokenBucket] = None,
+			quota: Optional[DailyQuota] = None, retry: Optional[RetryPolicy] = None, compact: bool = False,
+			titles: Optional[TitleIndex] = None, metrics: Optional[Metrics] = None):
+		if aiohttp is None:
+			message = "AsyncOmdbApi requires the 'aiohttp' package."
+			raise ModuleNotFoundError(message)
+
+		self.api_key: str = _apiKey(api_key)
+		self.url: str = url if url is not None else os.environ.get('OMDBAPI_URL', DEFAULT_URL)
+		self.max_workers: int = max_concurrency
+		self.timeout = aiohttp.ClientTimeout(total = timeout)
+		self.cache: Optional[ResponseCache] = cache
+		self.rate_limiter = rate_limiter
+		self.quota = quota
+		self.retry = retry if retry is not None else RetryPolicy()
+		self.compact: bool = compact
+		self.titles: Optional[TitleIndex] = titles
+		self.metrics: Metrics = metrics if metrics is not None else Metrics()
+
+		self._owns_transport = session is None
+		self.session = session
+		self._semaphore = asyncio.Semaphore(max_concurrency)
+
+	async def __aenter__(self) -> 'AsyncOmdbApi':
+		return self
+
+	async def __aexit__(self, exc_type, exc_value, traceback):
+		await self.close()
+
+	def __enter__(self):
+		message = "Use 'async with' to manage an AsyncOmdbApi."
+		raise TypeError(message)
+
+	async def close(self):
+		""" Closes the underlying session if it is owned by this client."""
+		if self._owns_transport and self.session is not None:
+			await self.session.close()
+			self.session = None
+
+	def _getSession(self) -> 'aiohttp.ClientSession':
+		if self.session is None:
+			connector = aiohttp.TCPConnector(limit = self.max_workers, keepalive_timeout = 30)
+			self.session = aiohttp.ClientSession(connector = connector, timeout = self.timeout)
+		return self.session
+
+	async def request(self, **parameters) -> Dict:
+		with self.metrics.request(parameters) as record:
+			# The sqlite cache blocks, so it is used from a worker thread rather than the event loop.
+			if self.cache is not None:
+				response = await asyncio.to_thread(self.cache.get, parameters)
+				if response is not None:
+					record.cached = True
+					return response
+
+			parameters['apikey'] = self.api_key
+			# aiohttp only accepts string query parameters.
+			parameters = {key: str(value) for key, value in parameters.items()}
+			result = await self._send(parameters)
+
+			if self.cache is not None:
+				await asyncio.to_thread(self.cache.put, parameters, result)
+			return result
+
+	async def _send(self, parameters: Dict) -> Dict:
+		""" Sends a request, retrying failures according to `self.retry`. See `HttpTransport.get`."""
+		session = self._getSession()
+		record = currentRequest()
+		attempt = 0
+		while True:
+			if self.quota is not None:
+				self.quota.consume()
+			if self.rate_limiter is not None:
+				delay = self.rate_limiter.reserve()
+				if delay > 0:
+					await asyncio.sleep(delay)
+					if record is not None:
+						record.rate_limit_wait += delay
+
+			try:
+				async with self._semaphore:
+					start = time.perf_counter()
+					async with session.get(self.url, params = parameters) as response:
+						headers_received = time.perf_counter()
+						status = response.status
+						body = await response.read()
+					body_received = time.perf_counter()
+					try:
+						payload = json.loads(body) if body else None
+					except ValueError:
+						payload = None
+			except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+				delay = self.retry.decide(attempt, None, None)
+				if delay is None:
+					raise
+			else:
+				if record is not None:
+					record.addTiming('connect', headers_received - start)
+					record.addTiming('transfer', body_received - headers_received)
+					record.addTiming('decode', time.perf_counter() - body_received)
+				delay = self.retry.decide(attempt, status, payload, self.quota)
+				if delay is None:
+					if payload is None or self.retry.shouldRetry(status, payload):
+						response.raise_for_status()
+					# Like `HttpTransport.get`, a successful response that is not json raises a decode error.
+					return payload if payload is not None else json.loads(body)
+
+			await asyncio.sleep(delay)
+			if record is not None:
+				record.addRetry(delay)
+			attempt += 1
+
+	async def search(self, string: str, kind: Optional[str] = None, page: int = 1) -> Optional[Dict]:
+		""" See `OmdbApi.search`."""
+		parameters = self._searchParameters(string, kind, page)
+		response = await self.request(**parameters)
+		if self.titles is not None:
+			self.titles.addSearch(response, page)
+		with self.metrics.parsing('search'):
+			return self._parseSearchResponse(response)
+
+	async def search_iter(self, string: str, kind: Optional[str] = None, max_results: Optional[int] = None,
+			max_workers: Optional[int] = None) -> AsyncIterator[Dict]:
+		""" See `OmdbApi.search_iter`. Use with `async for`."""
+		if max_workers is None:
+			max_workers = self.max_workers
+		first_page = await self.search(string, kind)
+		if not first_page:
+			return
+		seen = set()
+		remaining = max_results
+		pages = _searchPages(first_page['totalResults'], max_results)
+
+		pending = deque()
+		next_page = 2
+		response = first_page
+		try:
+			while True:
+				# The next pages are requested before the results of the current page are consumed.
+				while next_page <= pages and len(pending) < max_workers:
+					pending.append(asyncio.ensure_future(self.search(string, kind, next_page)))
+					next_page += 1
+
+				for item in _newResults(response, seen):
+					yield item
+					if remaining is not None:
+						remaining -= 1
+						if remaining <= 0:
+							return
+
+				if not pending:
+					return
+				response = await pending.popleft()
+				if not response:
+					return
+		finally:
+			for task in pending:
+				task.cancel()
+
+	async def find(self, string: str, kind: str = 'series', **kwargs) -> Optional[MediaResource]:
+		""" See `OmdbApi.find`."""
+		kwargs['episode_format'] = kwargs.get('episode_format', 'short')
+		if not string.startswith('tt') and self.titles is not None:
+			string = self.titles.lookup(string, kind = checkValue(kind, 'series', 'movie', 'any')) or string
+		if string.startswith('tt'):
+			result = await self.get(string, **kwargs)
+		else:
+			search_response = await self.search(string, kind)
+			if not search_response or not search_response['Response']:
+				result = None
+			else:
+				first_result = search_response['Search'][0]
+				first_result_id = first_result['imdbID']
+
+				result = await self.get(first_result_id, **kwargs)
+		return result
+
+	async def get(self, string: str, episode_format: Optional[str] = None, asdict = False) -> MediaResource:
+		""" See `OmdbApi.get`."""
+		episode_format = checkValue(episode_format, None, 'short', 'long')
+		if not string.startswith('tt') and self.titles is not None:
+			string = self.titles.lookup(string) or string
+		_key = 'i' if string.startswith('tt') else 't'
+
+		parameters = {
+			_key: string
+		}
+		response = await self.request(**parameters)
+		if self.titles is not None and (_key == 't' or response.get('Type') != 'episode'):
+			self.titles.addMedia(response)
+
+		if 'Type' not in response:
+			result = response
+		else:
+			seasons = None
+			if response['Type'] == 'series':
+				total_seasons = _toNumber(response['totalSeasons'])
+				seasons = await self.getSeasons(response['imdbID'], episode_format, total_seasons = total_seasons)
+			result = self._parseMedia(response, seasons)
+		if not asdict:
+			result = MediaResource(**result)
+
+		return result
+
+	async def getSeasons(self, series_id: str, episode_format: str = 'short', total_seasons: Optional[int] = None,
+			max_workers: Optional[int] = None) -> List[SeasonResource]:
+		"""
+			See `OmdbApi.getSeasons`. Concurrency is bounded by the client's `max_concurrency`,
+			so `max_workers` is accepted only for compatibility.
+		"""
+		if episode_format == 'empty': return []
+		season_responses = await self._requestSeasons(series_id, total_seasons, max_workers)
+
+		if episode_format == 'long':
+			episode_ids = list(dict.fromkeys(e['imdbID'] for response in season_responses for e in response['Episodes']))
+			responses = await asyncio.gather(*(self.get(i, asdict = True) for i in episode_ids))
+			episode_details = dict(zip(episode_ids, responses))
+		else:
+			episode_details = None
+
+		return self._parseSeasonResponses(season_responses, episode_format, episode_details)
+
+	async def _requestSeason(self, series_id: str, index: int) -> Optional[Dict]:
+		parameters = {
+			'i':      series_id,
+			'Season': index
+		}
+		response = await self.request(**parameters)
+		response_status = response.get('Response', 'False') == 'True'
+		return response if response_status else None
+
+	async def _requestSeasons(self, series_id: str, total_seasons: Optional[int], max_workers: Optional[int]) -> List[Dict]:
+		""" See `OmdbApi._requestSeasons`."""
+		if isinstance(total_seasons, (int, float)) and not math.isnan(total_seasons):
+			total_seasons = int(total_seasons)
+		else:
+			total_seasons = 0
+
+		responses = list(await asyncio.gather(*(self._requestSeason(series_id, i) for i in range(1, total_seasons + 1))))
+		if None in responses:
+			return responses[:responses.index(None)]
+
+		index = len(responses)
+		while True:
+			index += 1
+			response = await self._requestSeason(series_id, index)
+			if response is None:
+				break
+			responses.append(response)
+		return responses
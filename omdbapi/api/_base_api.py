@@ -1,15 +1,24 @@
 import math
+import os
+from collections import deque
 from pprint import pprint
 from functools import partial
 
 pprint = partial(pprint, width = 150)
-import requests
-from typing import Union, Dict, Optional, List
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Union, Dict, Optional, Iterable, Iterator, List, Set
 
-from omdbapi.github import numbertools, omdb_api_key, timetools
-from omdbapi.api.resources import EpisodeResource, MediaResource, SeasonResource
+from omdbapi.github import API_KEY_VARIABLE, get_api_key
+from omdbapi.api.resources import CompactSeasonResource, EpisodeResource, LazySeasons, MediaResource, SeasonResource, _seasonCount
+from omdbapi.api import parser
+from omdbapi.api.transport import HttpTransport
+from omdbapi.api.cache import ResourceCache, ResponseCache
+from omdbapi.api.metrics import Metrics
+from omdbapi.api.ratelimit import DailyQuota, RetryPolicy, TokenBucket
+from omdbapi.api.title_index import TitleIndex
 
-_toNumber = numbertools.to_number
+_toNumber = parser.toNumber
 
 
 def checkValue(value:str, *items)->str:
@@ -25,18 +34,67 @@ def checkValue(value:str, *items)->str:
 	return value
 
 
-_toTimestamp = lambda value: timetools.Timestamp(value) if value  != "N/A" else math.nan
+_toTimestamp = parser.toTimestamp
 
-_toDuration = lambda value: timetools.Duration(minutes = int(value.split(' ')[0])) if value != 'N/A' else math.nan
+_toDuration = parser.toDuration
 
 
-class OmdbApi:
-	def __init__(self, api_key: str = omdb_api_key):
+DEFAULT_URL = "http://www.omdbapi.com/"
 
-		self.api_key: str = api_key
+SEARCH_PAGE_SIZE = 10
+# The api does not return results past this page.
+SEARCH_MAX_PAGES = 100
 
-	def _parseEpisode(self, episode: dict, season: int, previous: int, form: Optional[str]) -> Union[
-		EpisodeResource, MediaResource]:
+
+def _searchPages(total_results: int, max_results: Optional[int] = None) -> int:
+	""" The number of search pages needed to return `max_results` of `total_results`."""
+	if max_results is not None:
+		total_results = min(total_results, max_results)
+	return min(SEARCH_MAX_PAGES, max(1, math.ceil(total_results / SEARCH_PAGE_SIZE)))
+
+
+def _newResults(response: Dict, seen: Set[str]) -> List[Dict]:
+	""" Returns the results of a search page whose imdbID is not in `seen`, and adds them to it."""
+	results = list()
+	for item in response.get('Search') or []:
+		imdb_id = item.get('imdbID')
+		if imdb_id not in seen:
+			seen.add(imdb_id)
+			results.append(item)
+	return results
+
+
+def _apiKey(api_key: Optional[str]) -> str:
+	""" Returns `api_key`, or the key found by `get_api_key` if it is None."""
+	if api_key is None:
+		api_key = get_api_key()
+	if api_key is None:
+		message = "No api key was given, and the '{}' environment variable is not set.".format(API_KEY_VARIABLE)
+		raise ValueError(message)
+	return api_key
+
+
+@dataclass
+class BatchResult:
+	""" The outcome of a single item requested through `OmdbApi.get_many`."""
+	key: str
+	result: Optional[MediaResource] = None
+	error: Optional[Exception] = None
+
+	@property
+	def ok(self) -> bool:
+		return self.error is None and self.result is not None
+
+
+class _ResponseParsing:
+	"""
+		Conversion of api responses into resources, shared by OmdbApi and AsyncOmdbApi.
+		Never sends requests: everything a resource needs (seasons, long-form episode details) is passed in.
+		Expects the client to define `metrics` and `compact`.
+	"""
+
+	def _parseEpisode(self, episode: dict, season: int, previous: int, form: Optional[str],
+			details: Optional[Dict] = None) -> Union[EpisodeResource, MediaResource]:
 		"""
 
 		Parameters
@@ -48,102 +106,223 @@ class OmdbApi:
 		previous:int
 			Number of episodes occuring in the season prior to this one.
 		form: str; default None
+		details: Dict; default None
+			The parsed long-form response for this episode. Required when `form` is 'long'.
 
 		Returns
 		-------
 		EpisodeResponse
 		"""
-		as_media_resource = form == 'long'
-		imdb_rating = _toNumber(episode.get('imdbRating', ' N/A'))
-		release_date = _toTimestamp(episode['Released'])
-		episode_id = "S{:>02}E{:>02}".format(season, episode['Episode'])
-		episode_index = previous + int(episode['Episode'])
-
+		index_in_season = int(episode['Episode'])
 		episode_data = dict(
 			title = episode['Title'],
 			imdbId = episode['imdbID'],
-			imdbRating = float(imdb_rating),
-			releaseDate = release_date,
-			episodeId = episode_id,
-			indexInSeries = episode_index,
-			indexInSeason = _toNumber(episode['Episode'])
+			imdbRating = parser.toFloat(episode.get('imdbRating')),
+			releaseDate = _toTimestamp(episode['Released']),
+			episodeId = parser.episodeId(season, episode['Episode']),
+			indexInSeries = previous + index_in_season,
+			indexInSeason = index_in_season
 		)
-		if as_media_resource:
-			episode_resource = self.get(episode_data['imdbId'], asdict = True)
-			episode_data.update(episode_resource)
+		if form == 'long':
+			if details is None:
+				message = "The long-form response of episode '{}' was not provided.".format(episode['imdbID'])
+				raise ValueError(message)
+			episode_data.update(details)
 			episode_resource = MediaResource(**episode_data)
 		else:
 			episode_resource = EpisodeResource(**episode_data)
 		return episode_resource
 
-	def _parseMediaResponse(self, api_response: Dict, episode_format: Optional[str]) -> Dict:
+	def _parseMedia(self, api_response: Dict, seasons: Optional[List[SeasonResource]]) -> Dict:
+		"""
+			Converts a top-level (`i=` or `t=`) response into the keyword arguments of a MediaResource.
+			`seasons` are the already-retrieved seasons of a series, and are ignored for other types.
+		"""
+		with self.metrics.parsing('media'):
+			parsed_response = parser.parseMedia(api_response)
+		if parsed_response['type'] == 'series':
+			parsed_response['totalSeasons'] = _toNumber(api_response['totalSeasons'])
+			parsed_response['seasons'] = seasons
+		else:
+			parsed_response['seasons'] = []
+		return parsed_response
+
+	def _parseSeason(self, response: Dict, previous: int, episode_format: Optional[str],
+			details: Optional[Dict[str, Dict]] = None) -> Union[SeasonResource, CompactSeasonResource]:
+		"""
+			Converts a single `Season` response into a SeasonResource.
+			`details` maps episode imdbIds to their long-form responses (see `OmdbApi._hydrateEpisodes`).
+		"""
+		if episode_format != 'long':
+			if self.compact:
+				return parser.parseCompactSeason(response, previous)
+			return parser.parseSeason(response, previous)
+
+		if details is None:
+			details = dict()
+		season_number = response['Season']
+		season_episodes = [
+			self._parseEpisode(e, season_number, previous, form = episode_format, details = details.get(e['imdbID']))
+			for e in response['Episodes']
+		]
+
+		return SeasonResource(
+			episodes = season_episodes,
+			seasonIndex = _toNumber(response['Season']),
+			length = len(season_episodes),
+			seriesTitle = response['Title']
+		)
+
+	def _parseSeasonResponses(self, season_responses: List[Dict], episode_format: Optional[str],
+			details: Optional[Dict[str, Dict]] = None, previous: int = 0) -> List[SeasonResource]:
+		"""
+			Converts consecutive `Season` responses into SeasonResources.
+			`previous` is the number of episodes in the seasons preceding the first response.
+		"""
+		with self.metrics.parsing('season'):
+			if self.compact and episode_format != 'long':
+				return parser.parseCompactSeasons(season_responses, previous)
+			seasons = list()
+			previous_episodes = previous
+			for response in season_responses:
+				season_result = self._parseSeason(response, previous_episodes, episode_format, details)
+				seasons.append(season_result)
+				previous_episodes += max((e.indexInSeason for e in season_result.episodes), default = 0)
+		return seasons
+
+	@staticmethod
+	def _searchParameters(string: str, kind: Optional[str], page: int = 1) -> Dict:
+		kind = checkValue(kind, 'series', 'movie', 'any')
+		parameters = {
+			's': string
+		}
+		if kind is not None:
+			parameters['type'] = kind
+		if page != 1:
+			parameters['page'] = page
+		return parameters
+
+	@staticmethod
+	def _parseSearchResponse(response: Dict) -> Optional[Dict]:
+		status = response['Response'] == 'True'
+		if status:
+			total_results = int(response['totalResults'])
+			response['Response'] = status
+			response['totalResults'] = total_results
+		else:
+			response = None
+		return response
+
+
+class OmdbApi(_ResponseParsing):
+	"""
+		Client for the omdbapi.com api.
+	Parameters
+	----------
+	api_key: str; default None
+		Defaults to the `OMDBAPI_KEY` environment variable (see `omdbapi.github.get_api_key`).
+	transport: HttpTransport; default None
+		The transport used to send requests. If not provided, a pooled keep-alive
+		transport is created and owned by this client. Transports passed in are
+		not closed by `close()`.
+	pool_size: int; default 10
+		Size of the connection pool used when creating the default transport, which is also the
+		maximum number of requests in flight at once, however many worker threads are used.
+	timeout: float, Tuple[float, float]; default (3.05, 30)
+		(connect, read) timeout used when creating the default transport.
+	url: str; default 'http://www.omdbapi.com/'
+		Can also be set with the `OMDBAPI_URL` environment variable, i.e. to use `omdbapi.offline.StandInServer`.
+	max_workers: int; default 8
+		The maximum number of concurrent requests used when fetching seasons.
+	cache: ResponseCache; default None
+		If provided, raw responses are read from and written to this cache before going to the network.
+	memo: ResourceCache; default None
+		If provided, parsed MediaResources returned by `get` are memoized in this in-memory LRU.
+		Memoized resources are shared between callers.
+	rate_limiter: TokenBucket; default None
+	quota: DailyQuota; default None
+	retry: RetryPolicy; default None
+		Rate limiting, daily quota and retry settings used when creating the default transport.
+		See `HttpTransport`.
+	compact: bool; default False
+		If True, seasons of short-form episodes are stored as CompactSeasonResources.
+	titles: TitleIndex; default None
+		If provided, every search result and retrieved title is recorded in this index, and titles passed to
+		`find` and `get` are resolved through it before searching the api.
+	metrics: Metrics; default None
+		Hooks and counters for every request sent by this client. A new `Metrics` is created if not provided.
+		Can be shared by several clients to aggregate their requests.
+	"""
+
+	def __init__(self, api_key: Optional[str] = None, transport: Optional[HttpTransport] = None, pool_size: int = 10,
+			timeout = (3.05, 30), url: Optional[str] = None, max_workers: int = 8,
+			cache: Optional[ResponseCache] = None, memo: Optional[ResourceCache] = None,
+			rate_limiter: Optional[TokenBucket] = None, quota: Optional[DailyQuota] = None,
+			retry: Optional[RetryPolicy] = None, compact: bool = False, titles: Optional[TitleIndex] = None,
+			metrics: Optional[Metrics] = None):
+
+		self.api_key: str = _apiKey(api_key)
+		self.url: str = url if url is not None else os.environ.get('OMDBAPI_URL', DEFAULT_URL)
+		self.max_workers: int = max_workers
+		self.cache: Optional[ResponseCache] = cache
+		self.memo: Optional[ResourceCache] = memo
+		self.compact: bool = compact
+		self.titles: Optional[TitleIndex] = titles
+		self.metrics: Metrics = metrics if metrics is not None else Metrics()
+		self._owns_transport = transport is None
+		if transport is None:
+			transport = HttpTransport(
+				pool_size = pool_size, timeout = timeout, rate_limiter = rate_limiter, quota = quota, retry = retry
+			)
+		self.transport = transport
+		self.quota: Optional[DailyQuota] = getattr(transport, 'quota', None)
+
+	def __enter__(self) -> 'OmdbApi':
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	def close(self):
+		""" Releases the connections held by the transport."""
+		if self._owns_transport:
+			self.transport.close()
+
+	def _parseEpisode(self, episode: dict, season: int, previous: int, form: Optional[str],
+			details: Optional[Dict] = None) -> Union[EpisodeResource, MediaResource]:
+		""" See `_ResponseParsing._parseEpisode`. Long-form episodes without `details` are requested from the api."""
+		if form == 'long' and details is None:
+			details = self.get(episode['imdbID'], asdict = True)
+		return super()._parseEpisode(episode, season, previous, form, details)
+
+	def _parseMediaResponse(self, api_response: Dict, episode_format: Optional[str],
+			seasons: Optional[List[SeasonResource]] = None) -> Dict:
 		"""
 
 		Parameters
 		----------
 		api_response
 		episode_format: {None, 'short', 'long'};  default 'long'}
+		seasons: List[SeasonResource]; default None
+			The already-retrieved seasons of a series. If not provided, they are requested via `getSeasons`.
 
 		Returns
 		-------
 		MediaResponse
 		"""
-		media_type = api_response['Type']
-		imdb_id = api_response['imdbID']
-		imdb_votes = _toNumber(api_response['imdbVotes'].replace(',', ''))
-		imdb_rating = _toNumber(api_response['imdbRating'])
-
-		api_response_status = api_response['Response'] == 'True'
-		# years = api_response['Year'].split('-')
-		years = api_response['Year']
-		release_date = api_response['Released']
-		release_date = _toTimestamp(release_date)
-
-		runtime = _toDuration(api_response['Runtime'])
-		metacritic_score = _toNumber(api_response['Metascore'])
-
-		parsed_response = {
-			'actors':         api_response['Actors'],
-			'awards':         api_response['Awards'],
-			'country':        api_response['Country'],
-			'director':       api_response['Director'],
-			'genre':          api_response['Genre'],
-			'language':       api_response['Language'],
-			'metascore':      metacritic_score,
-			'plot':           api_response['Plot'],
-			# 'poster': api_response['Poster'],
-			'rating':         api_response['Rated'],
-			'ratings':        api_response['Ratings'],
-			'title':          api_response['Title'],
-			'type':           media_type,
-			'writer':         api_response['Writer'],
-			'year':           years,
-			'imdbId':         imdb_id,
-			'responseStatus': api_response_status,
-			'imdbRating':     imdb_rating,
-			'imdbVotes':      imdb_votes,
-			'releaseDate':    release_date,
-			'duration':       runtime,
-		}
-		if media_type == 'series':
+		if seasons is None and api_response.get('Type') == 'series':
 			total_seasons = _toNumber(api_response['totalSeasons'])
+			seasons = self.getSeasons(api_response['imdbID'], episode_format = episode_format, total_seasons = total_seasons)
+		return self._parseMedia(api_response, seasons)
 
-			series_seasons = self.getSeasons(imdb_id, episode_format = episode_format)
-
-			parsed_response['totalSeasons'] = total_seasons
-			parsed_response['seasons'] = series_seasons
-		else:
-			parsed_response['seasons'] = []
-
-		return parsed_response
-
-	def search(self, string: str, kind: Optional[str] = None) -> Dict:
+	def search(self, string: str, kind: Optional[str] = None, page: int = 1) -> Dict:
 		"""
-			Searches the api for a string.
+			Searches the api for a string. Returns a single page of (at most 10) results.
 		Parameters
 		----------
 		string
 		kind: {'series', 'movie', 'any'}
+		page: int; default 1
 
 		Returns
 		-------
@@ -157,22 +336,68 @@ class OmdbApi:
 				- `imdbID`: str
 			- `totalResults`: int
 		"""
-		kind = checkValue(kind, 'series', 'movie', 'any')
-		parameters = {
-			's': string
-		}
-		if kind is not None:
-			parameters['type'] = kind
+		parameters = self._searchParameters(string, kind, page)
 		response = self.request(**parameters)
+		if self.titles is not None:
+			self.titles.addSearch(response, page)
+		with self.metrics.parsing('search'):
+			return self._parseSearchResponse(response)
 
-		status = response['Response'] == 'True'
-		if status:
-			total_results = int(response['totalResults'])
-			response['Response'] = status
-			response['totalResults'] = total_results
-		else:
-			response = None
-		return response
+	def search_iter(self, string: str, kind: Optional[str] = None, max_results: Optional[int] = None,
+			max_workers: Optional[int] = None) -> Iterator[Dict]:
+		"""
+			Iterates over every search result, page by page.
+			Once the first page reports `totalResults`, up to `max_workers` of the following pages are requested
+			ahead of the consumer. Pages that have not been requested when the iteration stops are never sent.
+		Parameters
+		----------
+		string: str
+		kind: {'series', 'movie', 'any'}
+		max_results: int; default None
+			Stop after this many results.
+		max_workers: int; default None
+			The maximum number of pages requested concurrently. Defaults to `self.max_workers`.
+
+		Yields
+		------
+		Dict
+			The items of `Search` (see `search`). Results with an imdbID that was already returned are skipped.
+		"""
+		if max_workers is None:
+			max_workers = self.max_workers
+		first_page = self.search(string, kind)
+		if not first_page:
+			return
+		seen = set()
+		remaining = max_results
+		pages = _searchPages(first_page['totalResults'], max_results)
+
+		executor = ThreadPoolExecutor(max_workers = max(1, min(max_workers, pages - 1)))
+		pending = deque()
+		next_page = 2
+		response = first_page
+		try:
+			while True:
+				# The next pages are requested before the results of the current page are consumed.
+				while next_page <= pages and len(pending) < max_workers:
+					pending.append(executor.submit(self.search, string, kind, next_page))
+					next_page += 1
+
+				for item in _newResults(response, seen):
+					yield item
+					if remaining is not None:
+						remaining -= 1
+						if remaining <= 0:
+							return
+
+				if not pending:
+					return
+				response = pending.popleft().result()
+				if not response:
+					# The api reported more results than it returns.
+					return
+		finally:
+			executor.shutdown(wait = False, cancel_futures = True)
 
 	def find(self, string: str, kind: str = 'series', **kwargs) -> Optional[MediaResource]:
 		"""
@@ -191,6 +416,8 @@ class OmdbApi:
 		Optional[MediaResource]
 		"""
 		kwargs['episode_format'] = kwargs.get('episode_format', 'short')
+		if not string.startswith('tt') and self.titles is not None:
+			string = self.titles.lookup(string, kind = checkValue(kind, 'series', 'movie', 'any')) or string
 		if string.startswith('tt'):
 			result = self.get(string, **kwargs)
 		else:
@@ -204,7 +431,8 @@ class OmdbApi:
 				result = self.get(first_result_id, **kwargs)
 		return result
 
-	def get(self, string: str, episode_format: Optional[str] = None, asdict = False, **kwargs) -> MediaResource:
+	def get(self, string: str, episode_format: Optional[str] = None, asdict = False, lazy: bool = False,
+			**kwargs) -> MediaResource:
 		"""
 			Parameters
 			----------
@@ -218,30 +446,117 @@ class OmdbApi:
 				- `long`: Retrieve long-form episodes.
 			asdict: bool; default False
 				Return the response from the api as a dict rather than a resource.
+			lazy: bool; default False
+				Only request the seasons of a series when they are accessed. See `LazySeasons`.
 			Returns
 			-------
 			MediaResponse
 		"""
 		episode_format = checkValue(episode_format, None, 'short', 'long')
+		if not string.startswith('tt') and self.titles is not None:
+			string = self.titles.lookup(string) or string
 		_key = 'i' if string.startswith('tt') else 't'
+		use_memo = self.memo is not None and not asdict
+
+		if use_memo and _key == 'i':
+			result = self.memo.get(string, episode_format)
+			if result is not None:
+				return result
 
 		parameters = {
 			_key: string
 		}
 		response = self.request(**parameters)
-		# Should include error checking
+		if self.titles is not None and (_key == 't' or response.get('Type') != 'episode'):
+			# Episode titles are only recorded when they were looked up by title.
+			self.titles.addMedia(response)
 
 		if 'Type' not in response:
 			result = response
+		elif lazy and response['Type'] == 'series':
+			seasons = self._lazySeasons(response['imdbID'], episode_format, _toNumber(response['totalSeasons']))
+			result = self._parseMediaResponse(response, episode_format, seasons = seasons)
 		else:
 			result = self._parseMediaResponse(response, episode_format)
 		if not asdict:
 			#pprint(result)
 			result = MediaResource(**result)
+			if use_memo:
+				self.memo.put(result.imdbId, episode_format, result)
 
 		return result
 
-	def getSeasons(self, series_id: str, episode_format: str = 'short') -> List[SeasonResource]:
+	def get_many(self, ids_or_titles: Iterable[str], episode_format: Optional[str] = None, max_workers: Optional[int] = None,
+			kind: str = 'series', lazy: bool = False) -> List[BatchResult]:
+		"""
+			Retrieves many titles at once.
+		Parameters
+		----------
+		ids_or_titles: Iterable[str]
+			imdb ids (retrieved with `get`) and/or titles (retrieved with `find`). Duplicates are only requested once.
+		episode_format: {None, 'short', 'long'}; default None
+		max_workers: int; default None
+			The number of titles retrieved concurrently. Defaults to `self.max_workers`.
+		kind: {'series', 'movie', 'any'}; default 'series'
+			The kind of media searched for when an item is a title.
+		lazy: bool; default False
+			Passed to `get`: seasons are only requested when accessed.
+
+		Returns
+		-------
+		List[BatchResult]
+			One result per item of `ids_or_titles`, in the same order. Items that could not be retrieved
+			have `result = None` and, if an exception was raised, `error` set.
+		"""
+		keys = [str(i).strip() for i in ids_or_titles]
+		results = {item.key: item for item in self.iter_many(keys, episode_format, max_workers, kind, lazy)}
+		return [results[key] for key in keys]
+
+	def iter_many(self, ids_or_titles: Iterable[str], episode_format: Optional[str] = None,
+			max_workers: Optional[int] = None, kind: str = 'series', lazy: bool = False) -> Iterator[BatchResult]:
+		"""
+			Same as `get_many`, but yields each unique item as soon as it has been retrieved.
+			`ids_or_titles` is consumed as items complete, with at most `2 * max_workers` requested ahead,
+			and pending requests are cancelled if the iterator is closed early.
+		"""
+		if max_workers is None:
+			max_workers = self.max_workers
+		max_workers = max(1, max_workers)
+		episode_format = checkValue(episode_format, None, 'short', 'long')
+		keys = (str(i).strip() for i in ids_or_titles)
+
+		executor = ThreadPoolExecutor(max_workers = max_workers)
+		pending = dict()
+		submitted = set()
+		try:
+			while True:
+				for key in keys:
+					if key in submitted:
+						continue
+					submitted.add(key)
+					pending[executor.submit(self._getItem, key, episode_format, kind, lazy)] = key
+					if len(pending) >= 2 * max_workers:
+						break
+				if not pending:
+					return
+				done, _ = wait(pending, return_when = FIRST_COMPLETED)
+				for future in done:
+					key = pending.pop(future)
+					try:
+						item = BatchResult(key, result = future.result())
+					except Exception as exception:
+						item = BatchResult(key, error = exception)
+					yield item
+		finally:
+			executor.shutdown(wait = False, cancel_futures = True)
+
+	def _getItem(self, key: str, episode_format: Optional[str], kind: str, lazy: bool) -> Optional[MediaResource]:
+		if key.startswith('tt'):
+			return self.get(key, episode_format = episode_format, lazy = lazy)
+		return self.find(key, kind, episode_format = episode_format, lazy = lazy)
+
+	def getSeasons(self, series_id: str, episode_format: str = 'short', total_seasons: Optional[int] = None,
+			max_workers: Optional[int] = None) -> List[SeasonResource]:
 		"""
 			Gathers all episodes for the given series.
 		Parameters
@@ -249,49 +564,223 @@ class OmdbApi:
 		series_id: str
 		episode_format: {None, 'short', 'long'}
 			Controls if episodes are represented by the short-form EpisodeResource or the long-form Media Resource.
+		total_seasons: int; default None
+			The number of seasons reported by the api (`totalSeasons`). If given, every season is requested
+			concurrently. Seasons past this number are still probed in case the api undercounts.
+		max_workers: int; default None
+			The maximum number of concurrent requests. Defaults to `self.max_workers`.
 
 		Returns
 		-------
-
+		List[SeasonResource]
 		"""
 		if episode_format == 'empty': return []
-		seasons = list()
-		index = 0
-		previous_episodes = 0
+		season_responses = self._requestSeasons(series_id, total_seasons, max_workers)
+		return self._parseSeasons(season_responses, episode_format, max_workers)
+
+	def _parseSeasons(self, season_responses: List[Dict], episode_format: Optional[str], max_workers: Optional[int],
+			previous: int = 0) -> List[SeasonResource]:
+		"""
+			Converts consecutive `Season` responses into SeasonResources, hydrating long-form episodes if needed.
+			`previous` is the number of episodes in the seasons preceding the first response.
+		"""
+		if episode_format == 'long':
+			episode_ids = [e['imdbID'] for response in season_responses for e in response['Episodes']]
+			episode_details = self._hydrateEpisodes(episode_ids, max_workers)
+		else:
+			episode_details = None
+		return self._parseSeasonResponses(season_responses, episode_format, episode_details, previous)
+
+	def _lazySeasons(self, series_id: str, episode_format: Optional[str], total_seasons: Optional[int]) -> LazySeasons:
+		""" Creates the on-demand season list of a series retrieved with `lazy = True`."""
+		return LazySeasons(
+			partial(self._loadSeason, series_id, episode_format),
+			partial(self._loadRemainingSeasons, series_id, episode_format, total_seasons),
+			total_seasons = total_seasons
+		)
+
+	def _loadSeason(self, series_id: str, episode_format: Optional[str], index: int) -> Optional[SeasonResource]:
+		""" Requests and parses a single season. `indexInSeries` counts from the first episode of the season."""
+		response = self._requestSeason(series_id, index)
+		if response is None:
+			return None
+		return self._parseSeasons([response], episode_format, None)[0]
+
+	def _loadRemainingSeasons(self, series_id: str, episode_format: Optional[str], total_seasons: Optional[int],
+			loaded: Set[int]) -> Dict[int, SeasonResource]:
+		"""
+			Requests every season of a series that is not in `loaded`, the same way `_requestSeasons` does:
+			seasons up to `total_seasons` concurrently, then the following seasons one at a time.
+		"""
+		total_seasons = _seasonCount(total_seasons)
+		missing = [index for index in range(1, total_seasons + 1) if index not in loaded]
+		responses = dict()
+		if missing:
+			request_season = partial(self._requestSeason, series_id)
+			with ThreadPoolExecutor(max_workers = max(1, min(self.max_workers, len(missing)))) as executor:
+				responses = dict(zip(missing, executor.map(request_season, missing)))
+
+		if None not in responses.values():
+			index = total_seasons
+			while True:
+				index += 1
+				if index in loaded:
+					continue
+				response = self._requestSeason(series_id, index)
+				if response is None:
+					break
+				responses[index] = response
+
+		responses = {index: response for index, response in responses.items() if response is not None}
+		seasons = self._parseSeasons(list(responses.values()), episode_format, None)
+		return dict(zip(responses.keys(), seasons))
+
+	def refresh(self, media_resource: MediaResource, max_workers: Optional[int] = None) -> MediaResource:
+		"""
+			Updates a previously retrieved resource in place.
+			Only the top-level record and the seasons that may have changed (the last known season and any
+			new seasons) are requested again. Cached copies of those responses are ignored.
+			If the seasons were retrieved lazily and have not all been loaded, only the top-level record is
+			requested: the seasons that may have changed are discarded, and requested when next accessed.
+		Parameters
+		----------
+		media_resource: MediaResource
+		max_workers: int; default None
+
+		Returns
+		-------
+		MediaResource
+			The same object, updated.
+		"""
+		imdb_id = media_resource.imdbId
+		parameters = {'i': imdb_id}
+		if self.cache is not None:
+			self.cache.invalidate(parameters)
+		if self.memo is not None:
+			self.memo.invalidate(imdb_id)
+
+		response = self.request(**parameters)
+		if 'Type' not in response:
+			return media_resource
+		previous_total = _seasonCount(media_resource.totalSeasons)
+		parsed_response = self._parseMediaResponse(response, None, seasons = [])
+		parsed_response.pop('seasons')
+		for key, value in parsed_response.items():
+			setattr(media_resource, key, value)
+
+		if media_resource.type != 'series':
+			return media_resource
+
+		if isinstance(media_resource.seasons, LazySeasons) and not media_resource.seasons.complete:
+			start = max(1, previous_total)
+			self._invalidateSeasons(imdb_id, start, media_resource.totalSeasons)
+			media_resource.seasons.discard(start, total_seasons = media_resource.totalSeasons)
+			return media_resource
+
+		seasons = list(media_resource.seasons or [])
+		episodes = [e for season in seasons for e in season.episodes]
+		episode_format = 'long' if episodes and isinstance(episodes[0], MediaResource) else 'short'
+
+		# The last known season may have gained episodes or ratings, so it is requested again.
+		kept_seasons = seasons[:-1]
+		start = len(kept_seasons) + 1
+		self._invalidateSeasons(imdb_id, start, media_resource.totalSeasons)
+
+		previous = sum(max((e.indexInSeason for e in season.episodes), default = 0) for season in kept_seasons)
+		season_responses = self._requestSeasons(imdb_id, media_resource.totalSeasons, max_workers, start = start)
+		new_seasons = self._parseSeasons(season_responses, episode_format, max_workers, previous = previous)
+
+		media_resource.seasons = kept_seasons + new_seasons
+		return media_resource
+
+	def _invalidateSeasons(self, series_id: str, start: int, total_seasons: Optional[int]):
+		"""
+			Removes the cached responses of the seasons from `start` on. Includes the first season past the end,
+			which is probed for and may have been cached as missing.
+		"""
+		if self.cache is not None:
+			for index in range(start, max(start, _seasonCount(total_seasons)) + 2):
+				self.cache.invalidate({'i': series_id, 'Season': index})
+
+	def _hydrateEpisodes(self, episode_ids: List[str], max_workers: Optional[int] = None) -> Dict[str, Dict]:
+		"""
+			Requests the long-form response for every episode concurrently.
+		Parameters
+		----------
+		episode_ids: List[str]
+		max_workers: int; default None
+			The maximum number of concurrent requests. Defaults to `self.max_workers`.
+
+		Returns
+		-------
+		Dict[str, Dict]
+			Maps each imdbId to the parsed response returned by `get(..., asdict = True)`.
+		"""
+		if max_workers is None:
+			max_workers = self.max_workers
+		episode_ids = list(dict.fromkeys(episode_ids))
+		if not episode_ids:
+			return dict()
+
+		get_details = partial(self.get, asdict = True)
+		with ThreadPoolExecutor(max_workers = max(1, min(max_workers, len(episode_ids)))) as executor:
+			responses = list(executor.map(get_details, episode_ids))
+		return dict(zip(episode_ids, responses))
+
+	def _requestSeason(self, series_id: str, index: int) -> Optional[Dict]:
+		""" Requests a single season. Returns None if the season does not exist."""
+		parameters = {
+			'i':      series_id,
+			'Season': index
+		}
+		response = self.request(**parameters)
+		response_status = response.get('Response', 'False') == 'True'
+		return response if response_status else None
+
+	def _requestSeasons(self, series_id: str, total_seasons: Optional[int], max_workers: Optional[int],
+			start: int = 1) -> List[Dict]:
+		"""
+			Requests the raw response for every season of a series, in order, beginning with season `start`.
+			Seasons up to `total_seasons` are requested concurrently, after which the following
+			seasons are probed one at a time until the api reports that a season does not exist.
+		"""
+		if max_workers is None:
+			max_workers = self.max_workers
+		total_seasons = _seasonCount(total_seasons)
+
+		responses = list()
+		if total_seasons >= start:
+			request_season = partial(self._requestSeason, series_id)
+			with ThreadPoolExecutor(max_workers = max(1, min(max_workers, total_seasons - start + 1))) as executor:
+				responses = list(executor.map(request_season, range(start, total_seasons + 1)))
+
+			if None in responses:
+				# The season list ends at the first missing season.
+				return responses[:responses.index(None)]
+
+		index = start + len(responses) - 1
 		while True:
 			index += 1
-			parameters = {
-				'i':      series_id,
-				'Season': index
-			}
-			response = self.request(**parameters)
-
-			response_status = response.get('Response', 'False') == 'True'
-			if response_status:
-				season_number = response['Season']
-				season_episodes = [
-					self._parseEpisode(e, season_number, previous_episodes, form = episode_format)
-					for e in response['Episodes']
-				]
-
-				season_result = SeasonResource(
-					episodes = season_episodes,
-					seasonIndex = _toNumber(response['Season']),
-					length = len(season_episodes),
-					seriesTitle = response['Title']
-				)
-				seasons.append(season_result)
-				previous_episodes += max(season_episodes, key = lambda s: s.indexInSeason).indexInSeason
-			else:
+			response = self._requestSeason(series_id, index)
+			if response is None:
 				break
-		return seasons
+			responses.append(response)
+		return responses
 
 	def request(self, **parameters) -> Dict:
-		parameters['apikey'] = self.api_key
-		url = "http://www.omdbapi.com/"
-		response = requests.get(url, parameters)
-		response = response.json()
-		return response
+		with self.metrics.request(parameters) as record:
+			if self.cache is not None:
+				response = self.cache.get(parameters)
+				if response is not None:
+					record.cached = True
+					return response
+
+			parameters['apikey'] = self.api_key
+			response = self.transport.get(self.url, parameters)
+
+			if self.cache is not None:
+				self.cache.put(parameters, response)
+			return response
 
 if __name__ == "__main__":
 	pass
\ No newline at end of file
@@ -0,0 +1,377 @@
+import json
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+import numpy
+
+DAY = 24 * 60 * 60
+
+# Time-to-live, in seconds, of each kind of cached response.
+DEFAULT_TTLS: Dict[str, float] = {
+	'movie':          30 * DAY,
+	'episode':        30 * DAY,
+	'series_ended':   30 * DAY,
+	'series_ongoing': 1 * DAY,
+	'season':         30 * DAY,
+	'latest_season':  1 * DAY,
+	'search':         1 * DAY,
+	'missing':        1 * DAY,
+	'other':          1 * DAY
+}
+
+
+class ResponseCache:
+	"""
+		Persistent cache of raw api responses, backed by a local sqlite database.
+		Responses are keyed by their request parameters, excluding the api key, and expire
+		according to the kind of response (see `DEFAULT_TTLS`).
+	Parameters
+	----------
+	path: str, Path; default '~/.cache/omdbapi/responses.sqlite'
+		Location of the database. Use ':memory:' for a cache that only lives as long as the process.
+	ttls: Dict[str, float]; default None
+		Overrides for the time-to-live of each kind of response, in seconds.
+	max_entries: int; default 100000
+		The maximum number of responses to keep. The least recently used responses are evicted first.
+	max_bytes: int; default None
+		The maximum total size of the stored responses.
+	access_buffer: int; default 256
+		Cache hits only record their access time in memory. The recorded times are written to the database
+		in a single transaction once this many have accumulated, and before responses are evicted.
+	"""
+
+	def __init__(self, path: Union[str, Path] = None, ttls: Optional[Dict[str, float]] = None, max_entries: int = 100000,
+			max_bytes: Optional[int] = None, access_buffer: int = 256):
+		if path is None:
+			path = Path.home() / ".cache" / "omdbapi" / "responses.sqlite"
+		if str(path) != ':memory:':
+			path = Path(path)
+			path.parent.mkdir(parents = True, exist_ok = True)
+
+		self.path = path
+		self.ttls = dict(DEFAULT_TTLS)
+		if ttls:
+			self.ttls.update(ttls)
+		self.max_entries = max_entries
+		self.max_bytes = max_bytes
+		self.access_buffer = access_buffer
+
+		self.hits = 0
+		self.misses = 0
+		self.expired = 0
+		self.evictions = 0
+
+		self._lock = threading.Lock()
+		# Access times of cache hits that have not been written to the database yet.
+		self._accessed: Dict[str, float] = dict()
+		self._connection = sqlite3.connect(str(path), check_same_thread = False)
+		# Readers are not blocked by writers, and commits do not wait for the data to reach the disk.
+		self._connection.execute("PRAGMA journal_mode = WAL")
+		self._connection.execute("PRAGMA synchronous = NORMAL")
+		self._connection.execute(
+			"CREATE TABLE IF NOT EXISTS responses ("
+			"key TEXT PRIMARY KEY, kind TEXT, created REAL, accessed REAL, size INTEGER, body TEXT)"
+		)
+		self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+		self._connection.commit()
+
+	def __enter__(self) -> 'ResponseCache':
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	@staticmethod
+	def key(parameters: Dict) -> str:
+		""" Normalizes a set of request parameters into a cache key. The api key is ignored."""
+		items = sorted((str(k).lower(), str(v).strip().lower()) for k, v in parameters.items() if k != 'apikey')
+		return json.dumps(items, separators = (',', ':'))
+
+	@staticmethod
+	def classify(parameters: Dict, response: Dict) -> Optional[str]:
+		""" Determines which ttl applies to a response. Returns None if the response should not be cached."""
+		if response.get('Response') != 'True':
+			# Only cache definitive negative answers, never errors such as an exceeded request limit.
+			error = response.get('Error', '').lower()
+			return 'missing' if 'not found' in error else None
+
+		if 's' in parameters:
+			kind = 'search'
+		elif 'Season' in parameters:
+			season = str(response.get('Season', ''))
+			kind = 'latest_season' if season == str(response.get('totalSeasons')) else 'season'
+		elif response.get('Type') == 'series':
+			year = response.get('Year', '')
+			kind = 'series_ongoing' if year.endswith(('–', '-')) or year.isdigit() else 'series_ended'
+		elif response.get('Type') in ('movie', 'episode'):
+			kind = response['Type']
+		else:
+			kind = 'other'
+		return kind
+
+	def get(self, parameters: Dict) -> Optional[Dict]:
+		""" Returns the cached response for `parameters`, or None if it is missing or expired."""
+		key = self.key(parameters)
+		now = time.time()
+		with self._lock:
+			row = self._connection.execute("SELECT kind, created, body FROM responses WHERE key = ?", (key,)).fetchone()
+			if row is None:
+				self.misses += 1
+				return None
+			kind, created, body = row
+			if now - created > self.ttls.get(kind, self.ttls['other']):
+				self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+				self._connection.commit()
+				self._accessed.pop(key, None)
+				self.expired += 1
+				self.misses += 1
+				return None
+			self._accessed[key] = now
+			if len(self._accessed) >= self.access_buffer:
+				self._flushAccessed()
+				self._connection.commit()
+			self.hits += 1
+		return json.loads(body)
+
+	def put(self, parameters: Dict, response: Dict, kind: Optional[str] = None):
+		"""
+			Stores a response.
+		Parameters
+		----------
+		parameters: Dict
+			The parameters of the request that produced `response`.
+		response: Dict
+			The decoded json response.
+		kind: str; default None
+			The ttl category of the response. Inferred from the response if not provided.
+		"""
+		if kind is None:
+			kind = self.classify(parameters, response)
+		if kind is None:
+			return
+		key = self.key(parameters)
+		body = json.dumps(response, separators = (',', ':'))
+		now = time.time()
+		with self._lock:
+			self._accessed.pop(key, None)
+			self._connection.execute(
+				"INSERT OR REPLACE INTO responses (key, kind, created, accessed, size, body) VALUES (?, ?, ?, ?, ?, ?)",
+				(key, kind, now, now, len(body), body)
+			)
+			self._evict()
+			self._connection.commit()
+
+	def _flushAccessed(self):
+		""" Writes the buffered access times to the database, without committing. Expects the lock to be held."""
+		if self._accessed:
+			self._connection.executemany(
+				"UPDATE responses SET accessed = ? WHERE key = ?", [(accessed, key) for key, accessed in self._accessed.items()]
+			)
+			self._accessed.clear()
+
+	def _evict(self):
+		""" Removes the least recently used responses until the cache fits its limits. Expects the lock to be held."""
+		self._flushAccessed()
+		count, size = self._connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+		excess = max(0, count - self.max_entries) if self.max_entries else 0
+		if self.max_bytes and size > self.max_bytes:
+			rows = self._connection.execute("SELECT size FROM responses ORDER BY accessed, rowid")
+			freed = 0
+			overflow = 0
+			for (row_size,) in rows:
+				if size - freed <= self.max_bytes:
+					break
+				freed += row_size
+				overflow += 1
+			excess = max(excess, overflow)
+		if excess:
+			self._connection.execute(
+				"DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed, rowid LIMIT ?)", (excess,)
+			)
+			self.evictions += excess
+
+	def items(self, batch_size: int = 1000) -> Iterator[Tuple[Dict, Dict]]:
+		"""
+			Iterates over every stored (parameters, response) pair, including expired responses.
+			Responses are read `batch_size` at a time, so the cache can still be used during the iteration.
+		"""
+		last_row = 0
+		while True:
+			with self._lock:
+				rows = self._connection.execute(
+					"SELECT rowid, key, body FROM responses WHERE rowid > ? ORDER BY rowid LIMIT ?", (last_row, batch_size)
+				).fetchall()
+			if not rows:
+				return
+			for _, key, body in rows:
+				yield dict(json.loads(key)), json.loads(body)
+			last_row = rows[-1][0]
+
+	def invalidate(self, parameters: Dict):
+		""" Removes a single response from the cache."""
+		key = self.key(parameters)
+		with self._lock:
+			self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+			self._connection.commit()
+			self._accessed.pop(key, None)
+
+	def clear(self):
+		""" Removes every response from the cache."""
+		with self._lock:
+			self._connection.execute("DELETE FROM responses")
+			self._connection.commit()
+			self._accessed.clear()
+
+	def stats(self) -> Dict[str, int]:
+		""" Returns the hit/miss counters along with the current size of the cache."""
+		with self._lock:
+			count, size = self._connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+		return {
+			'hits':      self.hits,
+			'misses':    self.misses,
+			'expired':   self.expired,
+			'evictions': self.evictions,
+			'entries':   count,
+			'bytes':     size
+		}
+
+	def close(self):
+		with self._lock:
+			self._flushAccessed()
+			self._connection.commit()
+			self._connection.close()
+
+
+def _slotValues(value) -> list:
+	""" The values of the `__slots__` of an object, including those declared by its base classes."""
+	values = list()
+	for cls in type(value).__mro__:
+		slots = cls.__dict__.get('__slots__', ())
+		for name in (slots,) if isinstance(slots, str) else slots:
+			if name not in ('__dict__', '__weakref__') and hasattr(value, name):
+				values.append(getattr(value, name))
+	return values
+
+
+def _estimateSize(value, _seen: Optional[set] = None) -> int:
+	"""
+		Approximates the memory footprint of a parsed resource by walking its attributes (`__dict__` and
+		`__slots__`) and containers. numpy arrays are counted with their data buffer.
+	"""
+	if _seen is None:
+		_seen = set()
+	if id(value) in _seen:
+		return 0
+	_seen.add(id(value))
+
+	size = sys.getsizeof(value)
+	if isinstance(value, numpy.ndarray):
+		if not value.flags.owndata:
+			# `getsizeof` only includes the data of arrays that own it.
+			size += value.nbytes
+		if value.dtype == object:
+			size += sum(_estimateSize(i, _seen) for i in value.flat)
+	elif isinstance(value, dict):
+		size += sum(_estimateSize(k, _seen) + _estimateSize(v, _seen) for k, v in value.items())
+	elif isinstance(value, (list, tuple, set)):
+		size += sum(_estimateSize(i, _seen) for i in value)
+	else:
+		if hasattr(value, '__dict__'):
+			size += _estimateSize(vars(value), _seen)
+		size += sum(_estimateSize(i, _seen) for i in _slotValues(value))
+	return size
+
+
+class ResourceCache:
+	"""
+		Bounded in-memory LRU of parsed resources, keyed by `(imdbId, episode_format)`.
+		Cached resources are shared between callers, so they should be treated as read-only.
+		Sizes are only estimated, and reported by `stats()`, when `max_bytes` is set.
+	Parameters
+	----------
+	max_entries: int; default 128
+		The maximum number of resources to keep.
+	max_bytes: int; default None
+		An approximate memory budget for the cached resources.
+	"""
+
+	def __init__(self, max_entries: int = 128, max_bytes: Optional[int] = None):
+		self.max_entries = max_entries
+		self.max_bytes = max_bytes
+
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+		self._lock = threading.Lock()
+		self._resources: 'OrderedDict[Tuple[str, Optional[str]], Any]' = OrderedDict()
+		self._sizes: Dict[Tuple[str, Optional[str]], int] = dict()
+		self._bytes = 0
+
+	def __len__(self) -> int:
+		return len(self._resources)
+
+	def __contains__(self, key: Tuple[str, Optional[str]]) -> bool:
+		return key in self._resources
+
+	def get(self, imdb_id: str, episode_format: Optional[str]):
+		""" Returns the cached resource, or None if it is missing."""
+		key = (imdb_id, episode_format)
+		with self._lock:
+			resource = self._resources.get(key)
+			if resource is None:
+				self.misses += 1
+			else:
+				self._resources.move_to_end(key)
+				self.hits += 1
+		return resource
+
+	def put(self, imdb_id: str, episode_format: Optional[str], resource):
+		""" Stores a resource, evicting the least recently used resources if the cache is full."""
+		key = (imdb_id, episode_format)
+		size = _estimateSize(resource) if self.max_bytes else 0
+		with self._lock:
+			if key in self._resources:
+				self._bytes -= self._sizes.pop(key)
+			self._resources[key] = resource
+			self._resources.move_to_end(key)
+			self._sizes[key] = size
+			self._bytes += size
+
+			while self._resources and (
+					len(self._resources) > self.max_entries or (self.max_bytes and self._bytes > self.max_bytes)):
+				old_key, _ = self._resources.popitem(last = False)
+				self._bytes -= self._sizes.pop(old_key)
+				self.evictions += 1
+
+	def invalidate(self, imdb_id: str, episode_format: Optional[str] = ...):
+		""" Removes a resource. If `episode_format` is not given, every format of `imdb_id` is removed."""
+		with self._lock:
+			if episode_format is ...:
+				keys = [k for k in self._resources if k[0] == imdb_id]
+			else:
+				keys = [(imdb_id, episode_format)]
+			for key in keys:
+				if key in self._resources:
+					del self._resources[key]
+					self._bytes -= self._sizes.pop(key)
+
+	def clear(self):
+		with self._lock:
+			self._resources.clear()
+			self._sizes.clear()
+			self._bytes = 0
+
+	def stats(self) -> Dict[str, int]:
+		return {
+			'hits':      self.hits,
+			'misses':    self.misses,
+			'evictions': self.evictions,
+			'entries':   len(self._resources),
+			'bytes':     self._bytes
+		}
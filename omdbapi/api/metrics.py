@@ -0,0 +1,193 @@
+"""
+	Request instrumentation for OmdbApi.
+	Every request goes through `Metrics.request`, which calls the registered hooks and accumulates counters
+	per endpoint. Transports report the phases of the request being sent (connect, transfer, decode, rate limit
+	waits and retries) to the record returned by `currentRequest`, which is local to the calling thread or task.
+	Parsing is timed separately, per kind of resource, since a single resource may be built from many requests.
+"""
+import contextvars
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+ENDPOINTS = ('i', 't', 's', 'Season')
+PHASES = ('connect', 'transfer', 'decode')
+# Counters kept per endpoint, with their help text in the Prometheus export.
+COUNTERS = {
+	'requests':                "Requests sent to the api.",
+	'cache_hits':              "Requests answered by the response cache.",
+	'errors':                  "Requests that raised an exception.",
+	'retries':                 "Attempts repeated after a failure or a 'Request limit reached!' response.",
+	'rate_limit_waits':        "Attempts delayed by the rate limiter.",
+	'rate_limit_wait_seconds': "Time spent waiting for the rate limiter.",
+	'retry_wait_seconds':      "Time spent backing off before retries.",
+	'request_seconds':         "Time spent in requests, including cache lookups, waits and retries.",
+}
+
+_current: contextvars.ContextVar = contextvars.ContextVar('omdbapi_request', default = None)
+
+
+def endpointKind(parameters: Dict) -> str:
+	""" The kind of request: 'Season', 's' (search), 't' (title) or 'i' (imdbId). 'other' if none of them."""
+	for key in ('Season', 's', 't', 'i'):
+		if key in parameters:
+			return key
+	return 'other'
+
+
+@dataclass
+class RequestRecord:
+	""" What happened during a single request. Passed to the hooks of `Metrics`."""
+	endpoint: str
+	parameters: Dict
+	cached: bool = False
+	retries: int = 0
+	rate_limit_wait: float = 0.0
+	retry_wait: float = 0.0
+	timings: Dict[str, float] = field(default_factory = dict)
+	duration: float = 0.0
+	error: Optional[BaseException] = None
+
+	def addTiming(self, phase: str, seconds: float):
+		""" Adds to the time spent in a phase. Phases of retried attempts are summed."""
+		self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+	def addRetry(self, delay: float):
+		""" Records a retry of the request, after waiting `delay` seconds."""
+		self.retries += 1
+		self.retry_wait += delay
+
+
+def currentRequest() -> Optional[RequestRecord]:
+	""" The record of the request being sent by the calling thread or task, or None outside of `Metrics.request`."""
+	return _current.get()
+
+
+class Metrics:
+	"""
+		Hooks and counters for the requests sent by a client.
+	Attributes
+	----------
+	before_request: List[Callable[[RequestRecord], None]]
+		Called before the response cache is consulted. The record only has its `endpoint` and `parameters` set.
+		The api key is not included in the parameters.
+	after_request: List[Callable[[RequestRecord], None]]
+		Called once the request has completed or failed (with `error` set), with its timings.
+	"""
+
+	def __init__(self):
+		self.before_request: List[Callable[[RequestRecord], None]] = list()
+		self.after_request: List[Callable[[RequestRecord], None]] = list()
+		self._lock = threading.Lock()
+		self.reset()
+
+	def reset(self):
+		""" Sets every counter to zero. Hooks are kept."""
+		with self._lock:
+			self._counters: Dict[str, Counter] = {name: Counter() for name in COUNTERS}
+			self._phases: Counter = Counter()
+			self._parses: Counter = Counter()
+			self._parse_seconds: Counter = Counter()
+
+	@contextmanager
+	def request(self, parameters: Dict) -> Iterator[RequestRecord]:
+		""" Records the request sent inside the `with` block, which should set `cached` on cache hits."""
+		record = RequestRecord(endpointKind(parameters), dict(parameters))
+		for hook in self.before_request:
+			hook(record)
+		token = _current.set(record)
+		start = time.perf_counter()
+		try:
+			yield record
+		except BaseException as error:
+			record.error = error
+			raise
+		finally:
+			record.duration = time.perf_counter() - start
+			_current.reset(token)
+			self._add(record)
+			for hook in self.after_request:
+				hook(record)
+
+	@contextmanager
+	def parsing(self, kind: str) -> Iterator[None]:
+		""" Times the conversion of responses into a kind of resource ('media', 'season' or 'search')."""
+		start = time.perf_counter()
+		try:
+			yield
+		finally:
+			elapsed = time.perf_counter() - start
+			with self._lock:
+				self._parses[kind] += 1
+				self._parse_seconds[kind] += elapsed
+
+	def _add(self, record: RequestRecord):
+		endpoint = record.endpoint
+		with self._lock:
+			counters = self._counters
+			counters['cache_hits' if record.cached else 'requests'][endpoint] += 1
+			counters['request_seconds'][endpoint] += record.duration
+			if record.error is not None:
+				counters['errors'][endpoint] += 1
+			if record.retries:
+				counters['retries'][endpoint] += record.retries
+			if record.rate_limit_wait > 0:
+				counters['rate_limit_waits'][endpoint] += 1
+				counters['rate_limit_wait_seconds'][endpoint] += record.rate_limit_wait
+			if record.retry_wait > 0:
+				counters['retry_wait_seconds'][endpoint] += record.retry_wait
+			for phase, seconds in record.timings.items():
+				self._phases[endpoint, phase] += seconds
+
+	def snapshot(self) -> Dict[str, Dict]:
+		"""
+			Returns a copy of every counter.
+		Returns
+		-------
+		Dict[str, Dict]
+			- One entry per name of `COUNTERS`, mapping each endpoint to its value.
+			- `phase_seconds`: maps each endpoint to the time spent in each phase.
+			- `parses`, `parse_seconds`: map each kind of resource to the number of conversions and their total time.
+		"""
+		with self._lock:
+			result = {name: dict(counter) for name, counter in self._counters.items()}
+			phases = dict()
+			for (endpoint, phase), seconds in self._phases.items():
+				phases.setdefault(endpoint, dict())[phase] = seconds
+			result['phase_seconds'] = phases
+			result['parses'] = dict(self._parses)
+			result['parse_seconds'] = dict(self._parse_seconds)
+		return result
+
+	def prometheus(self, prefix: str = 'omdbapi') -> str:
+		""" Returns the counters in the Prometheus text exposition format."""
+		snapshot = self.snapshot()
+		lines = list()
+
+		def family(name: str, description: str, samples: List[Tuple[Dict[str, str], float]]):
+			metric = "{}_{}_total".format(prefix, name)
+			lines.append("# HELP {} {}".format(metric, description))
+			lines.append("# TYPE {} counter".format(metric))
+			for labels, value in samples:
+				label_text = ",".join('{}="{}"'.format(key, label) for key, label in labels.items())
+				lines.append("{}{{{}}} {}".format(metric, label_text, _formatValue(value)))
+
+		for name, description in COUNTERS.items():
+			family(name, description, [({'endpoint': e}, v) for e, v in sorted(snapshot[name].items())])
+		family('phase_seconds', "Time spent connecting (until the response headers), transferring and decoding responses.", [
+			({'endpoint': endpoint, 'phase': phase}, seconds)
+			for endpoint, phases in sorted(snapshot['phase_seconds'].items()) for phase, seconds in sorted(phases.items())
+		])
+		family('parses', "Responses converted into resources.", [({'kind': k}, v) for k, v in sorted(snapshot['parses'].items())])
+		family('parse_seconds', "Time spent converting responses into resources.",
+			[({'kind': k}, v) for k, v in sorted(snapshot['parse_seconds'].items())])
+		return "\n".join(lines) + "\n"
+
+
+def _formatValue(value: float) -> str:
+	if isinstance(value, int) or float(value).is_integer():
+		return str(int(value))
+	return repr(float(value))
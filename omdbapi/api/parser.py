@@ -0,0 +1,236 @@
+"""
+	Converters from raw api responses to resources.
+	The field converters are plain functions bound once at import time, and the conversions of values that
+	repeat across responses (release dates, runtimes) are memoized. Seasons are parsed in a single pass over
+	the episode list, constructing each resource directly rather than through an intermediate dict.
+	Compact seasons are converted column-wise: the ratings and release dates of whole seasons (or catalogs)
+	are parsed as arrays by pandas.
+	Memoized Timestamps and Durations are shared between resources, and should not be modified in place.
+"""
+import math
+from functools import lru_cache
+from typing import Dict, List, Tuple, Union
+
+import numpy
+from pytools import timetools
+from omdbapi.api.resources import CompactSeasonResource, EpisodeResource, SeasonResource, _toDatetime64
+
+NOT_AVAILABLE = 'N/A'
+# Below this number of episodes, converting values one at a time (memoized) is faster than going through pandas.
+VECTORIZE_MIN_EPISODES = 500
+_nan = math.nan
+_Timestamp = timetools.Timestamp
+_Duration = timetools.Duration
+
+
+def toNumber(value) -> Union[int, float]:
+	""" Converts an api value to an int or float. Missing and malformed values are returned as NaN."""
+	if value == NOT_AVAILABLE or value is None:
+		return _nan
+	try:
+		return int(value)
+	except (TypeError, ValueError):
+		pass
+	try:
+		return float(value)
+	except (TypeError, ValueError):
+		return _nan
+
+
+def toFloat(value) -> float:
+	""" Same as `toNumber`, but always returns a float."""
+	if value == NOT_AVAILABLE or value is None:
+		return _nan
+	try:
+		return float(value)
+	except (TypeError, ValueError):
+		return _nan
+
+
+def toVotes(value: str) -> Union[int, float]:
+	""" Converts a vote count such as '65,565'."""
+	if value == NOT_AVAILABLE or value is None:
+		return _nan
+	return toNumber(value.replace(',', '') if ',' in value else value)
+
+
+@lru_cache(maxsize = 8192)
+def toTimestamp(value: str) -> Union[timetools.Timestamp, float]:
+	""" Converts a release date such as '08 Feb 2017'. Returns NaN if the date is not available."""
+	if value == NOT_AVAILABLE or not value:
+		return _nan
+	return _Timestamp(value)
+
+
+@lru_cache(maxsize = 8192)
+def toDatetime64(value: str) -> numpy.datetime64:
+	""" Same as `toTimestamp`, but returns a numpy datetime64 (NaT if not available)."""
+	return _toDatetime64(toTimestamp(value))
+
+
+@lru_cache(maxsize = 1024)
+def toDuration(value: str) -> Union[timetools.Duration, float]:
+	""" Converts a runtime such as '60 min'. Returns NaN if the runtime is not available."""
+	if value == NOT_AVAILABLE or not value:
+		return _nan
+	return _Duration(minutes = int(value.split(' ', 1)[0]))
+
+
+def parseMedia(api_response: Dict) -> Dict:
+	""" Converts the top-level fields of a `i=`/`t=` response. Seasons are not included."""
+	get = api_response.get
+	return {
+		'actors':         api_response['Actors'],
+		'awards':         api_response['Awards'],
+		'country':        api_response['Country'],
+		'director':       api_response['Director'],
+		'genre':          api_response['Genre'],
+		'language':       api_response['Language'],
+		'metascore':      toNumber(get('Metascore')),
+		'plot':           api_response['Plot'],
+		'rating':         api_response['Rated'],
+		'ratings':        api_response['Ratings'],
+		'title':          api_response['Title'],
+		'type':           api_response['Type'],
+		'writer':         api_response['Writer'],
+		'year':           api_response['Year'],
+		'imdbId':         api_response['imdbID'],
+		'responseStatus': api_response['Response'] == 'True',
+		'imdbRating':     toNumber(get('imdbRating')),
+		'imdbVotes':      toVotes(get('imdbVotes')),
+		'releaseDate':    toTimestamp(get('Released')),
+		'duration':       toDuration(get('Runtime')),
+	}
+
+
+def episodeId(season, episode) -> str:
+	""" Formats an episode id as 'SnnEnn'."""
+	return "S{:>02}E{:>02}".format(season, episode)
+
+
+def parseEpisodes(episodes: List[Dict], season, previous: int) -> List[EpisodeResource]:
+	"""
+		Converts the short-form episodes of a `Season` response into EpisodeResources.
+	Parameters
+	----------
+	episodes: List[Dict]
+		The `Episodes` list of the response.
+	season: str, int
+		The season number.
+	previous: int
+		The number of episodes in the seasons preceding this one.
+	"""
+	prefix = "S{:>02}E".format(season)
+	result = list()
+	append = result.append
+	for episode in episodes:
+		number = episode['Episode']
+		index = int(number)
+		append(EpisodeResource(
+			title = episode['Title'],
+			imdbId = episode['imdbID'],
+			imdbRating = toFloat(episode.get('imdbRating')),
+			releaseDate = toTimestamp(episode['Released']),
+			episodeId = prefix + "{:>02}".format(number),
+			indexInSeries = previous + index,
+			indexInSeason = index
+		))
+	return result
+
+
+def parseSeason(response: Dict, previous: int) -> SeasonResource:
+	""" Converts a `Season` response into a SeasonResource of short-form episodes."""
+	episodes = parseEpisodes(response['Episodes'], response['Season'], previous)
+	return SeasonResource(
+		episodes = episodes,
+		seasonIndex = toNumber(response['Season']),
+		length = len(episodes),
+		seriesTitle = response['Title']
+	)
+
+
+def _episodeArrays(episodes: List[Dict]) -> Dict[str, numpy.ndarray]:
+	""" Converts the ratings, release dates and episode numbers of any number of short-form episodes at once."""
+	count = len(episodes)
+	index_in_season = numpy.fromiter((int(e['Episode']) for e in episodes), dtype = numpy.int32, count = count)
+	if count < VECTORIZE_MIN_EPISODES:
+		ratings = numpy.fromiter((toFloat(e.get('imdbRating')) for e in episodes), dtype = numpy.float64, count = count)
+		release_dates = numpy.array([toDatetime64(e.get('Released')) for e in episodes], dtype = 'datetime64[s]')
+	else:
+		import pandas
+		ratings = pandas.to_numeric(
+			pandas.Series([e.get('imdbRating') for e in episodes], dtype = object), errors = 'coerce'
+		).to_numpy(dtype = numpy.float64)
+		release_dates = pandas.to_datetime(
+			pandas.Series([e.get('Released') for e in episodes], dtype = object), format = '%d %b %Y', errors = 'coerce'
+		).to_numpy(dtype = 'datetime64[s]')
+	return {'imdbRatings': ratings, 'releaseDates': release_dates, 'indexInSeason': index_in_season}
+
+
+def _compactSeasons(groups: List[Tuple[List[Dict], int]]) -> List[List[CompactSeasonResource]]:
+	"""
+		Converts groups of consecutive `Season` responses, each with the number of episodes preceding the group,
+		with a single vectorized conversion over every episode of every group.
+	"""
+	episodes = [e for responses, _ in groups for response in responses for e in response['Episodes']]
+	arrays = _episodeArrays(episodes)
+
+	result = list()
+	start = 0
+	for responses, previous in groups:
+		seasons = list()
+		for response in responses:
+			stop = start + len(response['Episodes'])
+			season_episodes = episodes[start:stop]
+			index_in_season = arrays['indexInSeason'][start:stop]
+			seasons.append(CompactSeasonResource(
+				seasonIndex = toNumber(response['Season']),
+				seriesTitle = response['Title'],
+				titles = [e['Title'] for e in season_episodes],
+				imdbIds = [e['imdbID'] for e in season_episodes],
+				imdbRatings = arrays['imdbRatings'][start:stop],
+				releaseDates = arrays['releaseDates'][start:stop],
+				indexInSeries = index_in_season + previous,
+				indexInSeason = index_in_season
+			))
+			previous += int(index_in_season.max(initial = 0))
+			start = stop
+		result.append(seasons)
+	return result
+
+
+def parseCompactSeason(response: Dict, previous: int) -> CompactSeasonResource:
+	""" Converts a `Season` response directly into a CompactSeasonResource, without creating any EpisodeResources."""
+	return _compactSeasons([([response], previous)])[0][0]
+
+
+def parseCompactSeasons(responses: List[Dict], previous: int = 0) -> List[CompactSeasonResource]:
+	"""
+		Converts the consecutive `Season` responses of a series into CompactSeasonResources.
+		Ratings and release dates of every season are converted together, as arrays.
+	Parameters
+	----------
+	responses: List[Dict]
+	previous: int; default 0
+		The number of episodes in the seasons preceding the first response.
+	"""
+	return _compactSeasons([(responses, previous)])[0]
+
+
+def parseCatalog(catalog: Dict[str, List[Dict]]) -> Dict[str, List[CompactSeasonResource]]:
+	"""
+		Same as `parseCompactSeasons` for any number of series at once, i.e. when replaying cached responses.
+		Every episode of the catalog goes through a single vectorized conversion.
+	Parameters
+	----------
+	catalog: Dict[str, List[Dict]]
+		Maps each series imdbId to its consecutive `Season` responses.
+
+	Returns
+	-------
+	Dict[str, List[CompactSeasonResource]]
+		The seasons of each series. Can be assigned to `MediaResource.seasons` and passed to `catalog_table`.
+	"""
+	series_ids = list(catalog)
+	seasons = _compactSeasons([(catalog[series_id], 0) for series_id in series_ids])
+	return dict(zip(series_ids, seasons))
@@ -0,0 +1,178 @@
+import datetime
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+
+class RequestLimitError(RuntimeError):
+	""" Raised when the api (or the local quota) refuses further requests."""
+
+
+def isLimitResponse(payload: Dict) -> bool:
+	""" Checks whether a decoded response is the api's 'Request limit reached!' error."""
+	return isinstance(payload, dict) and payload.get('Error', '').lower().startswith('request limit reached')
+
+
+class TokenBucket:
+	"""
+		Thread-safe token bucket shared by every request sent through a transport.
+	Parameters
+	----------
+	rate: float
+		The number of requests allowed per second, on average.
+	capacity: float; default None
+		The maximum burst size. Defaults to `rate`.
+	"""
+
+	def __init__(self, rate: float, capacity: Optional[float] = None):
+		if rate <= 0:
+			message = "'rate' must be positive, got {}".format(rate)
+			raise ValueError(message)
+		self.rate = rate
+		self.capacity = capacity if capacity is not None else max(1.0, rate)
+
+		self._tokens = self.capacity
+		self._updated = time.monotonic()
+		self._lock = threading.Lock()
+
+		self.waited = 0.0
+
+	def reserve(self, tokens: float = 1) -> float:
+		"""
+			Takes `tokens` from the bucket and returns how long the caller must wait before using them.
+			Does not block, so it can be used from coroutines as well as threads.
+		"""
+		with self._lock:
+			now = time.monotonic()
+			self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+			self._updated = now
+			self._tokens -= tokens
+			delay = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+			self.waited += delay
+		return delay
+
+	def acquire(self, tokens: float = 1) -> float:
+		""" Blocks until `tokens` are available. Returns the time spent waiting."""
+		delay = self.reserve(tokens)
+		if delay > 0:
+			time.sleep(delay)
+		return delay
+
+
+class DailyQuota:
+	"""
+		Counts the requests sent during the current (UTC) day, which is how the api enforces its limits.
+	Parameters
+	----------
+	limit: int; default 1000
+		The number of requests allowed per day. The free api tier allows 1000.
+	"""
+
+	def __init__(self, limit: int = 1000):
+		self.limit = limit
+		self._day = self._today()
+		self._used = 0
+		self._lock = threading.Lock()
+
+	@staticmethod
+	def _today() -> datetime.date:
+		return datetime.datetime.now(datetime.timezone.utc).date()
+
+	def _roll(self):
+		today = self._today()
+		if today != self._day:
+			self._day = today
+			self._used = 0
+
+	@property
+	def used(self) -> int:
+		with self._lock:
+			self._roll()
+			return self._used
+
+	@property
+	def remaining(self) -> int:
+		with self._lock:
+			self._roll()
+			return max(0, self.limit - self._used)
+
+	def consume(self, count: int = 1):
+		""" Records `count` requests. Raises a RequestLimitError if the quota is exhausted."""
+		with self._lock:
+			self._roll()
+			if self._used + count > self.limit:
+				message = "The daily quota of {} requests has been used.".format(self.limit)
+				raise RequestLimitError(message)
+			self._used += count
+
+	def exhaust(self):
+		""" Marks the quota as used up, i.e. when the api reports that the limit was reached."""
+		with self._lock:
+			self._roll()
+			self._used = max(self._used, self.limit)
+
+
+class RetryPolicy:
+	"""
+		Exponential backoff with full jitter for failed requests.
+	Parameters
+	----------
+	max_retries: int; default 4
+		The number of times a request is retried before giving up.
+	backoff: float; default 0.5
+		The base delay, in seconds. Retry `n` waits a random time between 0 and `backoff * 2**n`.
+	max_backoff: float; default 30
+		The upper bound of a single delay.
+	statuses: tuple; default (429, 500, 502, 503, 504)
+		The http status codes that are retried.
+	"""
+
+	def __init__(self, max_retries: int = 4, backoff: float = 0.5, max_backoff: float = 30,
+			statuses = (429, 500, 502, 503, 504)):
+		self.max_retries = max_retries
+		self.backoff = backoff
+		self.max_backoff = max_backoff
+		self.statuses = frozenset(statuses)
+
+	def delay(self, attempt: int) -> float:
+		""" The time to wait before retry number `attempt` (starting at 0)."""
+		return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+	def shouldRetry(self, status: int, payload: Optional[Dict]) -> bool:
+		return status in self.statuses or isLimitResponse(payload)
+
+	def decide(self, attempt: int, status: Optional[int], payload: Optional[Dict],
+			quota: Optional[DailyQuota] = None) -> Optional[float]:
+		"""
+			Decides what happens after attempt number `attempt` (starting at 0) of a request. Shared by every transport.
+		Parameters
+		----------
+		attempt: int
+		status: int
+			The http status of the response, or None if no response was received (connection error or timeout).
+		payload: Dict
+			The decoded body of the response, if any.
+		quota: DailyQuota; default None
+			Marked as exhausted if the api still reports that its request limit was reached after the last retry.
+
+		Returns
+		-------
+		Optional[float]
+			The time to wait before retrying, or None if the request is not retried. The caller then returns the
+			response, or raises if no response was received or the response is still an error (see `shouldRetry`).
+
+		Raises
+		------
+		RequestLimitError
+			If the api still reports that its request limit was reached after the last retry.
+		"""
+		if status is not None and not self.shouldRetry(status, payload):
+			return None
+		if attempt >= self.max_retries:
+			if isLimitResponse(payload):
+				if quota is not None:
+					quota.exhaust()
+				raise RequestLimitError(payload['Error'])
+			return None
+		return self.delay(attempt)
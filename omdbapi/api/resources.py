@@ -1,11 +1,70 @@
-from typing import Dict, List
-import pandas
+import copy
+import datetime
+import math
+import re
+import threading
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Set, Union
+import numpy
 
 from pathlib import Path
 from pytools import timetools
 from pytools.datatools import dataclass
 from dataclasses import asdict
 
+if TYPE_CHECKING:
+	# pandas is only imported when a table is built.
+	import pandas
+
+_EPISODE_KEY = re.compile(r"^s?(?P<season>[0-9]+)\s*[ex](?P<episode>[0-9]+)$", re.IGNORECASE)
+
+
+def _normalizeEpisodeKey(key) -> Optional[str]:
+	""" Converts keys such as 's1e2' or 'S01E02' to the 'SnnEnn' format of `episodeId`. Returns None for other keys."""
+	match = _EPISODE_KEY.match(str(key).strip())
+	if match is None:
+		return None
+	return "S{:>02}E{:>02}".format(int(match.group('season')), int(match.group('episode')))
+
+
+def _firstPositions(values: Iterable) -> Dict:
+	""" Maps each value to the position of its first occurrence."""
+	positions = dict()
+	for position, value in enumerate(values):
+		positions.setdefault(value, position)
+	return positions
+
+
+class _EpisodeIndex:
+	"""
+		Lookup tables of a season's (or series') episodes, keyed by `indexInSeason`, `episodeId`, `imdbId`
+		and `indexInSeries`. `signature` identifies the episode list the index was built from.
+	"""
+	__slots__ = ('signature', 'bySeasonIndex', 'byEpisodeId', 'byImdbId', 'bySeriesIndex')
+
+	def __init__(self, signature, bySeasonIndex: Dict, byEpisodeId: Dict, byImdbId: Dict, bySeriesIndex: Dict):
+		self.signature = signature
+		self.bySeasonIndex = bySeasonIndex
+		self.byEpisodeId = byEpisodeId
+		self.byImdbId = byImdbId
+		self.bySeriesIndex = bySeriesIndex
+
+	def find(self, key):
+		"""
+			Returns the position of the episode matching `key`, which may be an `indexInSeason`,
+			an `episodeId` (SnnEnn) or an `imdbId`.
+		"""
+		if isinstance(key, (int, numpy.integer)):
+			return self.bySeasonIndex.get(int(key))
+		key = str(key).strip()
+		if key.startswith('tt'):
+			return self.byImdbId.get(key)
+		if key.isdigit():
+			return self.bySeasonIndex.get(int(key))
+		episode_id = _normalizeEpisodeKey(key)
+		return self.byEpisodeId.get(episode_id) if episode_id else None
+
+
 @dataclass
 class EpisodeResource:
 	title: str
@@ -36,14 +95,46 @@ class SeasonResource:
 		for i in self.episodes:
 			yield i
 
+	def _indexSignature(self):
+		return id(self.episodes), len(self.episodes)
+
+	def _episodeAt(self, position: int) -> EpisodeResource:
+		return self.episodes[position]
+
+	def _episodeIndex(self) -> _EpisodeIndex:
+		""" Returns the lookup index of this season, rebuilding it if `episodes` was replaced or resized."""
+		signature = self._indexSignature()
+		index = getattr(self, '_index', None)
+		if index is None or index.signature != signature:
+			episodes = self.episodes
+			index = _EpisodeIndex(
+				signature,
+				bySeasonIndex = _firstPositions(e.indexInSeason for e in episodes),
+				byEpisodeId = _firstPositions(e.episodeId for e in episodes),
+				byImdbId = _firstPositions(e.imdbId for e in episodes),
+				bySeriesIndex = _firstPositions(e.indexInSeries for e in episodes)
+			)
+			self._index = index
+		return index
+
+	def invalidate_index(self):
+		""" Discards the lookup index. Only needed after episodes are modified in place."""
+		self._index = None
+
 	def get_episode(self, key):
-		candidates = [i for i in self.episodes if i.indexInSeason == int(key)]
+		""" Retrieves an episode by its index in the season, its episodeId (SnnEnn) or its imdbId."""
+		position = self._episodeIndex().find(key)
+		return None if position is None else self._episodeAt(position)
 
-		if len(candidates) == 0:
-			episode = None
-		else:
-			episode = candidates[0]
-		return episode
+	def get_episodes(self, keys: Iterable) -> List:
+		""" Retrieves several episodes at once. Missing episodes are returned as None."""
+		index = self._episodeIndex()
+		positions = [index.find(key) for key in keys]
+		return [None if position is None else self._episodeAt(position) for position in positions]
+
+	def get_episode_by_series_index(self, index_in_series: int):
+		position = self._episodeIndex().bySeriesIndex.get(int(index_in_series))
+		return None if position is None else self._episodeAt(position)
 
 	def summary(self, level: int = 0) -> None:
 		missing_string = "<--missing-->"
@@ -59,6 +150,319 @@ class SeasonResource:
 
 			print(indent + '\t', episode)
 
+	def compact(self) -> 'CompactSeasonResource':
+		""" Returns a column-oriented copy of this season. See `CompactSeasonResource`."""
+		return CompactSeasonResource.from_season(self)
+
+
+def _toDatetime64(value) -> numpy.datetime64:
+	""" Converts a timetools.Timestamp (or NaN) to a numpy datetime64, with NaT for missing dates."""
+	if not isinstance(value, datetime.datetime):
+		return numpy.datetime64('NaT', 's')
+	value = datetime.datetime(value.year, value.month, value.day, value.hour, value.minute, value.second)
+	return numpy.datetime64(value, 's')
+
+
+def _fromDatetime64(value: numpy.datetime64):
+	""" Inverse of `_toDatetime64`."""
+	if numpy.isnat(value):
+		return math.nan
+	value = value.astype('datetime64[s]').item()
+	return timetools.Timestamp(value.year, value.month, value.day, value.hour, value.minute, value.second)
+
+
+class EpisodeView:
+	"""
+		Read-only view of a single episode stored in a CompactSeasonResource.
+		Exposes the same attributes as EpisodeResource.
+	"""
+	__slots__ = ('_season', '_position')
+
+	def __init__(self, season: 'CompactSeasonResource', position: int):
+		self._season = season
+		self._position = position
+
+	@property
+	def title(self) -> str:
+		return self._season.titles[self._position]
+
+	@property
+	def imdbId(self) -> str:
+		return self._season.imdbIds[self._position]
+
+	@property
+	def imdbRating(self) -> float:
+		return float(self._season.imdbRatings[self._position])
+
+	@property
+	def releaseDate(self) -> timetools.Timestamp:
+		return _fromDatetime64(self._season.releaseDates[self._position])
+
+	@property
+	def episodeId(self) -> str:
+		return "S{:>02}E{:>02}".format(self._season.seasonIndex, self.indexInSeason)
+
+	@property
+	def indexInSeries(self) -> int:
+		return int(self._season.indexInSeries[self._position])
+
+	@property
+	def indexInSeason(self) -> int:
+		return int(self._season.indexInSeason[self._position])
+
+	def __getitem__(self, item: str):
+		return getattr(self, item)
+
+	def __eq__(self, other) -> bool:
+		if isinstance(other, (EpisodeView, EpisodeResource)):
+			return self.to_dict() == other.to_dict()
+		return NotImplemented
+
+	__str__ = EpisodeResource.__str__
+
+	def to_dict(self) -> Dict:
+		return {field: getattr(self, field) for field in CompactSeasonResource.episode_fields}
+
+	def to_episode(self) -> EpisodeResource:
+		return EpisodeResource(**self.to_dict())
+
+
+class CompactSeasonResource:
+	"""
+		Memory-efficient, column-oriented alternative to SeasonResource.
+		Episodes are stored as parallel arrays and materialized as lightweight `EpisodeView`s on access,
+		so callers can use it exactly like a SeasonResource of short-form episodes.
+	"""
+	__slots__ = (
+		'seasonIndex', 'seriesTitle', 'titles', 'imdbIds', 'imdbRatings', 'releaseDates', 'indexInSeries',
+		'indexInSeason', '_index', '__weakref__'
+	)
+	episode_fields = ('title', 'imdbId', 'imdbRating', 'releaseDate', 'episodeId', 'indexInSeries', 'indexInSeason')
+
+	def __init__(self, seasonIndex: int, seriesTitle: str, titles: List[str], imdbIds: List[str],
+			imdbRatings: numpy.ndarray, releaseDates: numpy.ndarray, indexInSeries: numpy.ndarray,
+			indexInSeason: numpy.ndarray):
+		self.seasonIndex = seasonIndex
+		self.seriesTitle = seriesTitle
+		self.titles = list(titles)
+		self.imdbIds = list(imdbIds)
+		self.imdbRatings = numpy.asarray(imdbRatings, dtype = numpy.float64)
+		self.releaseDates = numpy.asarray(releaseDates, dtype = 'datetime64[s]')
+		self.indexInSeries = numpy.asarray(indexInSeries, dtype = numpy.int32)
+		self.indexInSeason = numpy.asarray(indexInSeason, dtype = numpy.int32)
+		self._index = None
+
+	@classmethod
+	def from_season(cls, season: SeasonResource) -> 'CompactSeasonResource':
+		episodes = season.episodes
+		return cls(
+			seasonIndex = season.seasonIndex,
+			seriesTitle = season.seriesTitle,
+			titles = [e.title for e in episodes],
+			imdbIds = [e.imdbId for e in episodes],
+			imdbRatings = [e.imdbRating for e in episodes],
+			releaseDates = [_toDatetime64(e.releaseDate) for e in episodes],
+			indexInSeries = [e.indexInSeries for e in episodes],
+			indexInSeason = [e.indexInSeason for e in episodes]
+		)
+
+	def to_season(self) -> SeasonResource:
+		""" Converts this season back into a regular SeasonResource."""
+		episodes = [e.to_episode() for e in self]
+		return SeasonResource(
+			episodes = episodes, seasonIndex = self.seasonIndex, length = len(episodes), seriesTitle = self.seriesTitle
+		)
+
+	@property
+	def episodes(self) -> List[EpisodeView]:
+		return [EpisodeView(self, i) for i in range(len(self.titles))]
+
+	@property
+	def length(self) -> int:
+		return len(self.titles)
+
+	def __len__(self) -> int:
+		return len(self.titles)
+
+	def __iter__(self):
+		for i in range(len(self.titles)):
+			yield EpisodeView(self, i)
+
+	def __getitem__(self, item: str):
+		return getattr(self, item)
+
+	def to_dict(self) -> Dict:
+		return {
+			'episodes':    [e.to_dict() for e in self],
+			'seasonIndex': self.seasonIndex,
+			'length':      self.length,
+			'seriesTitle': self.seriesTitle
+		}
+
+	def compact(self) -> 'CompactSeasonResource':
+		return self
+
+	def _indexSignature(self):
+		return id(self.titles), len(self.titles)
+
+	def _episodeAt(self, position: int) -> EpisodeView:
+		return EpisodeView(self, position)
+
+	def _episodeIndex(self) -> _EpisodeIndex:
+		signature = self._indexSignature()
+		if self._index is None or self._index.signature != signature:
+			season_indices = self.indexInSeason.tolist()
+			self._index = _EpisodeIndex(
+				signature,
+				bySeasonIndex = _firstPositions(season_indices),
+				byEpisodeId = _firstPositions("S{:>02}E{:>02}".format(self.seasonIndex, i) for i in season_indices),
+				byImdbId = _firstPositions(self.imdbIds),
+				bySeriesIndex = _firstPositions(self.indexInSeries.tolist())
+			)
+		return self._index
+
+	__str__ = SeasonResource.__str__
+	invalidate_index = SeasonResource.invalidate_index
+	get_episode = SeasonResource.get_episode
+	get_episodes = SeasonResource.get_episodes
+	get_episode_by_series_index = SeasonResource.get_episode_by_series_index
+	summary = SeasonResource.summary
+
+
+class LazySeasons(Sequence):
+	"""
+		The seasons of a series, requested from the api the first time they are accessed.
+		Accessing a single season (`season`, `get_season`, `get_episode('SnnEnn')`) only requests that season.
+		Anything that needs every season (iteration, `len`, slicing, imdbId lookups) requests the remaining
+		seasons concurrently, once.
+		`indexInSeries` is exact for a season once every earlier season has been loaded. Until then it is
+		provisional, and counts from the first episode of the season.
+	Parameters
+	----------
+	load_season: Callable[[int], Optional[SeasonResource]]
+		Requests a single season by its number. Returns None if the season does not exist.
+	load_remaining: Callable[[Set[int]], Dict[int, SeasonResource]]
+		Requests every season whose number is not in the given set, mapped by season number.
+	total_seasons: int; default 0
+		The number of seasons reported by the api. Only used for truth-testing before the seasons are loaded.
+	"""
+
+	def __init__(self, load_season: Callable[[int], Optional[SeasonResource]],
+			load_remaining: Callable[[Set[int]], Dict[int, SeasonResource]], total_seasons: int = 0):
+		self._loadSeason = load_season
+		self._loadRemaining = load_remaining
+		self.total_seasons = total_seasons
+
+		self._loaded: Dict[int, Optional[SeasonResource]] = dict()
+		self._seasons: Optional[List[SeasonResource]] = None
+		self._lock = threading.RLock()
+
+	@property
+	def complete(self) -> bool:
+		""" Whether every season has been loaded."""
+		return self._seasons is not None
+
+	def loaded(self) -> List[int]:
+		""" The numbers of the seasons that have been loaded so far."""
+		return sorted(index for index, season in self._loaded.items() if season is not None)
+
+	def season(self, season_index: int) -> Optional[SeasonResource]:
+		""" Returns a season by its number, requesting only that season if needed. Returns None if it does not exist."""
+		with self._lock:
+			if self._seasons is not None:
+				return next((s for s in self._seasons if s.seasonIndex == season_index), None)
+			if season_index not in self._loaded:
+				self._loaded[season_index] = self._loadSeason(season_index)
+				self._reindex()
+			return self._loaded[season_index]
+
+	def prefetch(self) -> List[SeasonResource]:
+		""" Requests every season that has not been loaded yet and returns the full list of seasons."""
+		with self._lock:
+			if self._seasons is None:
+				self._loaded.update(self._loadRemaining(set(self.loaded())))
+				# As with `OmdbApi.getSeasons`, the season list ends at the first missing season.
+				seasons = list()
+				while self._loaded.get(len(seasons) + 1) is not None:
+					seasons.append(self._loaded[len(seasons) + 1])
+				self._seasons = seasons
+				self._reindex()
+			return self._seasons
+
+	def discard(self, season_index: int, total_seasons: Optional[int] = None):
+		"""
+			Forgets the loaded seasons numbered `season_index` or higher, so that they are requested again the next
+			time they are accessed. Used by `OmdbApi.refresh`.
+		Parameters
+		----------
+		season_index: int
+		total_seasons: int; default None
+			The updated number of seasons reported by the api.
+		"""
+		with self._lock:
+			for index in [index for index in self._loaded if index >= season_index]:
+				del self._loaded[index]
+			if total_seasons is not None:
+				self.total_seasons = total_seasons
+			self._seasons = None
+			self._reindex()
+
+	def _reindex(self):
+		""" Sets the exact `indexInSeries` of every season preceded only by loaded seasons."""
+		previous = 0
+		index = 1
+		while self._loaded.get(index) is not None:
+			season = self._loaded[index]
+			if isinstance(season, CompactSeasonResource):
+				season.indexInSeries = (season.indexInSeason + previous).astype(numpy.int32)
+				previous += int(season.indexInSeason.max(initial = 0))
+			else:
+				for episode in season.episodes:
+					episode.indexInSeries = previous + episode.indexInSeason
+				previous += max((e.indexInSeason for e in season.episodes), default = 0)
+			season.invalidate_index()
+			index += 1
+
+	def __getitem__(self, item):
+		if isinstance(item, (int, numpy.integer)) and item >= 0 and self._seasons is None:
+			season = self.season(int(item) + 1)
+			if season is None:
+				raise IndexError("season index out of range")
+			return season
+		return self.prefetch()[item]
+
+	def __len__(self) -> int:
+		return len(self.prefetch())
+
+	def __iter__(self):
+		return iter(self.prefetch())
+
+	def __bool__(self) -> bool:
+		if self._seasons is not None:
+			return bool(self._seasons)
+		return bool(_seasonCount(self.total_seasons) or self.loaded())
+
+	def __eq__(self, other) -> bool:
+		if not isinstance(other, (list, tuple, LazySeasons)):
+			return NotImplemented
+		return list(self) == list(other)
+
+	def __deepcopy__(self, memo) -> List[SeasonResource]:
+		# Copies (i.e. `dataclasses.asdict`) hold plain lists rather than a reference to the api client.
+		return copy.deepcopy(self.prefetch(), memo)
+
+	def __repr__(self) -> str:
+		if self._seasons is not None:
+			return "LazySeasons({} seasons)".format(len(self._seasons))
+		return "LazySeasons(loaded = {})".format(self.loaded())
+
+
+def _seasonCount(total_seasons) -> int:
+	""" Converts a parsed `totalSeasons` value, which may be missing or NaN, to an int."""
+	if isinstance(total_seasons, (int, float, numpy.number)) and not math.isnan(total_seasons):
+		return int(total_seasons)
+	return 0
+
 
 @dataclass
 class MediaResource:
@@ -97,26 +501,100 @@ class MediaResource:
 		string = "MediaResource('{}', '{}')".format(self.type, self.title)
 		return string
 
-	def get_episode(self, key: str) -> EpisodeResource:
-		""" Retrives an episode based on SnnEnn"""
+	def _episodeIndex(self) -> _EpisodeIndex:
+		"""
+			Returns the series-wide lookup index, mapping keys to (season position, episode position).
+			The index is rebuilt whenever `seasons` or the episodes of any season are replaced or resized.
+		"""
+		seasons = self.seasons or []
+		signature = (id(seasons), tuple(season._indexSignature() for season in seasons))
+		index = getattr(self, '_index', None)
+		if index is None or index.signature != signature:
+			season_indices = dict()
+			episode_ids = dict()
+			imdb_ids = dict()
+			series_indices = dict()
+			for season_position, season in enumerate(seasons):
+				season_indices.setdefault(season.seasonIndex, season_position)
+				season_index = season._episodeIndex()
+				for lookup, table in ((season_index.byEpisodeId, episode_ids), (season_index.byImdbId, imdb_ids),
+						(season_index.bySeriesIndex, series_indices)):
+					for key, position in lookup.items():
+						table.setdefault(key, (season_position, position))
+			index = _EpisodeIndex(signature, season_indices, episode_ids, imdb_ids, series_indices)
+			self._index = index
+		return index
+
+	def invalidate_index(self):
+		""" Discards the lookup indexes of the series and its seasons."""
+		self._index = None
+		for season in self.seasons or []:
+			season.invalidate_index()
 
-		season_number, episode_number = key.lower().split('e')
-		season = self.get_season(season_number)
-		if season is None:
-			episode = None
+	def _findEpisode(self, index: _EpisodeIndex, key):
+		if isinstance(key, (int, numpy.integer)):
+			location = index.bySeriesIndex.get(int(key))
+		elif str(key).strip().startswith('tt'):
+			location = index.byImdbId.get(str(key).strip())
 		else:
-			episode = season.get_episode(int(episode_number))
+			location = index.byEpisodeId.get(_normalizeEpisodeKey(key))
+		if location is None:
+			return None
+		season_position, position = location
+		return self.seasons[season_position]._episodeAt(position)
+
+	def _lazySeasons(self) -> Optional[LazySeasons]:
+		""" Returns the seasons if they are loaded on demand and some have not been loaded yet."""
+		seasons = self.seasons
+		return seasons if isinstance(seasons, LazySeasons) and not seasons.complete else None
 
-		return episode
+	def get_episode(self, key: str) -> EpisodeResource:
+		""" Retrives an episode based on SnnEnn. Also accepts an imdbId, or an int for `indexInSeries`."""
+		match = _EPISODE_KEY.match(key.strip()) if isinstance(key, str) else None
+		if match is not None and self._lazySeasons() is not None:
+			# Only the season of the episode is requested.
+			season = self.get_season(int(match.group('season')))
+			return None if season is None else season.get_episode(_normalizeEpisodeKey(key))
+		return self._findEpisode(self._episodeIndex(), key)
+
+	def get_episodes(self, keys: Iterable) -> List[EpisodeResource]:
+		""" Retrieves several episodes in one pass. Missing episodes are returned as None."""
+		if self._lazySeasons() is not None:
+			return [self.get_episode(key) for key in keys]
+		index = self._episodeIndex()
+		return [self._findEpisode(index, key) for key in keys]
 
 	def get_season(self, key: str) -> SeasonResource:
 		"""Retrieves a season. Key should be formatted as Sn"""
 		try:
-			season_number = int(key[1:])
-			season = self.seasons[season_number - 1]
-		except IndexError:
-			season = None
-		return season
+			season_number = int(key) if isinstance(key, int) else int(str(key).strip()[1:])
+		except ValueError:
+			return None
+		lazy_seasons = self._lazySeasons()
+		if lazy_seasons is not None:
+			return lazy_seasons.season(season_number)
+		position = self._episodeIndex().bySeasonIndex.get(season_number)
+		return None if position is None else self.seasons[position]
+
+	def prefetch(self) -> 'MediaResource':
+		""" Requests every season of a series retrieved with `lazy = True` that has not been loaded yet."""
+		if isinstance(self.seasons, LazySeasons):
+			self.seasons.prefetch()
+		return self
+
+	def compact(self) -> 'MediaResource':
+		""" Converts every season to a CompactSeasonResource in place. Long-form episodes are left as-is."""
+		if self.seasons:
+			self.seasons = [
+				season if any(isinstance(e, MediaResource) for e in season.episodes) else season.compact()
+				for season in self.seasons
+			]
+		return self
+
+	def save(self, filename: Union[str, Path], append: bool = False):
+		""" Saves this resource as a line of json. See `omdbapi.api.serialization`."""
+		from omdbapi.api.serialization import dump
+		dump([self], filename, append = append)
 
 	def summary(self, level: int = 0):
 		""" prints a summary of the media. 'level' indicates the indentation level to use."""
@@ -131,19 +609,115 @@ class MediaResource:
 			for season in self.seasons:
 				season.summary(level + 1)
 
-	def toTable(self) -> pandas.DataFrame:
-		series_title = self.title
-		series_id = self.imdbId
+	def toTable(self) -> 'pandas.DataFrame':
+		""" Returns a table with one row per episode. See `catalog_table`."""
+		return catalog_table([self])
+
+
+TABLE_COLUMNS = (
+	'title', 'imdbId', 'imdbRating', 'releaseDate', 'episodeId', 'indexInSeries', 'indexInSeason',
+	'seriesTitle', 'seriesId', 'season'
+)
+
+
+def _seasonColumns(season: Union[SeasonResource, CompactSeasonResource]) -> Dict[str, Union[list, numpy.ndarray]]:
+	""" Extracts the episode-level columns of a single season."""
+	if isinstance(season, CompactSeasonResource):
+		return {
+			'title':         season.titles,
+			'imdbId':        season.imdbIds,
+			'imdbRating':    season.imdbRatings,
+			'releaseDate':   season.releaseDates,
+			'episodeId':     ["S{:>02}E{:>02}".format(season.seasonIndex, i) for i in season.indexInSeason.tolist()],
+			'indexInSeries': season.indexInSeries,
+			'indexInSeason': season.indexInSeason
+		}
+	episodes = season.episodes
+	return {
+		'title':         [e.title for e in episodes],
+		'imdbId':        [e.imdbId for e in episodes],
+		'imdbRating':    [e.imdbRating for e in episodes],
+		'releaseDate':   [_toDatetime64(e.releaseDate) for e in episodes],
+		'episodeId':     [e.episodeId for e in episodes],
+		'indexInSeries': [e.indexInSeries for e in episodes],
+		'indexInSeason': [e.indexInSeason for e in episodes]
+	}
+
+
+def catalog_table(resources: Iterable[MediaResource]) -> 'pandas.DataFrame':
+	"""
+		Builds a single episode-level table for any number of series.
+		The columns are filled directly as typed arrays rather than through per-episode dicts.
+	Parameters
+	----------
+	resources: Iterable[MediaResource]
+
+	Returns
+	-------
+	pandas.DataFrame
+		- `title`, `imdbId`, `episodeId`: str
+		- `imdbRating`: float64
+		- `releaseDate`: datetime64, NaT if unknown
+		- `indexInSeries`, `indexInSeason`, `season`: int64
+		- `seriesTitle`, `seriesId`: category
+		Long-form episodes (MediaResources) additionally include the rest of their fields as object columns.
+	"""
+	import pandas
+	columns: Dict[str, list] = {key: list() for key in TABLE_COLUMNS if key not in ('seriesTitle', 'seriesId', 'season')}
+	series_titles: List[str] = list()
+	series_ids: List[str] = list()
+	series_codes = list()
+	season_numbers = list()
+	extra_columns: Dict[str, list] = dict()
+	row_count = 0
+
+	for series_code, resource in enumerate(resources):
+		series_titles.append(resource.title)
+		series_ids.append(resource.imdbId)
+		for season in resource.seasons or []:
+			season_columns = _seasonColumns(season)
+			length = len(season_columns['title'])
+			for key, values in season_columns.items():
+				columns[key].append(values)
+			series_codes.append(numpy.full(length, series_code, dtype = numpy.int32))
+			season_numbers.append(numpy.full(length, season.seasonIndex, dtype = numpy.int64))
+
+			if not isinstance(season, CompactSeasonResource):
+				for position, episode in enumerate(season.episodes):
+					if isinstance(episode, MediaResource):
+						for key, value in episode.to_dict().items():
+							if key not in columns:
+								extra_columns.setdefault(key, dict())[row_count + position] = value
+			row_count += length
+
+	def _concatenate(arrays: list, dtype) -> numpy.ndarray:
+		if not arrays:
+			return numpy.array([], dtype = dtype)
+		return numpy.concatenate([numpy.asarray(a, dtype = dtype) for a in arrays])
+
+	codes = _concatenate(series_codes, numpy.int32)
+	table = {
+		'title':         _concatenate(columns['title'], object),
+		'imdbId':        _concatenate(columns['imdbId'], object),
+		'imdbRating':    _concatenate(columns['imdbRating'], numpy.float64),
+		'releaseDate':   _concatenate(columns['releaseDate'], 'datetime64[s]'),
+		'episodeId':     _concatenate(columns['episodeId'], object),
+		'indexInSeries': _concatenate(columns['indexInSeries'], numpy.int64),
+		'indexInSeason': _concatenate(columns['indexInSeason'], numpy.int64)
+	}
+	for key, values in extra_columns.items():
+		table[key] = [values.get(i) for i in range(row_count)]
+	table['seriesTitle'] = _categorical(codes, series_titles)
+	table['seriesId'] = _categorical(codes, series_ids)
+	table['season'] = _concatenate(season_numbers, numpy.int64)
 
-		table = list()
-		for season in self.seasons:
-			season_index = season.seasonIndex
-			for episode in season:
-				element = episode.to_dict()
-				element['seriesTitle'] = series_title
-				element['seriesId'] = series_id
-				element['season'] = season_index
-				table.append(element)
+	return pandas.DataFrame(table)
 
-		return pandas.DataFrame(table)
 
+def _categorical(codes: numpy.ndarray, labels: List[str]) -> 'pandas.Categorical':
+	""" Builds a categorical column from per-row series codes without materializing a string per row."""
+	import pandas
+	categories = list(dict.fromkeys(labels))
+	positions = {label: index for index, label in enumerate(categories)}
+	mapping = numpy.array([positions[label] for label in labels], dtype = numpy.int32)
+	return pandas.Categorical.from_codes(mapping[codes], categories = categories)
@@ -0,0 +1,188 @@
+"""
+	Streaming newline-delimited json (JSONL) export and import of parsed resources.
+	Values that json cannot represent exactly are tagged:
+	- NaN: {"$nan": true}
+	- timetools.Timestamp: {"$timestamp": [year, month, day, hour, minute, second]}
+	- timetools.Duration: {"$duration": "PT1H"}
+	- resources: {"$type": "MediaResource", ...fields}
+"""
+import dataclasses
+import gzip
+import json
+import math
+from pathlib import Path
+from typing import Dict, IO, Iterable, Iterator, Union
+
+import numpy
+from pytools import timetools
+
+from omdbapi.api.resources import (
+	CompactSeasonResource, EpisodeResource, EpisodeView, LazySeasons, MediaResource, SeasonResource
+)
+
+_RESOURCE_TYPES = {cls.__name__: cls for cls in (MediaResource, SeasonResource, EpisodeResource)}
+
+
+def encode(value):
+	"""
+		Converts a value into a json-compatible structure, tagging values json cannot represent.
+		Used to embed resources in other json records, i.e. the output of `omdbapi.batch`.
+	"""
+	if isinstance(value, float):
+		return {'$nan': True} if math.isnan(value) else value
+	if isinstance(value, timetools.Duration):
+		return {'$duration': str(value)}
+	if isinstance(value, timetools.Timestamp):
+		return {'$timestamp': [value.year, value.month, value.day, value.hour, value.minute, value.second]}
+	if isinstance(value, LazySeasons):
+		value = value.prefetch()
+	if isinstance(value, (list, tuple)):
+		return [encode(i) for i in value]
+	if isinstance(value, dict):
+		return {key: encode(item) for key, item in value.items()}
+	if isinstance(value, numpy.generic):
+		return encode(value.item())
+	if isinstance(value, EpisodeView):
+		value = value.to_episode()
+	if isinstance(value, CompactSeasonResource):
+		return {
+			'$type':       'CompactSeasonResource',
+			'seasonIndex': value.seasonIndex,
+			'seriesTitle': value.seriesTitle,
+			'episodes':    [encode(e) for e in value]
+		}
+	if isinstance(value, (MediaResource, SeasonResource, EpisodeResource)):
+		record = {'$type': type(value).__name__}
+		for field in dataclasses.fields(value):
+			record[field.name] = encode(getattr(value, field.name))
+		return record
+	return value
+
+
+def _decode(record: Dict):
+	""" `object_hook` that reverses `encode`."""
+	if '$nan' in record:
+		return math.nan
+	if '$duration' in record:
+		return timetools.Duration(record['$duration'])
+	if '$timestamp' in record:
+		return timetools.Timestamp(*record['$timestamp'])
+	kind = record.pop('$type', None)
+	if kind is None:
+		return record
+	if kind == 'CompactSeasonResource':
+		episodes = record['episodes']
+		season = SeasonResource(
+			episodes = episodes, seasonIndex = record['seasonIndex'], length = len(episodes), seriesTitle = record['seriesTitle']
+		)
+		return season.compact()
+	return _RESOURCE_TYPES[kind](**record)
+
+
+def to_json(resource) -> str:
+	""" Serializes a single resource to a json string."""
+	return json.dumps(encode(resource), ensure_ascii = False, separators = (',', ':'))
+
+
+def from_json(string: str):
+	""" Deserializes a json string produced by `to_json`."""
+	return json.loads(string, object_hook = _decode)
+
+
+def iter_records(resources: Iterable[MediaResource], per: str = 'title') -> Iterator[Dict]:
+	"""
+		Converts resources to json-compatible records, one at a time.
+	Parameters
+	----------
+	resources: Iterable[MediaResource]
+	per: {'title', 'episode'}; default 'title'
+		- `title`: One record per resource, including its seasons.
+		- `episode`: One record per episode, formatted as {"seriesId": ..., "seasonIndex": ..., "episode": ...}.
+			Resources without seasons (i.e. movies) are written as a single record.
+	"""
+	if per not in ('title', 'episode'):
+		message = "'{}' is not an available option. Expected one of {}".format(per, ('title', 'episode'))
+		raise ValueError(message)
+	for resource in resources:
+		if per == 'title' or not resource.seasons:
+			yield encode(resource)
+			continue
+		for season in resource.seasons:
+			for episode in season:
+				yield {'seriesId': resource.imdbId, 'seasonIndex': season.seasonIndex, 'episode': encode(episode)}
+
+
+def truncate_incomplete_line(path: Union[str, Path], block_size: int = 65536):
+	"""
+		Removes a partially written last line from a line-delimited file, i.e. one left by an interrupted writer,
+		so that the file can be read and appended to. Only the tail of the file is read, `block_size` bytes at a time.
+	"""
+	with Path(path).open('rb+') as file:
+		end = file.seek(0, 2)
+		position = end
+		while position > 0:
+			start = max(0, position - block_size)
+			file.seek(start)
+			block = file.read(position - start)
+			index = block.rfind(b'\n')
+			if index >= 0:
+				position = start + index + 1
+				break
+			position = start
+		if position != end:
+			file.truncate(position)
+
+
+def _open(path: Union[str, Path], mode: str) -> IO:
+	path = Path(path)
+	if path.suffix == '.gz':
+		return gzip.open(path, mode + 't', encoding = 'utf-8')
+	return path.open(mode, encoding = 'utf-8')
+
+
+def dump(resources: Iterable[MediaResource], path: Union[str, Path], per: str = 'title', append: bool = False) -> int:
+	"""
+		Writes resources to a JSONL file (gzip-compressed if the filename ends in '.gz').
+		`resources` may be a generator, and only one resource is held in memory at a time.
+	Parameters
+	----------
+	resources: Iterable[MediaResource]
+	path: str, Path
+	per: {'title', 'episode'}; default 'title'
+		See `iter_records`.
+	append: bool; default False
+		Add to an existing file rather than replacing it.
+
+	Returns
+	-------
+	int
+		The number of records written.
+	"""
+	count = 0
+	with _open(path, 'a' if append else 'w') as file:
+		for record in iter_records(resources, per = per):
+			file.write(json.dumps(record, ensure_ascii = False, separators = (',', ':')))
+			file.write('\n')
+			count += 1
+	return count
+
+
+def load_records(path: Union[str, Path]) -> Iterator[Union[Dict, MediaResource]]:
+	"""
+		Reads a JSONL file written by `dump`, one line at a time.
+		Title records are returned as resources, episode records as
+		{"seriesId": str, "seasonIndex": int, "episode": EpisodeResource} dicts.
+	"""
+	with _open(path, 'r') as file:
+		for line in file:
+			line = line.strip()
+			if line:
+				yield json.loads(line, object_hook = _decode)
+
+
+def load(path: Union[str, Path]) -> Iterator[Union[MediaResource, EpisodeResource]]:
+	""" Same as `load_records`, but yields only the resources of episode records."""
+	for record in load_records(path):
+		if isinstance(record, dict) and 'episode' in record:
+			record = record['episode']
+		yield record
@@ -0,0 +1,209 @@
+"""
+	Persistent index of titles to imdbIds, used by OmdbApi to resolve titles without searching the api.
+"""
+import bisect
+import difflib
+import itertools
+import re
+import sqlite3
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+_PUNCTUATION = re.compile(r"[^0-9a-z]+")
+_TRAILING_YEAR = re.compile(r"^(?P<title>.*?)\s*[(\[](?P<year>(?:18|19|20)\d{2})[)\]]\s*$")
+_START_YEAR = re.compile(r"(?:18|19|20)\d{2}")
+
+
+def normalizeTitle(title: str) -> str:
+	""" Folds case, accents and punctuation, i.e. "Marvel's Agents of S.H.I.E.L.D." -> 'marvels agents of shield'."""
+	title = unicodedata.normalize('NFKD', str(title)).encode('ascii', 'ignore').decode('ascii')
+	title = title.casefold().replace('&', ' and ').replace("'", '').replace('.', '')
+	return _PUNCTUATION.sub(' ', title).strip()
+
+
+def splitYear(title: str) -> Tuple[str, Optional[int]]:
+	""" Splits an optional trailing year from a title, i.e. 'Legion (2017)' -> ('Legion', 2017)."""
+	match = _TRAILING_YEAR.match(str(title))
+	if match is None or not match.group('title'):
+		return title, None
+	return match.group('title'), int(match.group('year'))
+
+
+def _startYear(year) -> Optional[int]:
+	""" The first year of an api `Year` value such as '2017–' or '2010–2015'."""
+	match = _START_YEAR.search(str(year or ''))
+	return int(match.group(0)) if match else None
+
+
+class TitleIndex:
+	"""
+		Maps normalized titles, with their year and type, to imdbIds. Backed by a local sqlite database.
+		Exact lookups go to the database; prefix and fuzzy lookups use a sorted in-memory list of the
+		normalized titles, built on first use.
+	Parameters
+	----------
+	path: str, Path; default '~/.cache/omdbapi/titles.sqlite'
+		Location of the database. Use ':memory:' for an index that only lives as long as the process.
+	"""
+
+	def __init__(self, path: Union[str, Path] = None):
+		if path is None:
+			path = Path.home() / ".cache" / "omdbapi" / "titles.sqlite"
+		if str(path) != ':memory:':
+			path = Path(path)
+			path.parent.mkdir(parents = True, exist_ok = True)
+		self.path = path
+
+		self.hits = 0
+		self.misses = 0
+
+		self._lock = threading.Lock()
+		self._keys: Optional[List[str]] = None
+		self._connection = sqlite3.connect(str(path), check_same_thread = False)
+		self._connection.execute(
+			"CREATE TABLE IF NOT EXISTS titles ("
+			"key TEXT, year INTEGER, kind TEXT, imdbId TEXT, title TEXT, rank INTEGER, "
+			"PRIMARY KEY (key, imdbId))"
+		)
+		self._connection.commit()
+
+	def __enter__(self) -> 'TitleIndex':
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	def __len__(self) -> int:
+		with self._lock:
+			return self._connection.execute("SELECT COUNT(*) FROM titles").fetchone()[0]
+
+	def add(self, title: str, imdb_id: str, year = None, kind: Optional[str] = None, rank: int = 0):
+		"""
+			Records a title.
+		Parameters
+		----------
+		title: str
+		imdb_id: str
+		year: int, str; default None
+			The release year, or an api `Year` value such as '2017–'.
+		kind: {'series', 'movie', 'episode'}; default None
+		rank: int; default 0
+			Lower ranks are preferred when several imdbIds share a title. Titles from `get` responses have rank 0,
+			search results are ranked by their position in the results.
+		"""
+		self.addMany([(title, imdb_id, year, kind, rank)])
+
+	def addMany(self, rows: Iterable[Tuple[str, str, Optional[str], Optional[str], int]]):
+		""" Same as `add`, for several (title, imdb_id, year, kind, rank) tuples in one transaction."""
+		records = [
+			(normalizeTitle(title), _startYear(year), kind, imdb_id, title, rank)
+			for title, imdb_id, year, kind, rank in rows if title and imdb_id
+		]
+		if not records:
+			return
+		with self._lock:
+			self._connection.executemany(
+				"INSERT INTO titles (key, year, kind, imdbId, title, rank) VALUES (?, ?, ?, ?, ?, ?) "
+				"ON CONFLICT (key, imdbId) DO UPDATE SET "
+				"year = excluded.year, kind = excluded.kind, title = excluded.title, rank = MIN(rank, excluded.rank)",
+				records
+			)
+			self._connection.commit()
+			if self._keys is not None:
+				for record in records:
+					position = bisect.bisect_left(self._keys, record[0])
+					if position == len(self._keys) or self._keys[position] != record[0]:
+						self._keys.insert(position, record[0])
+
+	def addMedia(self, response: Dict):
+		""" Records the title of a raw `i=`/`t=` response."""
+		if response.get('Response') == 'True' and 'imdbID' in response:
+			self.add(response.get('Title'), response['imdbID'], response.get('Year'), response.get('Type'), rank = 0)
+
+	def addSearch(self, response: Dict, page: int = 1):
+		""" Records every result of a raw (or parsed) search response."""
+		offset = (page - 1) * 10 + 1
+		self.addMany(
+			(item.get('Title'), item.get('imdbID'), item.get('Year'), item.get('Type'), offset + position)
+			for position, item in enumerate((response or {}).get('Search') or [])
+		)
+
+	def lookup(self, title: str, year: Optional[int] = None, kind: Optional[str] = None) -> Optional[str]:
+		"""
+			Returns the imdbId of a title, or None if it is not in the index.
+		Parameters
+		----------
+		title: str
+			The title. A trailing year, i.e. 'Legion (2017)', is used as `year` if `year` is not given.
+		year: int; default None
+		kind: {'series', 'movie', 'episode', 'any'}; default None
+		"""
+		if year is None:
+			title, year = splitYear(title)
+		query = "SELECT imdbId FROM titles WHERE key = ?"
+		parameters = [normalizeTitle(title)]
+		if year is not None:
+			query += " AND year = ?"
+			parameters.append(int(year))
+		if kind not in (None, 'any'):
+			query += " AND kind = ?"
+			parameters.append(kind)
+		query += " ORDER BY rank LIMIT 1"
+
+		with self._lock:
+			row = self._connection.execute(query, parameters).fetchone()
+			if row is None:
+				self.misses += 1
+				return None
+			self.hits += 1
+			return row[0]
+
+	def _sortedKeys(self) -> List[str]:
+		if self._keys is None:
+			rows = self._connection.execute("SELECT DISTINCT key FROM titles ORDER BY key").fetchall()
+			self._keys = [row[0] for row in rows]
+		return self._keys
+
+	def _entries(self, keys: List[str]) -> List[Tuple[str, str]]:
+		""" Returns the (title, imdbId) pairs of each key, best ranked first."""
+		result = list()
+		for key in keys:
+			rows = self._connection.execute(
+				"SELECT title, imdbId FROM titles WHERE key = ? ORDER BY rank", (key,)
+			).fetchall()
+			result += rows
+		return result
+
+	def prefix(self, prefix: str, limit: int = 10) -> List[Tuple[str, str]]:
+		""" Returns up to `limit` (title, imdbId) pairs whose normalized title starts with `prefix`."""
+		prefix = normalizeTitle(prefix)
+		with self._lock:
+			keys = self._sortedKeys()
+			start = bisect.bisect_left(keys, prefix)
+			matches = list()
+			for key in itertools.islice(keys, start, None):
+				if not key.startswith(prefix) or len(matches) >= limit:
+					break
+				matches.append(key)
+			return self._entries(matches)[:limit]
+
+	def fuzzy(self, title: str, limit: int = 5, cutoff: float = 0.8) -> List[Tuple[str, str]]:
+		""" Returns up to `limit` (title, imdbId) pairs whose normalized title is similar to `title` (see difflib)."""
+		with self._lock:
+			keys = difflib.get_close_matches(normalizeTitle(title), self._sortedKeys(), n = limit, cutoff = cutoff)
+			return self._entries(keys)[:limit]
+
+	def clear(self):
+		with self._lock:
+			self._connection.execute("DELETE FROM titles")
+			self._connection.commit()
+			self._keys = None
+
+	def stats(self) -> Dict[str, Any]:
+		return {'titles': len(self), 'hits': self.hits, 'misses': self.misses}
+
+	def close(self):
+		with self._lock:
+			self._connection.close()
@@ -0,0 +1,116 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from omdbapi.api.metrics import currentRequest
+from omdbapi.api.ratelimit import DailyQuota, RetryPolicy, TokenBucket
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class HttpTransport:
+	"""
+		Persistent, pooled HTTP transport used by OmdbApi.
+		A single `requests.Session` is kept alive for the lifetime of the transport so that
+		consecutive requests (seasons, episodes, searches) reuse the same TCP connections.
+	Parameters
+	----------
+	pool_size: int; default 10
+		The maximum number of connections kept open per host. Also the maximum number of requests in flight
+		at once: threads beyond it (i.e. the nested season and episode pools of `OmdbApi.get_many`) wait for
+		a pooled connection instead of opening, and then discarding, extra ones.
+	timeout: float, Tuple[float, float]; default (3.05, 30)
+		The (connect, read) timeout passed to every request.
+	headers: Dict[str,str]; default None
+		Additional headers sent with every request.
+	rate_limiter: TokenBucket; default None
+		Limits the rate at which requests are sent, across every thread using the transport.
+	quota: DailyQuota; default None
+		Counts requests against the daily limit of the api key.
+	retry: RetryPolicy; default RetryPolicy()
+		How connection errors, 429/5xx responses and 'Request limit reached!' payloads are retried.
+	"""
+
+	def __init__(self, pool_size: int = 10, timeout: Timeout = (3.05, 30), headers: Optional[Dict[str, str]] = None,
+			rate_limiter: Optional[TokenBucket] = None, quota: Optional[DailyQuota] = None,
+			retry: Optional[RetryPolicy] = None):
+		self.pool_size = pool_size
+		self.timeout = timeout
+		self.rate_limiter = rate_limiter
+		self.quota = quota
+		self.retry = retry if retry is not None else RetryPolicy()
+
+		self.session = requests.Session()
+		self.session.headers.update({'Connection': 'keep-alive', 'Accept': 'application/json'})
+		if headers:
+			self.session.headers.update(headers)
+
+		adapter = HTTPAdapter(pool_connections = 1, pool_maxsize = pool_size)
+		self._connections = threading.BoundedSemaphore(pool_size)
+		self.session.mount('http://', adapter)
+		self.session.mount('https://', adapter)
+
+	def __enter__(self) -> 'HttpTransport':
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	def get(self, url: str, parameters: Dict) -> Dict:
+		"""
+			Sends a GET request and returns the decoded json body.
+			Failed requests are retried according to `self.retry`.
+		Raises
+		------
+		RequestLimitError
+			If the request limit is still exceeded after every retry, or the local quota is exhausted.
+		"""
+		record = currentRequest()
+		attempt = 0
+		while True:
+			if self.quota is not None:
+				self.quota.consume()
+			if self.rate_limiter is not None:
+				waited = self.rate_limiter.acquire()
+				if record is not None:
+					record.rate_limit_wait += waited
+
+			try:
+				with self._connections:
+					start = time.perf_counter()
+					# Streamed so that the time until the response headers and the time reading the body can be told apart.
+					response = self.session.get(url, params = parameters, timeout = self.timeout, stream = True)
+					headers_received = time.perf_counter()
+					# Reading the body returns the connection to the pool.
+					response.content
+					body_received = time.perf_counter()
+			except (requests.ConnectionError, requests.Timeout):
+				delay = self.retry.decide(attempt, None, None)
+				if delay is None:
+					raise
+			else:
+				try:
+					payload = response.json()
+				except ValueError:
+					payload = None
+				if record is not None:
+					record.addTiming('connect', headers_received - start)
+					record.addTiming('transfer', body_received - headers_received)
+					record.addTiming('decode', time.perf_counter() - body_received)
+				delay = self.retry.decide(attempt, response.status_code, payload, self.quota)
+				if delay is None:
+					if payload is None or self.retry.shouldRetry(response.status_code, payload):
+						response.raise_for_status()
+					return payload if payload is not None else response.json()
+
+			time.sleep(delay)
+			if record is not None:
+				record.addRetry(delay)
+			attempt += 1
+
+	def close(self):
+		""" Closes every pooled connection."""
+		self.session.close()
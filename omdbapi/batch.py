@@ -0,0 +1,200 @@
+"""
+	Batch resolution of imdb ids and titles, streamed to a JSONL or CSV file as each item completes.
+	Used by the `batch` command of `python -m omdbapi`.
+
+	Every input line is a query: an imdb id (retrieved with `OmdbApi.get`) or a title (`OmdbApi.find`).
+	- JSONL: one line per query, {"query": str, "imdbId": str, "error": str, "resource": {...}}. `resource` is
+		encoded as by `omdbapi.api.serialization`, so `serialization.from_json(line)['resource']` is a MediaResource.
+	- CSV: one row per query (`per = 'title'`), or one row per episode (`per = 'episode'`).
+	The rows of a query are written at once and flushed, so an interrupted batch can be resumed: queries already
+	written without an error are skipped (see `completed_queries`), and failed queries are retried and written again.
+"""
+import csv
+import io
+import json
+import math
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Iterable, List, Optional, Set, Union
+
+from pytools import timetools
+
+from omdbapi.api import BatchResult, OmdbApi
+from omdbapi.api.serialization import encode, truncate_incomplete_line
+
+FORMATS = ('jsonl', 'csv')
+TITLE_COLUMNS = (
+	'query', 'imdbId', 'title', 'type', 'year', 'imdbRating', 'imdbVotes', 'metascore', 'releaseDate', 'duration',
+	'genre', 'totalSeasons', 'episodes', 'error'
+)
+EPISODE_COLUMNS = (
+	'query', 'seriesId', 'seriesTitle', 'season', 'episodeId', 'imdbId', 'title', 'imdbRating', 'releaseDate', 'error'
+)
+
+
+@dataclass
+class BatchSummary:
+	""" The outcome of `run_batch`."""
+	resolved: int = 0
+	failed: int = 0
+	skipped: int = 0
+	seconds: float = 0.0
+
+	def __str__(self):
+		return "resolved {}, failed {}, skipped {} in {:.1f}s".format(self.resolved, self.failed, self.skipped, self.seconds)
+
+
+def read_queries(lines: Iterable[str]) -> List[str]:
+	""" Returns the non-empty lines that are not comments ('#'), stripped and without duplicates."""
+	queries = (line.strip() for line in lines)
+	return list(dict.fromkeys(query for query in queries if query and not query.startswith('#')))
+
+
+def _csvValue(value):
+	if isinstance(value, float) and math.isnan(value):
+		return ''
+	if isinstance(value, timetools.Timestamp):
+		return value.date().isoformat()
+	if isinstance(value, timetools.Duration):
+		return str(value)
+	return '' if value is None else value
+
+
+def _titleRow(item: BatchResult) -> dict:
+	row = {'query': item.key, 'error': _errorMessage(item)}
+	resource = item.result
+	if resource is not None:
+		for column in TITLE_COLUMNS[1:-2]:
+			row[column] = _csvValue(getattr(resource, column))
+		row['episodes'] = sum(season.length for season in resource.seasons or [])
+	return row
+
+
+def _episodeRows(item: BatchResult) -> List[dict]:
+	resource = item.result
+	if resource is None or not resource.seasons:
+		row = {'query': item.key, 'error': _errorMessage(item)}
+		if resource is not None:
+			row.update(seriesId = resource.imdbId, seriesTitle = resource.title, imdbId = resource.imdbId, title = resource.title)
+		return [row]
+	rows = list()
+	for season in resource.seasons:
+		for episode in season:
+			rows.append({
+				'query':       item.key,
+				'seriesId':    resource.imdbId,
+				'seriesTitle': resource.title,
+				'season':      season.seasonIndex,
+				'episodeId':   episode.episodeId,
+				'imdbId':      episode.imdbId,
+				'title':       episode.title,
+				'imdbRating':  _csvValue(episode.imdbRating),
+				'releaseDate': _csvValue(episode.releaseDate)
+			})
+	return rows
+
+
+def _errorMessage(item: BatchResult) -> str:
+	if item.error is not None:
+		return "{}: {}".format(type(item.error).__name__, item.error)
+	if item.result is None:
+		return "not found"
+	return ''
+
+
+def _jsonLine(item: BatchResult) -> str:
+	record = {'query': item.key, 'imdbId': None, 'error': _errorMessage(item) or None}
+	if item.result is not None:
+		record['imdbId'] = item.result.imdbId
+		record['resource'] = encode(item.result)
+	return json.dumps(record, ensure_ascii = False, separators = (',', ':')) + '\n'
+
+
+def _csvLines(rows: List[dict], columns) -> str:
+	buffer = io.StringIO()
+	csv.DictWriter(buffer, columns, lineterminator = '\n').writerows(rows)
+	return buffer.getvalue()
+
+
+def completed_queries(path: Union[str, Path], output_format: str) -> Set[str]:
+	"""
+		Returns the queries of an existing output file that were written without an error.
+		A partially written last line (from an interrupted batch) is removed from the file.
+	"""
+	path = Path(path)
+	if not path.exists():
+		return set()
+	truncate_incomplete_line(path)
+	completed = set()
+	with path.open('r', encoding = 'utf-8', newline = '') as file:
+		if output_format == 'csv':
+			rows = csv.DictReader(file)
+		else:
+			rows = (json.loads(line) for line in file if line.strip())
+		for row in rows:
+			if not row.get('error'):
+				completed.add(row['query'])
+	return completed
+
+
+def run_batch(api: OmdbApi, queries: Iterable[str], output: IO, output_format: str = 'jsonl', per: str = 'title',
+		episode_format: Optional[str] = None, kind: str = 'series', jobs: int = 8,
+		skip: Optional[Set[str]] = None, write_header: bool = True) -> BatchSummary:
+	"""
+		Resolves queries concurrently and writes each result to `output` as soon as it has been retrieved.
+	Parameters
+	----------
+	api: OmdbApi
+	queries: Iterable[str]
+		imdb ids and/or titles. See `read_queries`.
+	output: IO
+		An open text file. Results are written in the order they complete, not the order of `queries`.
+	output_format: {'jsonl', 'csv'}; default 'jsonl'
+	per: {'title', 'episode'}; default 'title'
+		Only used for CSV: one row per query, or one row per episode.
+	episode_format: {None, 'short', 'long'}; default None
+		Whether the seasons of series are retrieved. See `OmdbApi.get`.
+	kind: {'series', 'movie', 'any'}; default 'series'
+		The kind of media searched for when a query is a title.
+	jobs: int; default 8
+		The maximum number of queries resolved at once.
+	skip: Set[str]; default None
+		Queries that are not resolved again, i.e. from `completed_queries`.
+	write_header: bool; default True
+		Whether to start a CSV output with its header row.
+	"""
+	if output_format not in FORMATS:
+		message = "'{}' is not an available option. Expected one of {}".format(output_format, FORMATS)
+		raise ValueError(message)
+	if per not in ('title', 'episode'):
+		message = "'{}' is not an available option. Expected one of {}".format(per, ('title', 'episode'))
+		raise ValueError(message)
+	skip = skip or set()
+	summary = BatchSummary()
+	start = time.perf_counter()
+
+	pending = list()
+	for query in queries:
+		if query in skip:
+			summary.skipped += 1
+		else:
+			pending.append(query)
+
+	columns = EPISODE_COLUMNS if per == 'episode' else TITLE_COLUMNS
+	if output_format == 'csv' and write_header:
+		output.write(_csvLines([dict(zip(columns, columns))], columns))
+
+	for item in api.iter_many(pending, episode_format, max_workers = jobs, kind = kind):
+		if item.ok:
+			summary.resolved += 1
+		else:
+			summary.failed += 1
+		if output_format == 'jsonl':
+			output.write(_jsonLine(item))
+		else:
+			output.write(_csvLines(_episodeRows(item) if per == 'episode' else [_titleRow(item)], columns))
+		output.flush()
+
+	summary.seconds = time.perf_counter() - start
+	return summary
@@ -0,0 +1,193 @@
+"""
+	Columnar on-disk store of episode-level ratings, i.e. the output of `MediaResource.toTable`
+	for an entire catalog, saved as a hive-partitioned parquet dataset. Requires `pyarrow`.
+"""
+import shutil
+import uuid
+from pathlib import Path
+from typing import Iterable, List, Optional, Set, Union
+
+import pandas
+
+try:
+	import pyarrow
+	import pyarrow.parquet as parquet
+except ModuleNotFoundError:
+	pyarrow = None
+
+from omdbapi.api.resources import MediaResource, catalog_table
+
+
+def _schema() -> 'pyarrow.Schema':
+	return pyarrow.schema([
+		('title', pyarrow.string()),
+		('imdbId', pyarrow.string()),
+		# float64, so that ratings read back compare equal to the values of `toTable`.
+		('imdbRating', pyarrow.float64()),
+		('releaseDate', pyarrow.timestamp('s')),
+		('episodeId', pyarrow.string()),
+		('indexInSeries', pyarrow.int32()),
+		('indexInSeason', pyarrow.int16()),
+		('seriesTitle', pyarrow.dictionary(pyarrow.int32(), pyarrow.string())),
+		('seriesId', pyarrow.dictionary(pyarrow.int32(), pyarrow.string())),
+		('season', pyarrow.int16())
+	])
+
+
+def _letter(title: str) -> str:
+	""" The partition key of a title when partitioning by first letter."""
+	for character in str(title).upper():
+		if character.isalnum():
+			return character if character.isascii() else '_'
+	return '_'
+
+
+class CatalogStore:
+	"""
+		Parquet-backed store of episode tables.
+	Parameters
+	----------
+	folder: str, Path
+		The root folder of the dataset.
+	partition_by: {'series', 'letter'}; default 'letter'
+		- `series`: one partition per series (`seriesId`).
+		- `letter`: one partition per first letter of the series title. Produces far fewer files for large catalogs.
+	"""
+
+	def __init__(self, folder: Union[str, Path], partition_by: str = 'letter'):
+		if pyarrow is None:
+			message = "CatalogStore requires the 'pyarrow' package."
+			raise ModuleNotFoundError(message)
+		if partition_by not in ('series', 'letter'):
+			message = "'{}' is not an available option. Expected one of {}".format(partition_by, ('series', 'letter'))
+			raise ValueError(message)
+
+		self.folder = Path(folder)
+		self.folder.mkdir(parents = True, exist_ok = True)
+		self.partition_by = partition_by
+		self.schema = _schema()
+
+	def _partitionKey(self, table: pandas.DataFrame) -> pandas.Series:
+		if self.partition_by == 'series':
+			return table['seriesId'].astype(str)
+		letters = {title: _letter(title) for title in table['seriesTitle'].unique()}
+		return table['seriesTitle'].astype(str).map(letters)
+
+	def _partitionFolder(self, key: str) -> Path:
+		return self.folder / "partition={}".format(key)
+
+	def append(self, resources: Iterable[MediaResource]) -> int:
+		"""
+			Adds series to the store. Series that are already stored are replaced.
+		Returns
+		-------
+		int
+			The number of episodes written.
+		"""
+		return self.append_table(catalog_table(resources))
+
+	def append_table(self, table: pandas.DataFrame) -> int:
+		""" Same as `append`, for a table that was already built with `toTable` or `catalog_table`."""
+		if table.empty:
+			return 0
+		table = table[list(self.schema.names)]
+		keys = self._partitionKey(table)
+		groups = {self._partitionFolder(key): rows for key, rows in table.groupby(keys, sort = False)}
+		if self.partition_by == 'letter':
+			# A series whose title now starts with another letter moves to another partition.
+			self._remove(set(table['seriesId'].astype(str)), skip = set(groups))
+		for folder, rows in groups.items():
+			existing = self._readFolder(folder)
+			if existing is not None:
+				existing = existing[~existing['seriesId'].astype(str).isin(rows['seriesId'].astype(str).unique())]
+				rows = pandas.concat([existing, rows], ignore_index = True)
+			self._writeFolder(folder, rows)
+		return len(table)
+
+	def _readFolder(self, folder: Path) -> Optional[pandas.DataFrame]:
+		files = sorted(folder.glob("*.parquet")) if folder.exists() else []
+		if not files:
+			return None
+		tables = [parquet.read_table(str(path), schema = self.schema) for path in files]
+		return pyarrow.concat_tables(tables).to_pandas()
+
+	def _contains(self, folder: Path, series_ids: Set[str]) -> bool:
+		""" Whether a partition holds any of the series, reading only the `seriesId` column."""
+		for path in folder.glob("*.parquet"):
+			stored = parquet.read_table(str(path), columns = ['seriesId']).column('seriesId').to_pylist()
+			if not series_ids.isdisjoint(map(str, stored)):
+				return True
+		return False
+
+	def _writeFolder(self, folder: Path, rows: pandas.DataFrame):
+		""" Replaces the contents of a partition. The new file is written before the old ones are removed."""
+		folder.mkdir(parents = True, exist_ok = True)
+		old_files = list(folder.glob("*.parquet"))
+		rows = rows.astype({'seriesTitle': str, 'seriesId': str}).sort_values(['seriesId', 'indexInSeries'])
+		arrow_table = pyarrow.Table.from_pandas(rows, schema = self.schema, preserve_index = False)
+
+		# Files starting with '_' are skipped by `read`, so a partially written file is never read.
+		name = uuid.uuid4().hex
+		temporary = folder / "_{}.parquet.tmp".format(name)
+		parquet.write_table(arrow_table, str(temporary), compression = 'zstd')
+		temporary.rename(folder / "{}.parquet".format(name))
+		for path in old_files:
+			path.unlink()
+
+	def remove(self, series_ids: Iterable[str]):
+		""" Removes series from the store."""
+		self._remove(set(series_ids))
+
+	def _remove(self, series_ids: Set[str], skip: Set[Path] = frozenset()):
+		for folder in self.folder.glob("partition=*"):
+			if folder in skip or not self._contains(folder, series_ids):
+				continue
+			existing = self._readFolder(folder)
+			if existing is None:
+				continue
+			remaining = existing[~existing['seriesId'].astype(str).isin(series_ids)]
+			if remaining.empty:
+				shutil.rmtree(folder)
+			elif len(remaining) != len(existing):
+				self._writeFolder(folder, remaining)
+
+	def read(self, columns: Optional[List[str]] = None, series: Optional[Iterable[str]] = None,
+			memory_map: bool = True) -> pandas.DataFrame:
+		"""
+			Reads the stored episodes.
+		Parameters
+		----------
+		columns: List[str]; default None
+			Only read these columns, e.g. ['seriesId', 'indexInSeries', 'imdbRating'] for plotting.
+		series: Iterable[str]; default None
+			Only read these series (imdbIds).
+		memory_map: bool; default True
+			Memory-map the parquet files rather than reading them into memory up front.
+		"""
+		if not any(self.folder.glob("partition=*/*.parquet")):
+			table = self.schema.empty_table().to_pandas()
+			return table[columns] if columns else table
+
+		filters = [('seriesId', 'in', list(series))] if series is not None else None
+		table = parquet.read_table(
+			str(self.folder), columns = columns, filters = filters, memory_map = memory_map, partitioning = 'hive',
+			schema = self.schema
+		)
+		return table.to_pandas()
+
+	def read_series(self, series_id: str, columns: Optional[List[str]] = None) -> pandas.DataFrame:
+		""" Reads the episodes of a single series, ordered by `indexInSeries`."""
+		if self.partition_by == 'series':
+			table = self._readFolder(self._partitionFolder(series_id))
+			if table is None:
+				table = self.schema.empty_table().to_pandas()
+			table = table[table['seriesId'].astype(str) == series_id]
+		else:
+			table = self.read(columns = None, series = [series_id])
+		table = table.sort_values('indexInSeries').reset_index(drop = True)
+		return table[columns] if columns else table
+
+	def series(self) -> pandas.DataFrame:
+		""" Lists the stored series, with their title and number of episodes."""
+		table = self.read(columns = ['seriesId', 'seriesTitle'])
+		return table.astype(str).groupby(['seriesId', 'seriesTitle']).size().rename('episodes').reset_index()
@@ -1,20 +1,53 @@
+"""
+	Discovery of the api key. Nothing is read when this module is imported: `get_api_key` is called when a
+	client is constructed without an explicit key.
+"""
+import importlib
+import importlib.machinery
+import importlib.util
+import os
 import sys
 from pathlib import Path
+from types import ModuleType
+from typing import Optional
+
+API_KEY_VARIABLE = 'OMDBAPI_KEY'
+# Folder that may contain the `github_data` settings module, if it is not importable otherwise.
 github_folder = Path.home() / "Documents" / "GitHub"
-print(github_folder.exists(), github_folder)
-sys.path.append(str(github_folder))
-sys.path.append(str(github_folder / "pytools"))
 
-# noinspection PyUnresolvedReferences
-import github_data
-omdb_api_key = github_data.omdb_api_key
 
-# noinspection PyUnresolvedReferences
-try:
-	from pytools import timetools, tabletools, numbertools, datatools
-except:
-	import pytools
-	timetools = pytools.timetools
-	tabletools = pytools.tabletools
-	numbertools = pytools.numbertools
-	datatools = pytools.datatools
+def _importGithubData() -> Optional[ModuleType]:
+	""" Imports the `github_data` settings module, from `sys.path` or `github_folder`. Returns None if it does not exist."""
+	try:
+		return importlib.import_module('github_data')
+	except ModuleNotFoundError:
+		pass
+	spec = importlib.machinery.PathFinder.find_spec('github_data', [str(github_folder)])
+	if spec is None:
+		return None
+	module = importlib.util.module_from_spec(spec)
+	spec.loader.exec_module(module)
+	sys.modules['github_data'] = module
+	return module
+
+
+def get_api_key() -> Optional[str]:
+	"""
+		Returns the api key from the `OMDBAPI_KEY` environment variable or, if it is not set,
+		the `omdb_api_key` of the `github_data` settings module. Returns None if neither exists.
+	"""
+	api_key = os.environ.get(API_KEY_VARIABLE)
+	if api_key:
+		return api_key
+	github_data = _importGithubData()
+	return getattr(github_data, 'omdb_api_key', None)
+
+
+def __getattr__(name: str):
+	# Kept for code that imported these names from this module.
+	if name == 'omdb_api_key':
+		return get_api_key()
+	if name in ('timetools', 'tabletools', 'numbertools', 'datatools'):
+		return importlib.import_module('pytools.' + name)
+	message = "module {!r} has no attribute {!r}".format(__name__, name)
+	raise AttributeError(message)
@@ -1,4 +1,10 @@
-try:
-	from .graph import SeriesPlot
-except ModuleNotFoundError:
-	from graph import SeriesPlot
\ No newline at end of file
+def __getattr__(name: str):
+	# matplotlib is only imported when a plot is first requested.
+	if name == 'SeriesPlot':
+		try:
+			from .graph import SeriesPlot
+		except ModuleNotFoundError:
+			from graph import SeriesPlot
+		return SeriesPlot
+	message = "module {!r} has no attribute {!r}".format(__name__, name)
+	raise AttributeError(message)
@@ -1,15 +1,32 @@
+import pandas
 from bokeh.plotting import figure
-from bokeh.models import ColumnDataSource
+from bokeh.models import ColumnDataSource, HoverTool
+from bokeh.io import show
 
 from omdbapi import MediaResource
 from omdbapi.graphics import colorscheme
 
 def plot_series(series:MediaResource):
+	plot_table(series.toTable(), series.title)
+
+def plot_stored_series(store, series_id:str):
+	""" Plots a series saved in an `omdbapi.catalog.CatalogStore`, without rebuilding its MediaResource."""
+	columns = ['seriesTitle', 'season', 'indexInSeries', 'imdbRating', 'episodeId', 'title']
+	series_df = store.read_series(series_id, columns = columns)
+	title = str(series_df['seriesTitle'].iloc[0]) if len(series_df) else series_id
+	plot_table(series_df.drop(columns = ['seriesTitle']), title)
+
+def plot_table(series_df:pandas.DataFrame, title:str):
+	""" Plots an episode table with the columns produced by `MediaResource.toTable`."""
+	show(table_figure(series_df, title))
+
+def table_figure(series_df:pandas.DataFrame, title:str):
+	""" Builds the figure shown by `plot_table` without displaying it."""
 	plot_width, plot_height = 1280, 720
-	series_df = series.toTable()
+	series_df = series_df.copy()
 	series_df['color'] = [colorscheme.GRAPHTV.get_season_color(i).to_hex() for i in series_df['season'].tolist()]
 	data = ColumnDataSource(series_df)
-	fig = figure(plot_width = plot_width, plot_height = plot_height, title = series.title)
+	fig = figure(plot_width = plot_width, plot_height = plot_height, title = title)
 	fig.background_fill_color = colorscheme.GRAPHTV.background.to_hex()
 
 	fig.circle('indexInSeries', 'imdbRating', source = data, color = 'color', size = 20)
@@ -23,13 +40,10 @@ def plot_series(series:MediaResource):
 
 		fig.line([start, stop], [rating, rating], line_color = color)
 	tooltips = [('episode', '@episodeId - @title'), ('imdbRating', '@imdbRating')]
-	hover = fig.add_tools(HoverTool(tooltips=tooltips))
-
-	show(fig)
+	fig.add_tools(HoverTool(tooltips=tooltips))
+	return fig
 
 if __name__ == "__main__":
-	from bokeh.models import HoverTool
-	from bokeh.io import show
 	from omdbapi import OmdbApi
 	api = OmdbApi()
 	response = api.find('legion')
@@ -181,7 +181,7 @@ class SeriesPlot:
 		return fig, ax
 
 	def _getSeasonParameters(self, season: SeasonResource) -> Tuple[str, float, List[int], List[float]]:
-		season_color = get_season_color_from_palette(season.seasonIndex)
+		season_color = get_season_color_from_palette(self, season.seasonIndex)
 		season_episodes = [(i[self.x_variable], i.imdbRating) for i in season.episodes]
 		_i = [i[1] for i in season_episodes if not math.isnan(i[1])]
 		season_mean = sum(_i) / len(_i)
@@ -0,0 +1,407 @@
+"""
+	Offline stand-in for omdbapi.com, for tests and reproducible benchmarks.
+	- `Fixtures` holds api responses, either recorded (i.e. exported from a `ResponseCache`) or generated
+		with `Fixtures.synthetic`, and answers `i=`, `t=`, `s=` and `Season=` queries from them.
+	- `StandInServer` serves the fixtures over HTTP, with configurable latency, jitter, error rate and rate limits.
+		Point a client at it with `OmdbApi(url = server.url)`, or set the `OMDBAPI_URL` environment variable.
+	- `FixtureTransport` answers from the fixtures in-process, without sockets, with the same simulated behaviour.
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl
+
+from omdbapi.api.cache import ResponseCache
+from omdbapi.api.metrics import currentRequest
+from omdbapi.api.ratelimit import RetryPolicy
+
+NOT_FOUND = {'Response': 'False', 'Error': 'Incorrect IMDb ID.'}
+TITLE_NOT_FOUND = {'Response': 'False', 'Error': 'Movie not found!'}
+SEASON_NOT_FOUND = {'Response': 'False', 'Error': 'Series or season not found!'}
+LIMIT_REACHED = {'Response': 'False', 'Error': 'Request limit reached!'}
+NO_API_KEY = {'Response': 'False', 'Error': 'No API key provided.'}
+
+_MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+
+def _normalizeParameters(parameters: Dict) -> Dict[str, str]:
+	return {str(key).lower(): str(value).strip() for key, value in parameters.items()}
+
+
+class Fixtures:
+	"""
+		Api responses that the stand-in answers from.
+		Responses recorded for an exact set of parameters are returned as-is. Otherwise, `i=`, `t=`, `s=` and
+		`Season=` queries are answered from the stored title and season responses, the way the api would.
+	"""
+
+	def __init__(self):
+		self.recorded: Dict[str, Dict] = dict()
+		self.titles: Dict[str, Dict] = dict()
+		self.seasons: Dict[Tuple[str, int], Dict] = dict()
+		self._byTitle: Dict[str, str] = dict()
+
+	def __len__(self) -> int:
+		return len(self.recorded) + len(self.titles) + len(self.seasons)
+
+	def add(self, parameters: Dict, response: Dict):
+		""" Adds the response to a request. Title and season responses are also used to answer other queries."""
+		parameters = _normalizeParameters(parameters)
+		parameters.pop('apikey', None)
+		if response.get('Response') != 'True':
+			self.recorded[ResponseCache.key(parameters)] = response
+		elif 'season' in parameters and 'Episodes' in response:
+			self.seasons[(response.get('seriesID', parameters.get('i', '')), int(response['Season']))] = response
+		elif 'imdbID' in response and 'Type' in response:
+			self.addTitle(response)
+		else:
+			self.recorded[ResponseCache.key(parameters)] = response
+
+	def addTitle(self, response: Dict):
+		""" Adds an `i=` response."""
+		self.titles[response['imdbID']] = response
+		self._byTitle.setdefault(response['Title'].casefold(), response['imdbID'])
+
+	def addSeason(self, series_id: str, response: Dict):
+		""" Adds a `Season=` response."""
+		self.seasons[(series_id, int(response['Season']))] = response
+
+	def respond(self, parameters: Dict) -> Dict:
+		""" Answers a request the way the api would."""
+		parameters = _normalizeParameters(parameters)
+		parameters.pop('apikey', None)
+		recorded = self.recorded.get(ResponseCache.key(parameters))
+		if recorded is not None:
+			return recorded
+
+		if 's' in parameters:
+			return self._search(parameters)
+		imdb_id = parameters.get('i')
+		if imdb_id is None and 't' in parameters:
+			imdb_id = self._byTitle.get(parameters['t'].casefold())
+			if imdb_id is None:
+				return TITLE_NOT_FOUND
+		if imdb_id is None:
+			return NOT_FOUND
+		if 'season' in parameters:
+			try:
+				return self.seasons.get((imdb_id, int(parameters['season'])), SEASON_NOT_FOUND)
+			except ValueError:
+				return SEASON_NOT_FOUND
+		return self.titles.get(imdb_id, NOT_FOUND)
+
+	def _search(self, parameters: Dict[str, str]) -> Dict:
+		term = parameters['s'].casefold()
+		kind = parameters.get('type')
+		matches = [
+			{'Title': r['Title'], 'Year': r['Year'], 'imdbID': r['imdbID'], 'Type': r['Type'], 'Poster': r.get('Poster', 'N/A')}
+			for r in self.titles.values()
+			if term in r['Title'].casefold() and r['Type'] != 'episode' and kind in (None, 'any', r['Type'])
+		]
+		page = int(parameters.get('page', 1))
+		results = matches[(page - 1) * 10:page * 10]
+		if not results:
+			return TITLE_NOT_FOUND
+		return {'Search': results, 'totalResults': str(len(matches)), 'Response': 'True'}
+
+	@classmethod
+	def load(cls, path: Union[str, Path]) -> 'Fixtures':
+		""" Reads fixtures saved with `save`: one {"parameters": ..., "response": ...} json record per line."""
+		fixtures = cls()
+		with Path(path).open(encoding = 'utf-8') as file:
+			for line in file:
+				if line.strip():
+					record = json.loads(line)
+					fixtures.add(record['parameters'], record['response'])
+		return fixtures
+
+	def save(self, path: Union[str, Path]) -> int:
+		""" Writes every fixture as a line of json. Returns the number of records written."""
+		records = [(json.loads(key), response) for key, response in self.recorded.items()]
+		records += [([('i', imdb_id)], response) for imdb_id, response in self.titles.items()]
+		records += [([('i', imdb_id), ('season', str(index))], response) for (imdb_id, index), response in self.seasons.items()]
+		with Path(path).open('w', encoding = 'utf-8') as file:
+			for parameters, response in records:
+				file.write(json.dumps({'parameters': dict(parameters), 'response': response}, ensure_ascii = False))
+				file.write('\n')
+		return len(records)
+
+	@classmethod
+	def from_cache(cls, cache: ResponseCache) -> 'Fixtures':
+		""" Uses every response stored in a ResponseCache, i.e. responses recorded while using the live api."""
+		fixtures = cls()
+		for parameters, response in cache.items():
+			fixtures.add(parameters, response)
+		return fixtures
+
+	@classmethod
+	def synthetic(cls, series: int = 10, seasons: Union[int, Iterable[int]] = 5, episodes: int = 10,
+			seed: int = 0) -> 'Fixtures':
+		"""
+			Generates a catalog of series with api-shaped responses, including the long-form response of every episode.
+		Parameters
+		----------
+		series: int; default 10
+		seasons: int, Iterable[int]; default 5
+			The number of seasons of every series, or of each series.
+		episodes: int; default 10
+			The number of episodes per season.
+		seed: int; default 0
+		"""
+		generator = random.Random(seed)
+		season_counts = [seasons] * series if isinstance(seasons, int) else list(seasons)
+		fixtures = cls()
+		for series_index, season_count in enumerate(season_counts):
+			series_id = 'tt9{:06}'.format(series_index)
+			title = 'Synthetic Series {}'.format(series_index)
+			first_year = 1990 + series_index % 30
+			fixtures.addTitle(_titleResponse(
+				series_id, title, 'series', '{}–'.format(first_year), generator, totalSeasons = str(season_count)
+			))
+			for season in range(1, season_count + 1):
+				season_episodes = list()
+				for episode in range(1, episodes + 1):
+					episode_id = 'tt8{:06}{:02}{:03}'.format(series_index, season, episode)
+					released = 'N/A' if generator.random() < 0.05 else '{:02} {} {}'.format(
+						generator.randint(1, 28), _MONTHS[generator.randrange(12)], first_year + season - 1
+					)
+					rating = 'N/A' if generator.random() < 0.05 else '{:.1f}'.format(generator.uniform(5, 9.5))
+					episode_title = 'Episode {}.{}'.format(season, episode)
+					season_episodes.append({
+						'Title': episode_title, 'Released': released, 'Episode': str(episode), 'imdbRating': rating,
+						'imdbID': episode_id
+					})
+					fixtures.addTitle(_titleResponse(
+						episode_id, episode_title, 'episode', str(first_year + season - 1), generator,
+						Released = released, imdbRating = rating, Season = str(season), Episode = str(episode),
+						seriesID = series_id
+					))
+				fixtures.addSeason(series_id, {
+					'Title': title, 'Season': str(season), 'totalSeasons': str(season_count),
+					'Episodes': season_episodes, 'Response': 'True'
+				})
+		return fixtures
+
+
+def _titleResponse(imdb_id: str, title: str, kind: str, year: str, generator: random.Random, **fields) -> Dict:
+	response = {
+		'Title': title, 'Year': year, 'Rated': 'TV-14', 'Released': '01 Jan {}'.format(year[:4]), 'Runtime': '45 min',
+		'Genre': 'Drama', 'Director': 'N/A', 'Writer': 'N/A', 'Actors': 'N/A', 'Plot': 'N/A', 'Language': 'English',
+		'Country': 'USA', 'Awards': 'N/A', 'Poster': 'N/A', 'Ratings': [], 'Metascore': 'N/A',
+		'imdbRating': '{:.1f}'.format(generator.uniform(5, 9.5)), 'imdbVotes': '{:,}'.format(generator.randint(10, 500000)),
+		'imdbID': imdb_id, 'Type': kind, 'Response': 'True'
+	}
+	response.update(fields)
+	return response
+
+
+class StandInBehaviour:
+	"""
+		Simulated network and api behaviour shared by StandInServer and FixtureTransport.
+	Parameters
+	----------
+	latency: float; default 0
+		The time, in seconds, taken by every response.
+	jitter: float; default 0
+		A random extra delay between 0 and `jitter` seconds.
+	error_rate: float; default 0
+		The fraction of requests answered with a 503 error.
+	rate_limit: float; default None
+		The number of requests per second allowed. Further requests are answered with the api's
+		'Request limit reached!' error (status 401), as the api does.
+	daily_limit: int; default None
+		The number of requests allowed in total, after which every request is refused.
+	require_key: bool; default False
+		Refuse requests without an `apikey` parameter.
+	seed: int; default None
+	"""
+
+	def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+			rate_limit: Optional[float] = None, daily_limit: Optional[int] = None, require_key: bool = False,
+			seed: Optional[int] = None):
+		self.latency = latency
+		self.jitter = jitter
+		self.error_rate = error_rate
+		self.rate_limit = rate_limit
+		self.daily_limit = daily_limit
+		self.require_key = require_key
+
+		self.requests = 0
+		self.errors = 0
+		self.limited = 0
+
+		self._random = random.Random(seed)
+		self._lock = threading.Lock()
+		self._tokens = rate_limit if rate_limit else 0.0
+		self._updated = time.monotonic()
+
+	def _allowed(self) -> bool:
+		""" Counts a request against the rate and daily limits."""
+		if self.daily_limit is not None and self.requests > self.daily_limit:
+			return False
+		if not self.rate_limit:
+			return True
+		now = time.monotonic()
+		self._tokens = min(max(1.0, self.rate_limit), self._tokens + (now - self._updated) * self.rate_limit)
+		self._updated = now
+		if self._tokens < 1:
+			return False
+		self._tokens -= 1
+		return True
+
+	def respond(self, fixtures: Fixtures, parameters: Dict) -> Tuple[int, Dict]:
+		""" Returns the (status, json body) of a request, after the simulated delay."""
+		with self._lock:
+			self.requests += 1
+			delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+			failed = self.error_rate > 0 and self._random.random() < self.error_rate
+			allowed = self._allowed()
+			if failed:
+				self.errors += 1
+			elif not allowed:
+				self.limited += 1
+		if delay > 0:
+			time.sleep(delay)
+
+		if failed:
+			return 503, {'Response': 'False', 'Error': 'Service Unavailable'}
+		if not allowed:
+			return 401, LIMIT_REACHED
+		if self.require_key and not parameters.get('apikey'):
+			return 401, NO_API_KEY
+		return 200, fixtures.respond(parameters)
+
+	def stats(self) -> Dict[str, int]:
+		return {'requests': self.requests, 'errors': self.errors, 'limited': self.limited}
+
+
+class _Handler(BaseHTTPRequestHandler):
+	protocol_version = 'HTTP/1.1'
+
+	def do_GET(self):
+		query = self.path.split('?', 1)[1] if '?' in self.path else ''
+		status, payload = self.server.stand_in.handle(dict(parse_qsl(query)))
+		body = json.dumps(payload).encode('utf-8')
+		self.send_response(status)
+		self.send_header('Content-Type', 'application/json; charset=utf-8')
+		self.send_header('Content-Length', str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def log_message(self, format, *args):
+		pass
+
+
+class StandInServer:
+	"""
+		Serves fixtures over HTTP from a background thread, with keep-alive connections.
+		Also usable as a WSGI application with any WSGI server.
+	Parameters
+	----------
+	fixtures: Fixtures; default Fixtures.synthetic()
+	behaviour: StandInBehaviour; default StandInBehaviour()
+	host: str; default '127.0.0.1'
+	port: int; default 0
+		0 picks a free port.
+
+	Examples
+	--------
+		with StandInServer(Fixtures.synthetic(), StandInBehaviour(latency = 0.05)) as server:
+			api = OmdbApi(api_key = 'offline', url = server.url)
+	"""
+
+	def __init__(self, fixtures: Optional[Fixtures] = None, behaviour: Optional[StandInBehaviour] = None,
+			host: str = '127.0.0.1', port: int = 0):
+		self.fixtures = fixtures if fixtures is not None else Fixtures.synthetic()
+		self.behaviour = behaviour if behaviour is not None else StandInBehaviour()
+		self.host = host
+		self.port = port
+		self._server: Optional[ThreadingHTTPServer] = None
+		self._thread: Optional[threading.Thread] = None
+
+	@property
+	def url(self) -> str:
+		return "http://{}:{}/".format(self.host, self.port)
+
+	def handle(self, parameters: Dict) -> Tuple[int, Dict]:
+		return self.behaviour.respond(self.fixtures, parameters)
+
+	def __call__(self, environ, start_response) -> List[bytes]:
+		status, payload = self.handle(dict(parse_qsl(environ.get('QUERY_STRING', ''))))
+		body = json.dumps(payload).encode('utf-8')
+		reason = {200: 'OK', 401: 'Unauthorized', 503: 'Service Unavailable'}.get(status, '')
+		start_response(
+			"{} {}".format(status, reason),
+			[('Content-Type', 'application/json; charset=utf-8'), ('Content-Length', str(len(body)))]
+		)
+		return [body]
+
+	def start(self) -> 'StandInServer':
+		""" Starts serving in a background thread."""
+		self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+		self._server.daemon_threads = True
+		self._server.stand_in = self
+		self.port = self._server.server_address[1]
+		self._thread = threading.Thread(target = self._server.serve_forever, name = 'omdb-stand-in', daemon = True)
+		self._thread.start()
+		return self
+
+	def stop(self):
+		if self._server is not None:
+			self._server.shutdown()
+			self._server.server_close()
+			self._thread.join()
+			self._server = None
+
+	def __enter__(self) -> 'StandInServer':
+		return self.start()
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.stop()
+
+
+class FixtureTransport:
+	"""
+		Transport that answers from fixtures in-process, for `OmdbApi(transport = ...)`.
+		Failed and rate-limited requests are retried like `HttpTransport` does.
+	Parameters
+	----------
+	fixtures: Fixtures; default Fixtures.synthetic()
+	behaviour: StandInBehaviour; default StandInBehaviour()
+	retry: RetryPolicy; default RetryPolicy()
+	"""
+
+	def __init__(self, fixtures: Optional[Fixtures] = None, behaviour: Optional[StandInBehaviour] = None,
+			retry: Optional[RetryPolicy] = None):
+		self.fixtures = fixtures if fixtures is not None else Fixtures.synthetic()
+		self.behaviour = behaviour if behaviour is not None else StandInBehaviour()
+		self.retry = retry if retry is not None else RetryPolicy()
+		self.quota = None
+		self.requests: List[Dict] = list()
+
+	def get(self, url: str, parameters: Dict) -> Dict:
+		record = currentRequest()
+		attempt = 0
+		while True:
+			self.requests.append(dict(parameters))
+			start = time.perf_counter()
+			status, payload = self.behaviour.respond(self.fixtures, parameters)
+			if record is not None:
+				record.addTiming('transfer', time.perf_counter() - start)
+			delay = self.retry.decide(attempt, status, payload, self.quota)
+			if delay is None:
+				if self.retry.shouldRetry(status, payload):
+					message = "{} Server Error for {}".format(status, parameters)
+					raise ConnectionError(message)
+				return payload
+			time.sleep(delay)
+			if record is not None:
+				record.addRetry(delay)
+			attempt += 1
+
+	def close(self):
+		pass
@@ -1,67 +1,182 @@
+import json
+import math
 import os
-from progressbar import ProgressBar
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+try:
+	from progressbar import ProgressBar
+except ModuleNotFoundError:
+	ProgressBar = None
+
 from ..github import tabletools
-filename = os.path.join(os.getenv('USERPROFILE'), 'Google Drive', "Media List.xlsx")
+from ..api.serialization import truncate_incomplete_line
+
+filename = os.path.join(os.getenv('USERPROFILE', os.path.expanduser('~')), 'Google Drive', "Media List.xlsx")
+
+# title, status, totalSeasons, totalEpisodes, imdbRating, myRating, synopsis, haveWatched, imdbId, yearAired
+COLUMNS = (
+	'title', 'status', 'totalSeasons', 'totalEpisodes', 'imdbRating', 'myRating', 'haveWatched', 'synopsis', 'imdbId',
+	'yearAired'
+)
+# Columns copied from the spreadsheet rather than retrieved from the api.
+USER_COLUMNS = ('status', 'myRating', 'haveWatched')
+# Columns that need every season of a series to be requested.
+SEASON_COLUMNS = ('totalEpisodes',)
+
+
+def _rowKey(row: Dict) -> Optional[str]:
+	""" The imdbId of a row, or its title if it has no imdbId."""
+	media_id = row.get('imdbId')
+	if isinstance(media_id, str) and media_id.strip():
+		return media_id.strip()
+	media_title = row.get('title')
+	if media_title is None or (isinstance(media_title, float) and math.isnan(media_title)):
+		return None
+	return str(media_title).strip() or None
+
+
+def readRows(filename: Union[str, Path], sheetname: str = "TV Shows") -> List[Dict]:
+	""" Reads the rows of the media list."""
+	table = tabletools.Table(filename, sheetname = sheetname)
+	return [dict(row) for _, row in table.iterrows()]
+
+
+def _rowValues(response, need_seasons: bool) -> Dict:
+	""" The api columns of a single row."""
+	values = {
+		'title':        response.title,
+		'totalSeasons': response.totalSeasons,
+		'imdbRating':   response.imdbRating,
+		'synopsis':     response.plot,
+		'imdbId':       response.imdbId,
+		'yearAired':    response.year
+	}
+	if need_seasons:
+		values['totalEpisodes'] = sum(season.length for season in response.seasons or [])
+	return values
+
+
+def _readCheckpoint(checkpoint: Path) -> Dict[str, Dict]:
+	""" Reads the rows completed by a previous, interrupted run."""
+	if not checkpoint.exists():
+		return dict()
+	truncate_incomplete_line(checkpoint)
+	completed = dict()
+	with checkpoint.open('r', encoding = 'utf-8') as file:
+		for line in file:
+			if line.strip():
+				record = json.loads(line)
+				completed[record['key']] = record['values']
+	return completed
 
 
-def parseTable(api, filename, **kwargs):
+def resolveRows(api, keys: Iterable[str], need_seasons: bool = True,
+		max_workers: int = 8) -> Iterator[Tuple[str, Optional[Dict], Optional[Exception]]]:
 	"""
-		Attempts to lookup imformation from the api using information saved in a table.
-		Keyword Arguments
-		-----------------
+		Retrieves the api columns of each key with `api.iter_many`, at most `max_workers` at a time.
+		Yields (key, values, error) as each key completes. Series are retrieved lazily, so their seasons
+		are only requested when `need_seasons` is set.
+	"""
+	episode_format = 'short' if need_seasons else None
+	for item in api.iter_many(keys, episode_format, max_workers, lazy = not need_seasons):
+		if item.error is not None:
+			yield item.key, None, item.error
+		elif item.result is None:
+			message = "No results for '{}'".format(item.key)
+			yield item.key, None, ValueError(message)
+		else:
+			yield item.key, _rowValues(item.result, need_seasons), None
+
 
+def enrichRows(api, rows: List[Dict], columns: Optional[Iterable[str]] = None, max_workers: int = 8,
+		checkpoint: Optional[Union[str, Path]] = None) -> List[Dict]:
 	"""
+		Fills in the api columns of the media list rows.
+	Parameters
+	----------
+	api: OmdbApi
+	rows: List[Dict]
+		The rows of the media list. Each row is identified by its `imdbId` or, if it has none, its `title`.
+	columns: Iterable[str]; default COLUMNS
+		The columns of the returned rows. Seasons are only requested if `totalEpisodes` is included.
+	max_workers: int; default 8
+		The number of rows retrieved at once.
+	checkpoint: str, Path; default None
+		A JSONL file that every retrieved row is appended to as soon as it completes. Rows found in it
+		are not retrieved again, so an interrupted run can be resumed. Deleted once every row has been retrieved.
+
+	Returns
+	-------
+	List[Dict]
+		The rows that could be retrieved, in their original order.
+	"""
+	columns = list(columns) if columns is not None else list(COLUMNS)
+	need_seasons = any(column in SEASON_COLUMNS for column in columns)
+	checkpoint = Path(checkpoint) if checkpoint is not None else None
+
+	keys = list(dict.fromkeys(key for key in map(_rowKey, rows) if key is not None))
+	known_keys = set(keys)
+	completed = dict()
+	if checkpoint is not None:
+		# Rows checkpointed without the season columns now requested are retrieved again.
+		completed = {
+			key: values for key, values in _readCheckpoint(checkpoint).items()
+			if key in known_keys and all(column in values for column in SEASON_COLUMNS if column in columns)
+		}
+	remaining = [key for key in keys if key not in completed]
+
+	pbar = ProgressBar(max_value = len(keys)) if ProgressBar is not None else None
+	errors = dict()
+	checkpoint_file = checkpoint.open('a', encoding = 'utf-8') if checkpoint is not None else None
+	try:
+		for key, values, error in resolveRows(api, remaining, need_seasons, max_workers):
+			if error is not None:
+				errors[key] = error
+				continue
+			completed[key] = values
+			if checkpoint_file is not None:
+				checkpoint_file.write(json.dumps({'key': key, 'values': values}) + '\n')
+				checkpoint_file.flush()
+			if pbar is not None:
+				pbar.update(len(completed) + len(errors))
+	finally:
+		if checkpoint_file is not None:
+			checkpoint_file.close()
 
-	table = tabletools.Table(filename, sheetname = "TV Shows")
+	for key, error in errors.items():
+		print()
+		print("Could not retrieve data for '{}' ('{}')".format(key, error))
+	if checkpoint is not None and not errors:
+		checkpoint.unlink()
 
-	# title, status, totalSeasons, totalEpisodes, imdbRating, myRating, synopsis, haveWatched, imdbId, yearAired
 	new_table = list()
-	pbar = ProgressBar(max_value = len(table))
-	for index, row in table.iterrows():
-		pbar.update(index)
-		media_title = row.get('title')
-		media_id = row.get('imdbId')
-		media_title = str(media_title)
-
-		if media_title == 'nan': media_title = None
-		if not isinstance(media_id, str): media_id = None
-
-		try:
-			if media_id:
-				response = api.get(media_id, True)
-			else:
-				response = api.find(media_title)
-			error = False
-			message = ""
-		except Exception as exception:
-			error = True
-			message = "Could not retrieve data for '{}' ('{}')".format(media_title, str(exception))
-
-		if response is None:
-			error = True
-			message = "Could not retrieve the seasons for '{}'".format(media_title)
-
-		if error:
-			print()
-			print(message)
+	for row in rows:
+		values = completed.get(_rowKey(row))
+		if values is None:
 			continue
-		total_episodes = 0
-		for i in response['seasons']:
-			total_episodes += i['length']
-		new_row = {
-			'title':         response['title'],
-			'status':        row['status'],
-			'totalSeasons':  response['totalSeasons'],
-			'totalEpisodes': total_episodes,
-			'imdbRating':    response['imdbRating'],
-			'myRating':      row['myRating'],
-			'haveWatched':   row['haveWatched'],
-			'synopsis':      response['plot'],
-			'imdbId':        response['imdbId'],
-			'yearAired':     response['year']
-		}
+		new_row = {column: row.get(column) if column in USER_COLUMNS else values.get(column) for column in columns}
 		new_table.append(new_row)
+	return new_table
 
-	new_table = tabletools.Table(new_table)
 
-	return new_table
\ No newline at end of file
+def parseTable(api, filename: Union[str, Path] = filename, columns: Optional[Iterable[str]] = None, max_workers: int = 8,
+		checkpoint: Optional[Union[str, Path]] = None, sheetname: str = "TV Shows"):
+	"""
+		Attempts to lookup imformation from the api using information saved in a table.
+		Rows are read, retrieved concurrently, then written to a new table. See `enrichRows`.
+	Parameters
+	----------
+	api: OmdbApi
+	filename: str, Path
+	columns: Iterable[str]; default COLUMNS
+	max_workers: int; default 8
+	checkpoint: str, Path; default '<filename>.checkpoint.jsonl'
+		Progress is saved here, so that a rerun after a crash resumes where it stopped.
+	sheetname: str; default 'TV Shows'
+	"""
+	if checkpoint is None:
+		checkpoint = str(filename) + '.checkpoint.jsonl'
+	rows = readRows(filename, sheetname)
+	new_table = enrichRows(api, rows, columns, max_workers, checkpoint)
+	return tabletools.Table(new_table)
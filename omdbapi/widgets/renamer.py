@@ -22,7 +22,7 @@ class Rename:
 		#self.series_info.summary()
 
 		if rename_files:
-			self.series_info.save(folder / "series_info.yaml")
+			self.series_info.save(folder / "series_info.jsonl")
 
 		self.log = list()
 		for source in files:
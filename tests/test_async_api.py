@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from omdbapi.api import OmdbApi, ResponseCache
+from omdbapi.offline import Fixtures, StandInServer
+
+try:
+	import aiohttp
+except ModuleNotFoundError:
+	aiohttp = None
+
+
+class _NotJsonHandler(BaseHTTPRequestHandler):
+	protocol_version = 'HTTP/1.1'
+
+	def do_GET(self):
+		body = b'<html>Service temporarily unavailable</html>'
+		self.send_response(200)
+		self.send_header('Content-Type', 'text/html')
+		self.send_header('Content-Length', str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def log_message(self, format, *args):
+		pass
+
+
+class _NotJsonServer:
+	""" Answers every request with a 200 html page, as a misbehaving proxy would."""
+
+	def __enter__(self) -> str:
+		self.server = ThreadingHTTPServer(('127.0.0.1', 0), _NotJsonHandler)
+		threading.Thread(target = self.server.serve_forever, daemon = True).start()
+		return "http://127.0.0.1:{}/".format(self.server.server_address[1])
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.server.shutdown()
+		self.server.server_close()
+
+
+@unittest.skipIf(aiohttp is None, "requires aiohttp")
+class TestAsyncOmdbApi(unittest.TestCase):
+	def setUp(self):
+		self.server = StandInServer(Fixtures.synthetic(series = 2, seasons = 3, episodes = 2)).start()
+
+	def tearDown(self):
+		self.server.stop()
+
+	def run_client(self, function):
+		from omdbapi.api import AsyncOmdbApi
+
+		async def run():
+			async with AsyncOmdbApi(api_key = 'offline', url = self.server.url) as api:
+				return await function(api)
+
+		return asyncio.run(run())
+
+	def test_get(self):
+		series = self.run_client(lambda api: api.get('tt9000001', 'short'))
+		expected = OmdbApi(api_key = 'offline', url = self.server.url).get('tt9000001', 'short')
+		self.assertEqual(expected.toTable().to_dict(), series.toTable().to_dict())
+
+	def test_long_form_and_find(self):
+		async def run(api):
+			return await asyncio.gather(api.get('tt9000000', 'long'), api.find('Synthetic Series 1'))
+
+		series, found = self.run_client(run)
+		self.assertEqual('episode', series.seasons[2].episodes[1].type)
+		self.assertEqual(6, series.seasons[2].episodes[1].indexInSeries)
+		self.assertEqual('tt9000001', found.imdbId)
+
+	def test_search(self):
+		async def run(api):
+			return [item['imdbID'] async for item in api.search_iter('synthetic')]
+
+		self.assertEqual(['tt9000000', 'tt9000001'], sorted(self.run_client(run)))
+
+	def test_response_that_is_not_json(self):
+		from omdbapi.api import AsyncOmdbApi
+		with _NotJsonServer() as url:
+			async def run():
+				async with AsyncOmdbApi(api_key = 'offline', url = url, cache = ResponseCache(':memory:')) as api:
+					return await api.get('tt9000000')
+
+			with self.assertRaises(ValueError):
+				asyncio.run(run())
+			with self.assertRaises(ValueError):
+				OmdbApi(api_key = 'offline', url = url).get('tt9000000')
+
+	def test_sync_methods_are_not_inherited(self):
+		from omdbapi.api import AsyncOmdbApi
+		for name in ('get_many', 'iter_many', 'refresh', '_hydrateEpisodes', '_loadSeason'):
+			self.assertFalse(hasattr(AsyncOmdbApi, name), name)
+		with self.assertRaises(TypeError):
+			self.run_client(lambda api: api.get('tt9000000', lazy = True))
+
+
+if __name__ == "__main__":
+	unittest.main()
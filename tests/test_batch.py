@@ -0,0 +1,77 @@
+import csv
+import io
+import os
+import pathlib
+import tempfile
+import unittest
+from omdbapi.__main__ import main
+from omdbapi.api import OmdbApi, serialization
+from omdbapi.batch import completed_queries, read_queries, run_batch
+from omdbapi.offline import Fixtures, FixtureTransport, StandInServer
+
+
+class TestBatch(unittest.TestCase):
+	def setUp(self):
+		self.fixtures = Fixtures.synthetic(series = 3, seasons = 2, episodes = 2)
+		self.api = OmdbApi(api_key = 'offline', transport = FixtureTransport(self.fixtures))
+		self.queries = read_queries(['tt9000000', '', '# comment', 'Synthetic Series 1', 'tt9000000', 'No Such Show'])
+
+	def test_read_queries(self):
+		self.assertEqual(['tt9000000', 'Synthetic Series 1', 'No Such Show'], self.queries)
+
+	def test_jsonl(self):
+		output = io.StringIO()
+		summary = run_batch(self.api, self.queries, output, episode_format = 'short', jobs = 2)
+		self.assertEqual((2, 1), (summary.resolved, summary.failed))
+
+		lines = {line['query']: line for line in map(serialization.from_json, output.getvalue().splitlines())}
+		self.assertEqual('tt9000001', lines['Synthetic Series 1']['imdbId'])
+		self.assertEqual(4, len(lines['tt9000000']['resource'].toTable()))
+		self.assertEqual('not found', lines['No Such Show']['error'])
+
+	def test_csv_per_episode(self):
+		output = io.StringIO()
+		run_batch(self.api, self.queries, output, 'csv', per = 'episode', episode_format = 'short')
+		rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+		self.assertEqual(9, len(rows))
+		self.assertEqual({'S01E01', 'S01E02', 'S02E01', 'S02E02'}, {r['episodeId'] for r in rows if r['query'] == 'tt9000000'})
+
+	def test_resume(self):
+		with tempfile.TemporaryDirectory() as folder:
+			path = pathlib.Path(folder) / 'results.jsonl'
+			with path.open('w', encoding = 'utf-8') as output:
+				run_batch(self.api, self.queries, output)
+			with path.open('a', encoding = 'utf-8') as output:
+				# An interrupted write.
+				output.write('{"query": "tt9000002"')
+
+			completed = completed_queries(path, 'jsonl')
+			self.assertEqual({'tt9000000', 'Synthetic Series 1'}, completed)
+			self.assertEqual(3, len(path.read_text().splitlines()))
+
+			with path.open('a', encoding = 'utf-8') as output:
+				summary = run_batch(self.api, self.queries + ['tt9000002'], output, skip = completed)
+			self.assertEqual((1, 1, 2), (summary.resolved, summary.failed, summary.skipped))
+
+	def test_command_line(self):
+		with tempfile.TemporaryDirectory() as folder, StandInServer(self.fixtures) as server:
+			folder = pathlib.Path(folder)
+			(folder / 'queries.txt').write_text("tt9000000\ntt9000001\n")
+			output = folder / 'results.csv'
+			arguments = ['batch', str(folder / 'queries.txt'), '-o', str(output), '--api-key', 'offline', '--jobs', '2']
+			previous = os.environ.get('OMDBAPI_URL')
+			os.environ['OMDBAPI_URL'] = server.url
+			try:
+				self.assertEqual(0, main(arguments))
+				self.assertEqual(0, main(arguments + ['--resume']))
+			finally:
+				if previous is None:
+					del os.environ['OMDBAPI_URL']
+				else:
+					os.environ['OMDBAPI_URL'] = previous
+			rows = list(csv.DictReader(output.open(encoding = 'utf-8')))
+		self.assertEqual(['tt9000000', 'tt9000001'], sorted(row['imdbId'] for row in rows))
+
+
+if __name__ == '__main__':
+	unittest.main()
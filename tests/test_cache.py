@@ -0,0 +1,133 @@
+import pathlib
+import tempfile
+import unittest
+from omdbapi.api import OmdbApi, ResourceCache, ResponseCache
+from omdbapi.offline import Fixtures, FixtureTransport
+
+
+class TestResponseCache(unittest.TestCase):
+	def setUp(self):
+		self.cache = ResponseCache(':memory:', max_entries = 3)
+		self.movie_parameters = {'i': 'tt2488496'}
+		self.movie_response = {'Title': 'Star Wars: The Force Awakens', 'Type': 'movie', 'Response': 'True'}
+
+	def tearDown(self):
+		self.cache.close()
+
+	def test_key_ignores_api_key(self):
+		self.assertEqual(
+			ResponseCache.key({'i': 'tt2488496', 'apikey': 'abc'}),
+			ResponseCache.key({'i': 'tt2488496', 'apikey': 'def'})
+		)
+
+	def test_roundtrip(self):
+		self.assertIsNone(self.cache.get(self.movie_parameters))
+		self.cache.put(self.movie_parameters, self.movie_response)
+		self.assertDictEqual(self.movie_response, self.cache.get(self.movie_parameters))
+
+		stats = self.cache.stats()
+		self.assertEqual(1, stats['hits'])
+		self.assertEqual(1, stats['misses'])
+
+	def test_classify(self):
+		self.assertEqual('movie', ResponseCache.classify({'i': 'tt2488496'}, self.movie_response))
+		self.assertEqual('search', ResponseCache.classify({'s': 'legion'}, {'Response': 'True'}))
+		self.assertEqual('series_ongoing', ResponseCache.classify({'i': 'tt5114356'}, {'Type': 'series', 'Year': '2017–', 'Response': 'True'}))
+		self.assertEqual('series_ended', ResponseCache.classify({'i': 'tt5114356'}, {'Type': 'series', 'Year': '2017–2019', 'Response': 'True'}))
+		self.assertEqual('latest_season', ResponseCache.classify({'i': 'tt5114356', 'Season': 2}, {'Season': '2', 'totalSeasons': '2', 'Response': 'True'}))
+		self.assertIsNone(ResponseCache.classify({'i': 'tt5114356'}, {'Response': 'False', 'Error': 'Request limit reached!'}))
+
+	def test_expired_response_is_a_miss(self):
+		self.cache.ttls['movie'] = -1
+		self.cache.put(self.movie_parameters, self.movie_response)
+		self.assertIsNone(self.cache.get(self.movie_parameters))
+		self.assertEqual(1, self.cache.stats()['expired'])
+
+	def test_eviction(self):
+		for index in range(5):
+			self.cache.put({'i': 'tt{}'.format(index)}, self.movie_response)
+		stats = self.cache.stats()
+		self.assertEqual(3, stats['entries'])
+		self.assertEqual(2, stats['evictions'])
+		self.assertIsNone(self.cache.get({'i': 'tt0'}))
+
+	def test_items(self):
+		for index in range(3):
+			self.cache.put({'i': 'tt{}'.format(index)}, dict(self.movie_response, imdbID = 'tt{}'.format(index)))
+		items = list(self.cache.items(batch_size = 2))
+		self.assertEqual([{'i': 'tt0'}, {'i': 'tt1'}, {'i': 'tt2'}], [parameters for parameters, _ in items])
+		self.assertEqual(['tt0', 'tt1', 'tt2'], [response['imdbID'] for _, response in items])
+
+	def test_buffered_access_times(self):
+		for index in range(3):
+			self.cache.put({'i': 'tt{}'.format(index)}, self.movie_response)
+		self.assertIsNotNone(self.cache.get({'i': 'tt0'}))
+		# The hit is only recorded in memory, but is still taken into account when evicting.
+		self.assertEqual(1, len(self.cache._accessed))
+		self.cache.put({'i': 'tt3'}, self.movie_response)
+		self.assertIsNotNone(self.cache.get({'i': 'tt0'}))
+		self.assertIsNone(self.cache.get({'i': 'tt1'}))
+
+	def test_write_ahead_log(self):
+		with tempfile.TemporaryDirectory() as folder:
+			cache = ResponseCache(pathlib.Path(folder) / 'responses.sqlite', access_buffer = 2)
+			cache.put(self.movie_parameters, self.movie_response)
+			for _ in range(3):
+				cache.get(self.movie_parameters)
+			self.assertEqual('wal', cache._connection.execute("PRAGMA journal_mode").fetchone()[0])
+			self.assertEqual(1, len(cache._accessed))
+			cache.close()
+
+
+class TestResourceCache(unittest.TestCase):
+	def setUp(self):
+		self.cache = ResourceCache(max_entries = 2)
+
+	def test_lru_order(self):
+		self.cache.put('tt1', 'short', 'first')
+		self.cache.put('tt2', 'short', 'second')
+		self.assertEqual('first', self.cache.get('tt1', 'short'))
+		self.cache.put('tt3', 'short', 'third')
+
+		self.assertIsNone(self.cache.get('tt2', 'short'))
+		self.assertEqual('first', self.cache.get('tt1', 'short'))
+		self.assertEqual(1, self.cache.stats()['evictions'])
+
+	def test_episode_format_is_part_of_the_key(self):
+		self.cache.put('tt1', 'short', 'short-form')
+		self.assertIsNone(self.cache.get('tt1', 'long'))
+
+	def test_invalidate(self):
+		self.cache.put('tt1', 'short', 'short-form')
+		self.cache.put('tt1', None, 'no seasons')
+		self.cache.invalidate('tt1')
+		self.assertEqual(0, len(self.cache))
+
+	def test_memory_budget(self):
+		cache = ResourceCache(max_entries = 10, max_bytes = 1000)
+		cache.put('tt1', None, 'x' * 600)
+		cache.put('tt2', None, 'x' * 600)
+		self.assertNotIn(('tt1', None), cache)
+		self.assertIn(('tt2', None), cache)
+
+	def test_client_memo_size(self):
+		fixtures = Fixtures.synthetic(series = 2, seasons = 10, episodes = 20)
+		sizes = dict()
+		for compact in (False, True):
+			memo = ResourceCache(max_bytes = 10 ** 7)
+			api = OmdbApi(api_key = 'offline', transport = FixtureTransport(fixtures), memo = memo, compact = compact)
+			series = api.get('tt9000000', 'short')
+			self.assertIs(series, api.get('tt9000000', 'short'))
+			sizes[compact] = memo.stats()['bytes']
+		# Column-oriented seasons are smaller, but their arrays and slotted attributes are still counted.
+		self.assertGreater(sizes[True], sizes[False] / 4)
+		self.assertLess(sizes[True], sizes[False])
+
+		# A budget smaller than a single series keeps nothing.
+		memo = ResourceCache(max_bytes = sizes[True] // 2)
+		OmdbApi(api_key = 'offline', transport = FixtureTransport(fixtures), memo = memo, compact = True).get('tt9000000', 'short')
+		self.assertEqual(0, memo.stats()['entries'])
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,100 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from omdbapi.api import OmdbApi
+from omdbapi.offline import Fixtures, FixtureTransport
+
+try:
+	from omdbapi.catalog import CatalogStore
+except ModuleNotFoundError:
+	CatalogStore = None
+
+
+@unittest.skipIf(CatalogStore is None, "requires pandas")
+class TestCatalogStore(unittest.TestCase):
+	def setUp(self):
+		self.folder = tempfile.TemporaryDirectory()
+		fixtures = Fixtures.synthetic(series = 3, seasons = [2, 1, 3], episodes = 3)
+		self.api = OmdbApi(api_key = 'offline', transport = FixtureTransport(fixtures))
+		self.series = [self.api.get('tt9{:06}'.format(index), 'short') for index in range(3)]
+
+	def tearDown(self):
+		self.folder.cleanup()
+
+	def store(self, partition_by: str = 'letter') -> 'CatalogStore':
+		try:
+			return CatalogStore(self.folder.name, partition_by = partition_by)
+		except ModuleNotFoundError:
+			self.skipTest("requires pyarrow")
+
+	def test_append_and_read(self):
+		for partition_by in ('letter', 'series'):
+			with self.subTest(partition_by = partition_by):
+				store = self.store(partition_by)
+				self.assertEqual(18, store.append(self.series))
+				table = store.read()
+				self.assertEqual(18, len(table))
+				self.assertEqual({'tt9000000': 6, 'tt9000001': 3, 'tt9000002': 9}, dict(store.series()[['seriesId', 'episodes']].values))
+				store.remove(['tt9000000', 'tt9000001', 'tt9000002'])
+
+	def test_ratings_round_trip(self):
+		store = self.store()
+		store.append(self.series[:1])
+		expected = self.series[0].toTable()
+		stored = store.read_series('tt9000000')
+		self.assertEqual(list(expected['imdbRating']), list(stored['imdbRating']))
+		self.assertEqual(list(expected['episodeId']), list(stored['episodeId']))
+
+	def test_column_projection(self):
+		store = self.store()
+		store.append(self.series)
+		table = store.read(columns = ['seriesId', 'indexInSeries', 'imdbRating'], series = ['tt9000002'])
+		self.assertEqual(['seriesId', 'indexInSeries', 'imdbRating'], list(table.columns))
+		self.assertEqual(list(range(1, 10)), sorted(table['indexInSeries']))
+		self.assertEqual(['episodeId', 'imdbRating'], list(store.read_series('tt9000001', ['episodeId', 'imdbRating']).columns))
+
+	def test_replace_and_remove(self):
+		for partition_by in ('letter', 'series'):
+			with self.subTest(partition_by = partition_by):
+				store = self.store(partition_by)
+				store.append(self.series)
+				# Appending a series again replaces its episodes.
+				self.series[1].seasons[0].episodes[0].title = 'Renamed'
+				store.append(self.series[1:2])
+				table = store.read_series('tt9000001')
+				self.assertEqual(3, len(table))
+				self.assertEqual('Renamed', table['title'][0])
+
+				store.remove(['tt9000001'])
+				self.assertEqual({'tt9000000', 'tt9000002'}, set(store.read(columns = ['seriesId'])['seriesId'].astype(str)))
+				store.remove(['tt9000000', 'tt9000002'])
+				self.assertEqual(0, len(store.read()))
+
+	def test_retitled_series_moves_partition(self):
+		store = self.store()
+		store.append(self.series)
+		self.series[1].title = 'Another Title'
+		store.append(self.series[1:2])
+		table = store.read(columns = ['seriesId', 'seriesTitle'])
+		self.assertEqual(18, len(table))
+		self.assertEqual({'Another Title'}, set(table[table['seriesId'].astype(str) == 'tt9000001']['seriesTitle']))
+
+	def test_interrupted_write(self):
+		store = self.store()
+		store.append(self.series)
+
+		def interrupted(table, path, **kwargs):
+			Path(path).write_bytes(b'PAR1 not a complete file')
+			raise OSError("No space left on device")
+
+		self.series[0].title = 'Renamed'
+		with mock.patch('omdbapi.catalog.parquet.write_table', interrupted), self.assertRaises(OSError):
+			store.append(self.series[:1])
+		# The partially written file is left behind, but not read.
+		self.assertEqual(18, len(store.read()))
+		self.assertEqual(6, len(store.read_series('tt9000000')))
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,200 @@
+import threading
+import time
+import unittest
+from omdbapi.api import OmdbApi, ResponseCache
+from omdbapi.offline import Fixtures, FixtureTransport, StandInBehaviour, StandInServer
+
+
+class _SlowEarlySeasons(FixtureTransport):
+	""" Answers earlier seasons more slowly, so that concurrently requested seasons complete in reverse order."""
+
+	def __init__(self, fixtures: Fixtures):
+		super().__init__(fixtures)
+		self.completed = list()
+		self._lock = threading.Lock()
+
+	def get(self, url, parameters):
+		season = int(parameters.get('Season', 0))
+		if season:
+			time.sleep(0.02 * (5 - season))
+		response = super().get(url, parameters)
+		with self._lock:
+			self.completed.append(season)
+		return response
+
+
+def _seasonRequests(transport: FixtureTransport):
+	return [int(p['Season']) for p in transport.requests if 'Season' in p]
+
+
+class TestSeasons(unittest.TestCase):
+	def test_order_when_fetched_concurrently(self):
+		transport = _SlowEarlySeasons(Fixtures.synthetic(series = 1, seasons = 4, episodes = 3))
+		api = OmdbApi(api_key = 'offline', transport = transport, max_workers = 4)
+		series = api.get('tt9000000', 'short')
+
+		# Seasons 1-4 completed out of order, followed by the probe for season 5.
+		self.assertNotEqual(sorted(transport.completed[1:5]), transport.completed[1:5])
+		self.assertEqual([1, 2, 3, 4], [season.seasonIndex for season in series.seasons])
+		self.assertEqual(list(range(1, 13)), [episode.indexInSeries for season in series.seasons for episode in season])
+		self.assertEqual('S03E01', series.get_episode(7).episodeId)
+
+	def test_probe_past_undercounted_total(self):
+		fixtures = Fixtures.synthetic(series = 1, seasons = 4, episodes = 2)
+		fixtures.titles['tt9000000']['totalSeasons'] = '2'
+		transport = FixtureTransport(fixtures)
+		series = OmdbApi(api_key = 'offline', transport = transport).get('tt9000000', 'short')
+
+		self.assertEqual([1, 2, 3, 4], [season.seasonIndex for season in series.seasons])
+		self.assertEqual(8, series.seasons[-1].episodes[-1].indexInSeries)
+		self.assertEqual([1, 2, 3, 4, 5], sorted(_seasonRequests(transport)))
+
+	def test_missing_reported_season(self):
+		fixtures = Fixtures.synthetic(series = 1, seasons = 4, episodes = 2)
+		del fixtures.seasons[('tt9000000', 3)]
+		transport = FixtureTransport(fixtures)
+		series = OmdbApi(api_key = 'offline', transport = transport).get('tt9000000', 'short')
+
+		# The season list ends at the first missing season, and nothing past the reported total is probed.
+		self.assertEqual([1, 2], [season.seasonIndex for season in series.seasons])
+		self.assertEqual([1, 2, 3, 4], sorted(_seasonRequests(transport)))
+
+
+class TestLongFormEpisodes(unittest.TestCase):
+	def test_hydration(self):
+		transport = FixtureTransport(Fixtures.synthetic(series = 1, seasons = 2, episodes = 3))
+		api = OmdbApi(api_key = 'offline', transport = transport, max_workers = 4)
+		series = api.get('tt9000000', 'long')
+
+		episodes = [episode for season in series.seasons for episode in season]
+		self.assertEqual(['S01E01', 'S01E02', 'S01E03', 'S02E01', 'S02E02', 'S02E03'], [e.episodeId for e in episodes])
+		self.assertEqual(list(range(1, 7)), [e.indexInSeries for e in episodes])
+		for episode in episodes:
+			self.assertEqual('episode', episode.type)
+			self.assertEqual(transport.fixtures.titles[episode.imdbId]['Title'], episode.title)
+
+		# Every episode is requested exactly once.
+		episode_requests = [p['i'] for p in transport.requests if 'Season' not in p and p['i'] != 'tt9000000']
+		self.assertEqual(sorted(e.imdbId for e in episodes), sorted(episode_requests))
+
+
+class _FailingTransport(FixtureTransport):
+	""" Raises a ConnectionError for every request of `failing`."""
+
+	def __init__(self, fixtures: Fixtures, failing: str):
+		super().__init__(fixtures)
+		self.failing = failing
+
+	def get(self, url, parameters):
+		if parameters.get('i') == self.failing:
+			raise ConnectionError(self.failing)
+		return super().get(url, parameters)
+
+
+class TestGetMany(unittest.TestCase):
+	def setUp(self):
+		self.transport = _FailingTransport(Fixtures.synthetic(series = 4, seasons = 2, episodes = 2), 'tt9000002')
+		self.api = OmdbApi(api_key = 'offline', transport = self.transport, max_workers = 3)
+
+	def test_order_duplicates_and_errors(self):
+		keys = ['tt9000003', 'Synthetic Series 1', 'tt9000002', 'tt9000003', ' tt9000000 ', 'No Such Show']
+		results = self.api.get_many(keys, 'short')
+
+		self.assertEqual(['tt9000003', 'Synthetic Series 1', 'tt9000002', 'tt9000003', 'tt9000000', 'No Such Show'], [r.key for r in results])
+		self.assertIs(results[0], results[3])
+		self.assertEqual(['tt9000003', 'tt9000001', None, 'tt9000003', 'tt9000000', None], [r.result and r.result.imdbId for r in results])
+		self.assertEqual([True, True, False, True, True, False], [r.ok for r in results])
+		self.assertIsInstance(results[2].error, ConnectionError)
+		self.assertIsNone(results[5].error)
+		# Duplicates are only requested once.
+		top_level = [p['i'] for p in self.transport.requests if 'i' in p and 'Season' not in p]
+		self.assertEqual(1, top_level.count('tt9000003'))
+
+	def test_bounded_submissions(self):
+		pulled = list()
+
+		def keys():
+			for index in range(50):
+				pulled.append(index)
+				yield 'tt9{:06}'.format(index % 4) if index % 8 < 4 else 'Synthetic Series {}'.format(index % 4)
+
+		results = self.api.iter_many(keys(), max_workers = 2, lazy = True)
+		first = next(results)
+		# Keys are consumed as items complete, at most 2 * max_workers ahead.
+		self.assertLessEqual(len(pulled), 4)
+		self.assertIn(first.key, ['tt9000000', 'tt9000001', 'tt9000002', 'tt9000003'])
+		remaining = list(results)
+		self.assertEqual(50, len(pulled))
+		# Duplicates are only yielded once. Lazy series are retrieved without their seasons.
+		self.assertEqual(8, 1 + len(remaining))
+		self.assertFalse([p for p in self.transport.requests if 'Season' in p])
+
+	def test_bounded_connections(self):
+		fixtures = Fixtures.synthetic(series = 6, seasons = 4, episodes = 2)
+		with StandInServer(fixtures, StandInBehaviour(latency = 0.005)) as server:
+			with OmdbApi(api_key = 'offline', url = server.url, pool_size = 4) as api:
+				with self.assertNoLogs('urllib3.connectionpool', 'WARNING'):
+					results = api.get_many(['tt9{:06}'.format(i) for i in range(6)], 'long')
+		self.assertTrue(all(r.ok for r in results))
+
+
+class TestRefresh(unittest.TestCase):
+	def setUp(self):
+		self.fixtures = Fixtures.synthetic(series = 1, seasons = 4, episodes = 2)
+		self.new_season = self.fixtures.seasons.pop(('tt9000000', 4))
+		self.fixtures.titles['tt9000000']['totalSeasons'] = '3'
+		self.transport = FixtureTransport(self.fixtures)
+
+	def add_season(self):
+		self.fixtures.addSeason('tt9000000', self.new_season)
+		self.fixtures.titles['tt9000000'] = dict(self.fixtures.titles['tt9000000'], totalSeasons = '4', imdbRating = '9.9')
+
+	def test_requests(self):
+		api = OmdbApi(api_key = 'offline', transport = self.transport, cache = ResponseCache(':memory:'))
+		series = api.get('tt9000000', 'short')
+		first_season = series.seasons[0]
+		self.add_season()
+		self.transport.requests.clear()
+
+		self.assertIs(series, api.refresh(series))
+		# The series, the last known season, the new season and the probe past it. Cached copies are not used.
+		self.assertEqual(
+			[{'i': 'tt9000000'}, {'i': 'tt9000000', 'Season': '3'}, {'i': 'tt9000000', 'Season': '4'}, {'i': 'tt9000000', 'Season': '5'}],
+			[{key: str(value) for key, value in p.items() if key != 'apikey'} for p in self.transport.requests]
+		)
+		self.assertEqual(9.9, series.imdbRating)
+		self.assertEqual(4, series.totalSeasons)
+		self.assertEqual([1, 2, 3, 4], [season.seasonIndex for season in series.seasons])
+		self.assertIs(first_season, series.seasons[0])
+		self.assertEqual(list(range(1, 9)), [e.indexInSeries for season in series.seasons for e in season])
+
+	def test_long_form(self):
+		api = OmdbApi(api_key = 'offline', transport = self.transport)
+		series = api.get('tt9000000', 'long')
+		self.add_season()
+		api.refresh(series)
+		self.assertEqual('episode', series.seasons[3].episodes[0].type)
+		self.assertEqual(8, series.seasons[3].episodes[1].indexInSeries)
+
+	def test_lazy_seasons(self):
+		api = OmdbApi(api_key = 'offline', transport = self.transport, cache = ResponseCache(':memory:'))
+		series = api.get('tt9000000', 'short', lazy = True)
+		first_season = series.seasons.season(1)
+		series.seasons.season(3)
+		self.add_season()
+		self.fixtures.seasons[('tt9000000', 3)]['Episodes'][0]['Title'] = 'Renamed'
+		self.transport.requests.clear()
+
+		api.refresh(series)
+		# Only the series is requested. The last reported season is discarded, and requested again when accessed.
+		self.assertEqual([{'i': 'tt9000000'}], [{k: v for k, v in p.items() if k != 'apikey'} for p in self.transport.requests])
+		self.assertFalse(series.seasons.complete)
+		self.assertEqual([1], series.seasons.loaded())
+		self.assertIs(first_season, series.seasons.season(1))
+		self.assertEqual('Renamed', series.seasons.season(3).episodes[0].title)
+		self.assertEqual(4, len(series.seasons))
+		self.assertEqual(8, series.get_episode('S04E02').indexInSeries)
+
+
+if __name__ == "__main__":
+	unittest.main()
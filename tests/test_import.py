@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_PROBE = """
+import sys
+import pytools.timetools, pytools.datatools
+already_loaded = {name for name in ('pandas', 'matplotlib') if name in sys.modules}
+path = list(sys.path)
+import omdbapi, omdbapi.api
+for name in ('pandas', 'matplotlib', 'aiohttp', 'github_data'):
+	if name in sys.modules and name not in already_loaded:
+		print("imported", name)
+if sys.path != path:
+	print("sys.path was modified")
+"""
+
+
+class TestImport(unittest.TestCase):
+	def test_import_is_lazy(self):
+		environment = dict(os.environ)
+		environment['PYTHONPATH'] = os.pathsep.join(filter(None, [str(ROOT), environment.get('PYTHONPATH')]))
+		environment.pop('OMDBAPI_KEY', None)
+		result = subprocess.run([sys.executable, '-c', _PROBE], capture_output = True, text = True, env = environment, check = True)
+		# The probe prints what the import should not have done, and the import itself should print nothing.
+		self.assertEqual('', result.stdout.strip())
+
+	def test_api_key_from_environment(self):
+		from omdbapi.api import OmdbApi
+		previous = os.environ.get('OMDBAPI_KEY')
+		os.environ['OMDBAPI_KEY'] = 'from-environment'
+		try:
+			self.assertEqual('from-environment', OmdbApi().api_key)
+			self.assertEqual('explicit', OmdbApi(api_key = 'explicit').api_key)
+		finally:
+			if previous is None:
+				del os.environ['OMDBAPI_KEY']
+			else:
+				os.environ['OMDBAPI_KEY'] = previous
+
+	def test_lazy_attributes(self):
+		import omdbapi
+		from omdbapi.api._async_api import AsyncOmdbApi
+		self.assertIs(AsyncOmdbApi, omdbapi.AsyncOmdbApi)
+		with self.assertRaises(AttributeError):
+			omdbapi.missing
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from omdbapi.api import Metrics, OmdbApi, ResponseCache, RetryPolicy
+from omdbapi.offline import Fixtures, FixtureTransport, StandInBehaviour
+
+
+class TestMetrics(unittest.TestCase):
+	def setUp(self):
+		self.fixtures = Fixtures.synthetic(series = 2, seasons = 2, episodes = 3)
+
+	def test_counters(self):
+		api = OmdbApi(api_key = 'offline', transport = FixtureTransport(self.fixtures), cache = ResponseCache(':memory:'))
+		api.find('Synthetic Series 1')
+		api.get('tt9000001', 'short')
+
+		snapshot = api.metrics.snapshot()
+		# The search, the series, its two seasons and the probe for a third season.
+		self.assertEqual({'s': 1, 'i': 1, 'Season': 3}, snapshot['requests'])
+		self.assertEqual({'i': 1, 'Season': 3}, snapshot['cache_hits'])
+		self.assertIn('transfer', snapshot['phase_seconds']['Season'])
+		self.assertEqual(2, snapshot['parses']['media'])
+		self.assertEqual(1, snapshot['parses']['search'])
+
+	def test_hooks(self):
+		before, after = list(), list()
+		metrics = Metrics()
+		metrics.before_request.append(lambda record: before.append(record.endpoint))
+		metrics.after_request.append(after.append)
+		api = OmdbApi(api_key = 'secret', transport = FixtureTransport(self.fixtures), metrics = metrics)
+		api.get('tt9000000')
+
+		self.assertEqual(['i', 'Season', 'Season', 'Season'], before)
+		self.assertEqual({'i': 'tt9000000'}, after[0].parameters)
+		self.assertGreater(after[0].duration, 0)
+		self.assertIsNone(after[0].error)
+
+	def test_retries_and_errors(self):
+		behaviour = StandInBehaviour(error_rate = 0.5, seed = 1)
+		transport = FixtureTransport(self.fixtures, behaviour, retry = RetryPolicy(max_retries = 20, backoff = 0))
+		api = OmdbApi(api_key = 'offline', transport = transport)
+		api.get('tt9000000', 'short')
+		self.assertEqual(behaviour.errors, sum(api.metrics.snapshot()['retries'].values()))
+
+		transport.retry.max_retries = 0
+		behaviour.error_rate = 1.0
+		with self.assertRaises(ConnectionError):
+			api.get('tt9000001')
+		self.assertEqual(1, api.metrics.snapshot()['errors']['i'])
+
+	def test_prometheus(self):
+		api = OmdbApi(api_key = 'offline', transport = FixtureTransport(self.fixtures))
+		api.get('tt9000000', 'short')
+		text = api.metrics.prometheus()
+		self.assertIn('# TYPE omdbapi_requests_total counter', text)
+		self.assertIn('omdbapi_requests_total{endpoint="Season"} 3', text)
+		self.assertIn('omdbapi_phase_seconds_total{endpoint="i",phase="transfer"}', text)
+
+		api.metrics.reset()
+		self.assertEqual({}, api.metrics.snapshot()['requests'])
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import pathlib
+import tempfile
+from omdbapi.api import OmdbApi, RequestLimitError, ResponseCache, RetryPolicy
+from omdbapi.offline import Fixtures, FixtureTransport, StandInBehaviour, StandInServer
+
+
+class TestFixtures(unittest.TestCase):
+	def setUp(self):
+		self.fixtures = Fixtures.synthetic(series = 3, seasons = [2, 3, 1], episodes = 4)
+
+	def test_queries(self):
+		self.assertEqual('series', self.fixtures.respond({'i': 'tt9000001'})['Type'])
+		self.assertEqual('tt9000002', self.fixtures.respond({'t': 'synthetic series 2'})['imdbID'])
+		self.assertEqual(4, len(self.fixtures.respond({'i': 'tt9000001', 'Season': 3})['Episodes']))
+		self.assertEqual('False', self.fixtures.respond({'i': 'tt9000001', 'Season': 4})['Response'])
+		self.assertEqual('3', self.fixtures.respond({'s': 'synthetic', 'type': 'series'})['totalResults'])
+
+	def test_save_and_load(self):
+		with tempfile.TemporaryDirectory() as folder:
+			path = pathlib.Path(folder) / 'fixtures.jsonl'
+			count = self.fixtures.save(path)
+			loaded = Fixtures.load(path)
+		self.assertEqual(count, len(loaded))
+		self.assertEqual(self.fixtures.respond({'i': 'tt9000001', 'Season': 2}), loaded.respond({'i': 'tt9000001', 'Season': 2}))
+
+	def test_from_cache(self):
+		cache = ResponseCache(':memory:')
+		OmdbApi(api_key = 'offline', transport = FixtureTransport(self.fixtures), cache = cache).get('tt9000001', 'short')
+		recorded = Fixtures.from_cache(cache)
+		self.assertEqual(self.fixtures.respond({'i': 'tt9000001'}), recorded.respond({'i': 'tt9000001'}))
+		self.assertEqual(self.fixtures.respond({'i': 'tt9000001', 'Season': 3}), recorded.respond({'i': 'tt9000001', 'Season': 3}))
+		self.assertEqual('False', recorded.respond({'i': 'tt9000001', 'Season': 4})['Response'])
+
+
+class TestFixtureTransport(unittest.TestCase):
+	def test_get(self):
+		transport = FixtureTransport(Fixtures.synthetic(series = 2, seasons = 3, episodes = 5))
+		api = OmdbApi(api_key = 'offline', transport = transport)
+		series = api.get('tt9000001', 'short')
+		self.assertEqual(3, len(series.seasons))
+		self.assertEqual(15, len(series.toTable()))
+		self.assertEqual('tt9000001', api.find('Synthetic Series 1').imdbId)
+
+	def test_errors_are_retried(self):
+		behaviour = StandInBehaviour(error_rate = 0.5, seed = 1)
+		transport = FixtureTransport(Fixtures.synthetic(series = 1), behaviour, retry = RetryPolicy(max_retries = 20, backoff = 0))
+		api = OmdbApi(api_key = 'offline', transport = transport)
+		self.assertEqual(5, len(api.get('tt9000000', 'short').seasons))
+		self.assertGreater(behaviour.errors, 0)
+
+	def test_rate_limit(self):
+		behaviour = StandInBehaviour(daily_limit = 2)
+		transport = FixtureTransport(Fixtures.synthetic(series = 1), behaviour, retry = RetryPolicy(max_retries = 0))
+		api = OmdbApi(api_key = 'offline', transport = transport)
+		with self.assertRaises(RequestLimitError):
+			api.get('tt9000000', 'short')
+
+
+class TestStandInServer(unittest.TestCase):
+	def test_http(self):
+		with StandInServer(Fixtures.synthetic(series = 2, seasons = 2, episodes = 3)) as server:
+			with OmdbApi(api_key = 'offline', url = server.url) as api:
+				series = api.get('tt9000000', 'short')
+			self.assertEqual(6, len(series.toTable()))
+			# The series, its two seasons, and the probe for a third season.
+			self.assertEqual(4, server.behaviour.requests)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import math
+from omdbapi.api import parser, SeasonResource, CompactSeasonResource
+from pytools import timetools
+
+
+def _season_response(season: int = 2):
+	episodes = [
+		{'Title': 'Episode 1', 'Released': '08 Feb 2017', 'Episode': '1', 'imdbRating': '8.1', 'imdbID': 'tt0201'},
+		{'Title': 'Episode 2', 'Released': 'N/A', 'Episode': '2', 'imdbRating': 'N/A', 'imdbID': 'tt0202'},
+		{'Title': 'Episode 3', 'Released': '08 Feb 2017', 'Episode': '3', 'imdbID': 'tt0203'}
+	]
+	return {'Title': 'Legion', 'Season': str(season), 'totalSeasons': '3', 'Episodes': episodes, 'Response': 'True'}
+
+
+class TestConverters(unittest.TestCase):
+	def test_numbers(self):
+		self.assertEqual(65565, parser.toVotes('65,565'))
+		self.assertEqual(8.4, parser.toNumber('8.4'))
+		self.assertEqual(3, parser.toNumber('3'))
+		self.assertTrue(math.isnan(parser.toNumber('N/A')))
+		self.assertTrue(math.isnan(parser.toFloat(None)))
+
+	def test_dates(self):
+		self.assertEqual(timetools.Timestamp(2017, 2, 8, 0, 0, 0), parser.toTimestamp('08 Feb 2017'))
+		self.assertIs(parser.toTimestamp('08 Feb 2017'), parser.toTimestamp('08 Feb 2017'))
+		self.assertTrue(math.isnan(parser.toTimestamp('N/A')))
+		self.assertEqual(timetools.Duration(minutes = 60), parser.toDuration('60 min'))
+
+
+class TestParseSeason(unittest.TestCase):
+	def test_parse_season(self):
+		season = parser.parseSeason(_season_response(), previous = 10)
+		self.assertIsInstance(season, SeasonResource)
+		self.assertEqual(2, season.seasonIndex)
+		self.assertEqual(3, season.length)
+		episode = season.episodes[2]
+		self.assertEqual('S02E03', episode.episodeId)
+		self.assertEqual(13, episode.indexInSeries)
+		self.assertEqual(3, episode.indexInSeason)
+		self.assertTrue(math.isnan(episode.imdbRating))
+		self.assertTrue(math.isnan(season.episodes[1].releaseDate))
+
+	def test_parse_compact_season(self):
+		compact = parser.parseCompactSeason(_season_response(), previous = 10)
+		self.assertIsInstance(compact, CompactSeasonResource)
+		expected = parser.parseSeason(_season_response(), previous = 10).compact()
+		self.assertListEqual(expected.imdbIds, compact.imdbIds)
+		self.assertListEqual(expected.indexInSeries.tolist(), compact.indexInSeries.tolist())
+		self.assertListEqual(expected.releaseDates.tolist(), compact.releaseDates.tolist())
+		self.assertEqual(8.1, compact.get_episode('S02E01').imdbRating)
+
+	def test_parse_catalog(self):
+		# Large enough to go through the vectorized conversion.
+		count = parser.VECTORIZE_MIN_EPISODES // 6 + 1
+		catalog = {'tt{:03}'.format(i): [_season_response(1), _season_response(2)] for i in range(count)}
+		seasons = parser.parseCatalog(catalog)
+		self.assertEqual(count, len(seasons))
+		first, second = seasons['tt000']
+		self.assertListEqual([4, 5, 6], second.indexInSeries.tolist())
+		expected = parser.parseSeason(_season_response(2), previous = 3).compact()
+		self.assertListEqual(expected.releaseDates.tolist(), second.releaseDates.tolist())
+		self.assertTrue(math.isnan(second.imdbRatings[1]) and math.isnan(second.imdbRatings[2]))
+		self.assertEqual(8.1, first.imdbRatings[0])
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,123 @@
+import threading
+import unittest
+from omdbapi.api import DailyQuota, HttpTransport, OmdbApi, RequestLimitError, RetryPolicy, TokenBucket
+from omdbapi.offline import LIMIT_REACHED, Fixtures, FixtureTransport, StandInServer
+
+UNAVAILABLE = (503, {'Response': 'False', 'Error': 'Service Unavailable'})
+
+
+class _ScriptedBehaviour:
+	""" Answers with the scripted (status, payload) pairs first, then from the fixtures."""
+
+	def __init__(self, *script):
+		self.script = list(script)
+		self.requests = 0
+		self._lock = threading.Lock()
+
+	def respond(self, fixtures, parameters):
+		with self._lock:
+			self.requests += 1
+			if self.script:
+				return self.script.pop(0)
+		return 200, fixtures.respond(parameters)
+
+
+class TestRetryPolicy(unittest.TestCase):
+	def setUp(self):
+		self.retry = RetryPolicy(max_retries = 2, backoff = 0)
+
+	def test_decide(self):
+		self.assertIsNone(self.retry.decide(0, 200, {'Response': 'True'}))
+		self.assertIsNone(self.retry.decide(0, 401, {'Response': 'False', 'Error': 'Invalid API key!'}))
+		self.assertEqual(0, self.retry.decide(0, 503, None))
+		self.assertEqual(0, self.retry.decide(1, None, None))
+		self.assertEqual(0, self.retry.decide(1, 401, LIMIT_REACHED))
+		# Out of retries: failures are left to the caller, the request limit is raised here.
+		self.assertIsNone(self.retry.decide(2, 503, None))
+		self.assertIsNone(self.retry.decide(2, None, None))
+		quota = DailyQuota(10)
+		with self.assertRaises(RequestLimitError):
+			self.retry.decide(2, 401, LIMIT_REACHED, quota)
+		self.assertEqual(0, quota.remaining)
+
+	def test_delay_is_bounded(self):
+		retry = RetryPolicy(backoff = 1, max_backoff = 3)
+		self.assertTrue(all(0 <= retry.delay(attempt) <= 3 for attempt in range(10)))
+
+
+class TestDailyQuota(unittest.TestCase):
+	def test_exhaustion(self):
+		quota = DailyQuota(limit = 2)
+		quota.consume()
+		quota.consume()
+		self.assertEqual(0, quota.remaining)
+		with self.assertRaises(RequestLimitError):
+			quota.consume()
+		self.assertEqual(2, quota.used)
+
+	def test_client_stops_at_quota(self):
+		with StandInServer(Fixtures.synthetic(series = 1, seasons = 3)) as server:
+			transport = HttpTransport(quota = DailyQuota(limit = 2))
+			api = OmdbApi(api_key = 'offline', url = server.url, transport = transport)
+			with self.assertRaises(RequestLimitError):
+				api.get('tt9000000', 'short')
+			transport.close()
+			self.assertEqual(2, server.behaviour.requests)
+
+
+class TestTokenBucket(unittest.TestCase):
+	def test_reserve(self):
+		bucket = TokenBucket(rate = 10, capacity = 2)
+		self.assertEqual(0, bucket.reserve())
+		self.assertEqual(0, bucket.reserve())
+		self.assertGreater(bucket.reserve(), 0)
+
+
+class TestRetries(unittest.TestCase):
+	def get(self, behaviour, max_retries = 3):
+		""" Retrieves a movie over HTTP through the stand-in server. Returns the response and the request record."""
+		fixtures = Fixtures.synthetic(series = 1, seasons = 1)
+		records = list()
+		with StandInServer(fixtures, behaviour) as server:
+			transport = HttpTransport(retry = RetryPolicy(max_retries = max_retries, backoff = 0))
+			with OmdbApi(api_key = 'offline', url = server.url, transport = transport) as api:
+				api.metrics.after_request.append(records.append)
+				try:
+					return api.request(i = 'tt9000000'), records
+				finally:
+					transport.close()
+
+	def test_unavailable_is_retried(self):
+		behaviour = _ScriptedBehaviour(UNAVAILABLE, UNAVAILABLE)
+		response, records = self.get(behaviour)
+		self.assertEqual('tt9000000', response['imdbID'])
+		self.assertEqual(3, behaviour.requests)
+		self.assertEqual(2, records[0].retries)
+
+	def test_request_limit_is_retried(self):
+		behaviour = _ScriptedBehaviour((401, LIMIT_REACHED))
+		response, _ = self.get(behaviour)
+		self.assertEqual('tt9000000', response['imdbID'])
+		self.assertEqual(2, behaviour.requests)
+
+	def test_request_limit_error(self):
+		behaviour = _ScriptedBehaviour(*[(401, LIMIT_REACHED)] * 3)
+		with self.assertRaises(RequestLimitError):
+			self.get(behaviour, max_retries = 2)
+		self.assertEqual(3, behaviour.requests)
+
+	def test_unavailable_after_retries(self):
+		behaviour = _ScriptedBehaviour(*[UNAVAILABLE] * 3)
+		with self.assertRaises(Exception) as context:
+			self.get(behaviour, max_retries = 2)
+		self.assertIn('503', str(context.exception))
+
+	def test_fixture_transport(self):
+		behaviour = _ScriptedBehaviour(UNAVAILABLE, (401, LIMIT_REACHED))
+		transport = FixtureTransport(Fixtures.synthetic(series = 1, seasons = 1), behaviour, RetryPolicy(backoff = 0))
+		self.assertEqual('tt9000000', OmdbApi(api_key = 'offline', transport = transport).request(i = 'tt9000000')['imdbID'])
+		self.assertEqual(3, behaviour.requests)
+
+
+if __name__ == "__main__":
+	unittest.main()
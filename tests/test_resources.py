@@ -0,0 +1,140 @@
+import unittest
+import math
+from omdbapi.api import MediaResource, SeasonResource, EpisodeResource, LazySeasons, catalog_table
+from pytools import timetools
+
+
+def _build_season(season_index: int, previous: int, length: int = 4) -> SeasonResource:
+	episodes = [
+		EpisodeResource(
+			title = 'Episode {}'.format(index),
+			imdbId = 'tt{:>02}{:>03}'.format(season_index, index),
+			imdbRating = 8.0 if index != 2 else math.nan,
+			releaseDate = timetools.Timestamp(2017, 2, index, 0, 0, 0) if index != 3 else math.nan,
+			episodeId = "S{:>02}E{:>02}".format(season_index, index),
+			indexInSeries = previous + index,
+			indexInSeason = index
+		)
+		for index in range(1, length + 1)
+	]
+	return SeasonResource(episodes = episodes, seasonIndex = season_index, length = length, seriesTitle = 'Legion')
+
+
+def _build_series() -> MediaResource:
+	return MediaResource(
+		actors = 'N/A', awards = 'N/A', country = 'USA', director = 'N/A', duration = timetools.Duration('PT1H'),
+		genre = 'Drama', imdbId = 'tt5114356', imdbRating = 8.4, imdbVotes = 65565, language = 'English',
+		metascore = math.nan, plot = 'N/A', rating = 'TV-MA', ratings = [], releaseDate = timetools.Timestamp(2017, 2, 8, 0, 0, 0),
+		responseStatus = True, title = 'Legion', type = 'series', writer = 'Noah Hawley', year = '2017–',
+		totalSeasons = 2, seasons = [_build_season(1, 0), _build_season(2, 4)]
+	)
+
+
+class TestEpisodeLookup(unittest.TestCase):
+	def setUp(self):
+		self.series = _build_series()
+
+	def test_season_get_episode(self):
+		season = self.series.seasons[1]
+		self.assertEqual('S02E03', season.get_episode(3).episodeId)
+		self.assertEqual('S02E03', season.get_episode('3').episodeId)
+		self.assertEqual('S02E03', season.get_episode('tt02003').episodeId)
+		self.assertIsNone(season.get_episode(9))
+
+	def test_series_get_episode(self):
+		self.assertEqual('tt02003', self.series.get_episode('S02E03').imdbId)
+		self.assertEqual('tt02003', self.series.get_episode('s2e3').imdbId)
+		self.assertEqual('tt02003', self.series.get_episode(7).imdbId)
+		self.assertIsNone(self.series.get_episode('S03E01'))
+		self.assertEqual(2, self.series.get_season('S2').seasonIndex)
+		self.assertIsNone(self.series.get_season('S3'))
+
+	def test_get_episodes(self):
+		episodes = self.series.get_episodes(['S01E01', 'S02E04', 'S05E05'])
+		self.assertEqual(['tt01001', 'tt02004'], [e.imdbId for e in episodes[:2]])
+		self.assertIsNone(episodes[2])
+
+	def test_index_is_rebuilt_when_episodes_change(self):
+		self.assertIsNotNone(self.series.get_episode('S02E04'))
+		self.series.seasons[1].episodes = self.series.seasons[1].episodes[:2]
+		self.assertIsNone(self.series.get_episode('S02E04'))
+		self.series.seasons = self.series.seasons[:1]
+		self.assertIsNone(self.series.get_episode('S02E01'))
+
+
+class TestLazySeasons(unittest.TestCase):
+	def setUp(self):
+		self.requested = []
+		self.series = _build_series()
+		self.series.seasons = LazySeasons(self._loadSeason, self._loadRemaining, total_seasons = 2)
+
+	def _loadSeason(self, index: int):
+		self.requested.append(index)
+		# Seasons are loaded without knowledge of the preceding seasons.
+		return _build_season(index, 0) if index <= 3 else None
+
+	def _loadRemaining(self, loaded):
+		return {index: self._loadSeason(index) for index in range(1, 5) if index not in loaded}
+
+	def test_single_season(self):
+		episode = self.series.get_episode('S02E03')
+		self.assertEqual('tt02003', episode.imdbId)
+		self.assertEqual([2], self.requested)
+		self.assertIsNone(self.series.get_season('S7'))
+		self.assertEqual([2, 7], self.requested)
+
+	def test_prefetch(self):
+		self.assertEqual(3, self.series.get_episode('S02E03').indexInSeries)
+		self.series.prefetch()
+		self.assertEqual([2, 1, 3, 4], self.requested)
+		self.assertEqual(3, len(self.series.seasons))
+		self.assertEqual(7, self.series.get_episode('S02E03').indexInSeries)
+		self.assertEqual('S03E04', self.series.get_episode(12).episodeId)
+		self.assertListEqual(list(range(1, 13)), self.series.toTable()['indexInSeries'].tolist())
+
+
+class TestCompactSeasonResource(unittest.TestCase):
+	def setUp(self):
+		self.season = _build_season(2, 4)
+		self.compact = self.season.compact()
+
+	def test_attribute_access(self):
+		for expected, episode in zip(self.season.episodes, self.compact.episodes):
+			self.assertEqual(expected.title, episode.title)
+			self.assertEqual(expected.imdbId, episode.imdbId)
+			self.assertEqual(expected.episodeId, episode.episodeId)
+			self.assertEqual(expected.indexInSeries, episode.indexInSeries)
+			self.assertEqual(expected.indexInSeason, episode.indexInSeason)
+		self.assertTrue(math.isnan(self.compact.get_episode(2).imdbRating))
+		self.assertTrue(math.isnan(self.compact.get_episode(3).releaseDate))
+		self.assertEqual(timetools.Timestamp(2017, 2, 4, 0, 0, 0), self.compact.get_episode(4).releaseDate)
+
+	def test_roundtrip(self):
+		season = self.compact.to_season()
+		self.assertIsInstance(season, SeasonResource)
+		self.assertEqual(self.season.episodes[0], season.episodes[0])
+		self.assertEqual(self.season.length, season.length)
+
+
+class TestCatalogTable(unittest.TestCase):
+	def test_table(self):
+		series = _build_series()
+		table = series.toTable()
+		self.assertEqual(8, len(table))
+		self.assertListEqual(list(range(1, 9)), table['indexInSeries'].tolist())
+		self.assertEqual('float64', str(table['imdbRating'].dtype))
+		self.assertEqual('category', str(table['seriesTitle'].dtype))
+		self.assertEqual(2, table['releaseDate'].isna().sum())
+
+	def test_compact_table_matches(self):
+		series = _build_series()
+		table = series.toTable()
+		self.assertTrue(table.equals(series.compact().toTable()))
+
+	def test_catalog(self):
+		table = catalog_table([_build_series(), _build_series()])
+		self.assertEqual(16, len(table))
+
+
+if __name__ == "__main__":
+	unittest.main()
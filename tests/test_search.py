@@ -0,0 +1,52 @@
+import unittest
+import threading
+from omdbapi.api import OmdbApi
+
+
+class _SearchTransport:
+	""" Returns 25 results over 3 pages. The first result of page 2 repeats the last result of page 1."""
+
+	def __init__(self):
+		self.pages = []
+		self._lock = threading.Lock()
+
+	def get(self, url, parameters):
+		page = int(parameters.get('page', 1))
+		with self._lock:
+			self.pages.append(page)
+		if page > 3:
+			return {'Response': 'False', 'Error': 'Movie not found!'}
+		ids = ['tt{:03}{:02}'.format(page, i) for i in range(10 if page < 3 else 5)]
+		if page == 2:
+			ids[0] = 'tt00109'
+		results = [{'Title': 'Legion', 'Year': '2017', 'imdbID': i, 'Type': 'series', 'Poster': 'N/A'} for i in ids]
+		return {'Search': results, 'totalResults': '25', 'Response': 'True'}
+
+	def close(self):
+		pass
+
+
+class TestSearchIter(unittest.TestCase):
+	def setUp(self):
+		self.transport = _SearchTransport()
+		self.api = OmdbApi(api_key = 'key', transport = self.transport, max_workers = 2)
+
+	def test_every_page(self):
+		results = list(self.api.search_iter('legion'))
+		imdb_ids = [i['imdbID'] for i in results]
+		self.assertEqual(24, len(imdb_ids))
+		self.assertEqual(len(imdb_ids), len(set(imdb_ids)))
+		self.assertListEqual([1, 2, 3], sorted(self.transport.pages))
+
+	def test_max_results(self):
+		results = list(self.api.search_iter('legion', max_results = 5))
+		self.assertEqual(5, len(results))
+		self.assertListEqual([1], self.transport.pages)
+
+	def test_single_page(self):
+		self.assertEqual('tt00201', self.api.search('legion', page = 2)['Search'][1]['imdbID'])
+		self.assertListEqual([2], self.transport.pages)
+
+
+if __name__ == "__main__":
+	unittest.main()
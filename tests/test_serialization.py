@@ -0,0 +1,72 @@
+import math
+import tempfile
+import unittest
+from pathlib import Path
+
+from omdbapi.api import serialization
+from tests.test_resources import _build_series
+
+
+class TestJsonlSerialization(unittest.TestCase):
+	def setUp(self):
+		self.folder = tempfile.TemporaryDirectory()
+		self.filename = Path(self.folder.name) / "catalog.jsonl"
+		self.series = _build_series()
+
+	def tearDown(self):
+		self.folder.cleanup()
+
+	def test_roundtrip(self):
+		string = serialization.to_json(self.series)
+		result = serialization.from_json(string)
+
+		self.assertEqual(self.series.duration, result.duration)
+		self.assertEqual(self.series.releaseDate, result.releaseDate)
+		self.assertTrue(math.isnan(result.metascore))
+		self.assertTrue(math.isnan(result.get_episode('S01E02').imdbRating))
+		self.assertTrue(math.isnan(result.get_episode('S01E03').releaseDate))
+		self.assertEqual(string, serialization.to_json(result))
+
+	def test_compact_roundtrip(self):
+		self.series.compact()
+		result = serialization.from_json(serialization.to_json(self.series))
+		self.assertEqual('CompactSeasonResource', type(result.seasons[0]).__name__)
+		self.assertTrue(self.series.toTable().equals(result.toTable()))
+
+	def test_dump_and_append(self):
+		self.assertEqual(1, serialization.dump([self.series], self.filename))
+		self.assertEqual(2, serialization.dump(iter([self.series, self.series]), self.filename, append = True))
+
+		resources = list(serialization.load(self.filename))
+		self.assertEqual(3, len(resources))
+		self.assertEqual('Legion', resources[2].title)
+
+	def test_dump_per_episode(self):
+		self.assertEqual(8, serialization.dump([self.series], self.filename, per = 'episode'))
+		records = list(serialization.load_records(self.filename))
+		self.assertEqual('tt5114356', records[0]['seriesId'])
+		self.assertEqual(2, records[-1]['seasonIndex'])
+		self.assertEqual('S02E04', records[-1]['episode'].episodeId)
+
+	def test_truncate_incomplete_line(self):
+		serialization.dump([self.series], self.filename)
+		with open(self.filename, 'a', encoding = 'utf-8') as file:
+			file.write('{"$type": "MediaRes')
+		serialization.truncate_incomplete_line(self.filename)
+		self.assertEqual(['Legion'], [resource.title for resource in serialization.load(self.filename)])
+
+	def test_truncate_across_blocks(self):
+		self.filename.write_bytes(b'{"a": 1}\n' + b'x' * 100)
+		serialization.truncate_incomplete_line(self.filename, block_size = 16)
+		self.assertEqual(b'{"a": 1}\n', self.filename.read_bytes())
+
+		# Complete files are left as they are, and a file without any complete line is emptied.
+		serialization.truncate_incomplete_line(self.filename, block_size = 16)
+		self.assertEqual(b'{"a": 1}\n', self.filename.read_bytes())
+		self.filename.write_bytes(b'x' * 100)
+		serialization.truncate_incomplete_line(self.filename, block_size = 16)
+		self.assertEqual(b'', self.filename.read_bytes())
+
+
+if __name__ == "__main__":
+	unittest.main()
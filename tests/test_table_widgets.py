@@ -0,0 +1,43 @@
+import json
+import pathlib
+import tempfile
+import unittest
+from omdbapi.api import OmdbApi
+from omdbapi.offline import Fixtures, FixtureTransport
+from omdbapi.widgets._table_widgets import enrichRows
+
+
+class TestEnrichRows(unittest.TestCase):
+	def setUp(self):
+		self.transport = FixtureTransport(Fixtures.synthetic(series = 3, seasons = 2, episodes = 4))
+		self.api = OmdbApi(api_key = 'offline', transport = self.transport)
+		self.rows = [
+			{'title': 'Synthetic Series 0', 'imdbId': 'tt9000000', 'status': 'watching', 'myRating': 8, 'haveWatched': True},
+			{'title': 'Synthetic Series 1', 'imdbId': float('nan'), 'status': 'done', 'myRating': 6, 'haveWatched': True},
+			{'title': 'No Such Show', 'imdbId': None, 'status': 'new', 'myRating': None, 'haveWatched': False}
+		]
+
+	def test_enrich(self):
+		table = enrichRows(self.api, self.rows)
+		self.assertEqual(['tt9000000', 'tt9000001'], [row['imdbId'] for row in table])
+		self.assertEqual(8, table[0]['totalEpisodes'])
+		self.assertEqual('done', table[1]['status'])
+
+	def test_series_columns_skip_seasons(self):
+		table = enrichRows(self.api, self.rows, columns = ['title', 'imdbId', 'imdbRating', 'status'])
+		self.assertEqual(2, len(table))
+		self.assertFalse(any('Season' in parameters for parameters in self.transport.requests))
+
+	def test_checkpoint(self):
+		with tempfile.TemporaryDirectory() as folder:
+			checkpoint = pathlib.Path(folder) / 'media.checkpoint.jsonl'
+			checkpoint.write_text(json.dumps({'key': 'tt9000000', 'values': {'title': 'Checkpointed', 'totalEpisodes': 1}}) + '\n')
+			table = enrichRows(self.api, self.rows, checkpoint = checkpoint)
+			self.assertEqual('Checkpointed', table[0]['title'])
+			self.assertNotIn({'i': 'tt9000000', 'apikey': 'offline'}, self.transport.requests)
+			# The row that could not be retrieved is retried by the next run, so the checkpoint is kept.
+			self.assertEqual(2, len(checkpoint.read_text().splitlines()))
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from omdbapi.api import TitleIndex
+from omdbapi.api.title_index import normalizeTitle, splitYear
+
+
+class TestNormalize(unittest.TestCase):
+	def test_normalize(self):
+		self.assertEqual('marvels agents of shield', normalizeTitle("Marvel's Agents of S.H.I.E.L.D."))
+		self.assertEqual('law and order', normalizeTitle('Law & Order'))
+		self.assertEqual('amelie', normalizeTitle('Amélie'))
+
+	def test_split_year(self):
+		self.assertEqual(('Legion', 2017), splitYear('Legion (2017)'))
+		self.assertEqual(('Blade Runner 2049', None), splitYear('Blade Runner 2049'))
+
+
+class TestTitleIndex(unittest.TestCase):
+	def setUp(self):
+		self.index = TitleIndex(':memory:')
+		self.index.addSearch({'Search': [
+			{'Title': 'Legion', 'Year': '2017–2019', 'imdbID': 'tt5114356', 'Type': 'series'},
+			{'Title': 'Legion', 'Year': '2010', 'imdbID': 'tt1038686', 'Type': 'movie'},
+			{'Title': 'Legion of Super Heroes', 'Year': '2006–2008', 'imdbID': 'tt0795068', 'Type': 'series'}
+		]})
+
+	def tearDown(self):
+		self.index.close()
+
+	def test_lookup(self):
+		self.assertEqual('tt5114356', self.index.lookup('legion'))
+		self.assertEqual('tt1038686', self.index.lookup('Legion', kind = 'movie'))
+		self.assertEqual('tt1038686', self.index.lookup('Legion (2010)'))
+		self.assertIsNone(self.index.lookup('Legion', year = 1999))
+		self.assertIsNone(self.index.lookup('Fargo'))
+
+	def test_media_response_is_preferred(self):
+		self.index.addMedia({'Title': 'Legion', 'Year': '2010', 'imdbID': 'tt1038686', 'Type': 'movie', 'Response': 'True'})
+		self.assertEqual('tt1038686', self.index.lookup('Legion'))
+
+	def test_prefix_and_fuzzy(self):
+		self.assertListEqual(['tt5114356', 'tt1038686', 'tt0795068'], [i for _, i in self.index.prefix('leg')])
+		self.index.add('Fargo', 'tt2802850', '2014–', 'series')
+		self.assertListEqual([('Fargo', 'tt2802850')], self.index.prefix('far'))
+		self.assertEqual('tt0795068', self.index.fuzzy('Legion of Superheroes')[0][1])
+
+
+if __name__ == "__main__":
+	unittest.main()